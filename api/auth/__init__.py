@@ -4,7 +4,13 @@
 このパッケージは、ユーザー認証に関連する機能を提供します。
 """
 
-from .dependencies import get_current_active_admin, get_current_user, get_optional_user
+from .dependencies import (
+    CurrentUser,
+    get_current_active_admin,
+    get_current_user,
+    get_optional_user,
+    invalidate_user_cache,
+)
 from .jwt import TokenData, create_access_token, decode_token
 from .password import get_password_hash, verify_password
 
@@ -14,7 +20,9 @@ __all__ = [
     "create_access_token",
     "decode_token",
     "TokenData",
+    "CurrentUser",
     "get_current_user",
     "get_current_active_admin",
     "get_optional_user",
+    "invalidate_user_cache",
 ]
@@ -4,44 +4,129 @@
 このモジュールは、FastAPIのエンドポイントで使用する認証依存関係を提供します。
 """
 
-from typing import Optional
+import threading
+from typing import NamedTuple, Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam
 from sqlalchemy.future import select
 
-from ..database import get_db
+from ..database import _get_db_context
 from ..models.user import User
-from .jwt import decode_token
+from .jwt import _token_cache_key, decode_token
+
+
+class CurrentUser(NamedTuple):
+    """認証済みユーザーの情報
+
+    認証依存関係が参照する列のみを保持する軽量なユーザー表現です。
+    """
+
+    id: int
+    username: str
+    is_admin: bool
+    is_active: bool
+
+
+class BearerTokenExtractor(OAuth2PasswordBearer):
+    """Authorizationヘッダーからベアラートークンを取り出すOAuth2スキーム
+
+    ヘッダーを直接参照する非同期の抽出処理で、スレッドプールを使用しません。
+    OpenAPIのセキュリティ定義はOAuth2PasswordBearerのものをそのまま利用します。
+    """
+
+    async def __call__(self, request: Request) -> Optional[str]:
+        """リクエストからトークンを取り出す
+        Args:
+            request (Request): リクエスト
+        Returns:
+            Optional[str]: トークン。auto_errorがFalseでトークンがない場合はNone
+        Raises:
+            HTTPException: auto_errorがTrueでベアラートークンがない場合
+        """
+        authorization = request.headers.get("authorization")
+        if authorization:
+            scheme, _, token = authorization.partition(" ")
+            if token and scheme.lower() == "bearer":
+                return token
+
+        if not self.auto_error:
+            return None
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 
 # OAuth2のトークン取得エンドポイント
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+oauth2_scheme = BearerTokenExtractor(tokenUrl="/api/v1/auth/token")
+# トークンが任意のエンドポイント用（トークンがない場合はNoneを返す）
+optional_oauth2_scheme = BearerTokenExtractor(tokenUrl="/api/v1/auth/token", auto_error=False)
 
+# 認証済みユーザーのキャッシュ（キー: (キャッシュ世代, トークンのハッシュ)）
+_USER_CACHE_MAXSIZE = 2048
+_USER_CACHE_TTL = 30
+_user_cache: TTLCache[Tuple[int, bytes], CurrentUser] = TTLCache(maxsize=_USER_CACHE_MAXSIZE, ttl=_USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+_cache_epoch = 0
+
+
+# 認証に必要な列のみを主キーで取得するクエリ
+_CURRENT_USER_STMT = (
+    select(User.id, User.username, User.is_admin, User.is_active).where(User.id == bindparam("user_id")).limit(1)
+)
+
+
+def invalidate_user_cache() -> None:
+    """認証済みユーザーのキャッシュを無効化する関数
+
+    パスワード変更やユーザーの無効化など、認証結果に影響する更新の後に呼び出します。
+    """
+    global _cache_epoch
+    with _user_cache_lock:
+        _cache_epoch += 1
+        _user_cache.clear()
+
+
+async def _authenticate_token(token: str) -> CurrentUser:
+    """トークンからユーザーを認証する
+
+    キャッシュにない場合のみ短命のセッションでユーザーを取得します。
+    セッションは取得後すぐに閉じるため、エンドポイントの処理中に接続を保持し続けることはありません。
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
-    """現在のユーザーを取得する依存関係
     Args:
-        token (str, optional): JWTトークン。Depends(oauth2_scheme)から取得
-        db (AsyncSession, optional): データベースセッション。Depends(get_db)から取得
+        token (str): JWTトークン
     Returns:
-        User: 現在のユーザーオブジェクト
+        CurrentUser: 認証されたユーザー情報
     Raises:
-        HTTPException: ユーザーが見つからない場合
+        HTTPException: ユーザーが見つからない場合、または無効化されている場合
     """
     token_data = decode_token(token)
 
-    # ユーザーをデータベースから取得
-    result = await db.execute(select(User).where(User.username == token_data.username))
-    user = result.scalars().first()
+    # キャッシュ済みのユーザーがあればデータベースへの問い合わせを省略
+    cache_key = (_cache_epoch, _token_cache_key(token))
+    with _user_cache_lock:
+        cached_user = _user_cache.get(cache_key)
+    if cached_user is not None:
+        return cached_user
+
+    # 必要な列のみを主キーでデータベースから取得（user_idはdecode_tokenで検証済み）
+    assert token_data.user_id is not None
+    async with _get_db_context() as db:
+        row = (await db.execute(_CURRENT_USER_STMT, {"user_id": token_data.user_id})).first()
 
-    if user is None:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    user = CurrentUser(*row)
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,17 +134,55 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    with _user_cache_lock:
+        _user_cache[cache_key] = user
+
+    return user
+
+
+async def _authenticate_request(request: Request, token: str) -> CurrentUser:
+    """リクエスト内で一度だけユーザーを認証する
+
+    認証結果はrequest.stateに保持し、同じリクエストで別の認証依存関係が解決された場合も再利用します。
+
+    Args:
+        request (Request): リクエスト
+        token (str): JWTトークン
+    Returns:
+        CurrentUser: 認証されたユーザー情報
+    Raises:
+        HTTPException: ユーザーが見つからない場合、または無効化されている場合
+    """
+    authenticated = getattr(request.state, "authenticated_user", None)
+    if authenticated is not None and authenticated[0] == token:
+        return authenticated[1]
+
+    user = await _authenticate_token(token)
+    request.state.authenticated_user = (token, user)
     return user
 
 
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> CurrentUser:
+    """現在のユーザーを取得する依存関係
+    Args:
+        request (Request): リクエスト
+        token (str, optional): JWTトークン。Depends(oauth2_scheme)から取得
+    Returns:
+        CurrentUser: 現在のユーザー情報
+    Raises:
+        HTTPException: ユーザーが見つからない場合
+    """
+    return await _authenticate_request(request, token)
+
+
 async def get_current_active_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
     """現在の管理者ユーザーを取得する依存関係
     Args:
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
     Returns:
-        User: 現在の管理者ユーザーオブジェクト
+        CurrentUser: 現在の管理者ユーザー情報
     Raises:
         HTTPException: ユーザーが管理者でない場合
     """
@@ -73,20 +196,20 @@ async def get_current_active_admin(
 
 
 async def get_optional_user(
-    token: Optional[str] = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
+    request: Request, token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> Optional[CurrentUser]:
     """オプションのユーザーを取得する依存関係
     トークンが提供されない場合はNoneを返します。
     Args:
-        token (Optional[str], optional): JWTトークン。Depends(oauth2_scheme)から取得
-        db (AsyncSession, optional): データベースセッション。Depends(get_db)から取得
+        request (Request): リクエスト
+        token (Optional[str], optional): JWTトークン。Depends(optional_oauth2_scheme)から取得
     Returns:
-        Optional[User]: ユーザーオブジェクトまたはNone
+        Optional[CurrentUser]: ユーザー情報またはNone
     """
     if token is None:
         return None
 
     try:
-        return await get_current_user(token, db)
+        return await _authenticate_request(request, token)
     except HTTPException:
         return None
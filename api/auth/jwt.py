@@ -4,9 +4,13 @@ JWT認証モジュール
 このモジュールは、JWTトークンの生成と検証を行う機能を提供します。
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
 
+from cachetools import TTLCache
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from pydantic import BaseModel
@@ -22,6 +26,16 @@ class TokenData(BaseModel):
     is_admin: Optional[bool] = False
 
 
+# デコード済みトークンのキャッシュ（キー: トークンのハッシュ、値: (TokenData, 有効期限のUNIX時刻)）
+_TOKEN_CACHE_MAXSIZE = 4096
+_TOKEN_CACHE_TTL = 60
+_token_cache: TTLCache[bytes, Tuple[TokenData, float]] = TTLCache(maxsize=_TOKEN_CACHE_MAXSIZE, ttl=_TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# デフォルトのトークン有効期限（秒）
+_DEFAULT_EXP_SECS = settings.JWT_EXPIRATION_MINUTES * 60
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """アクセストークンを作成する関数
     Args:
@@ -30,21 +44,35 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     Returns:
         str: 生成されたJWTトークン
     """
-    to_encode = data.copy()
-
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRATION_MINUTES)
-
-    to_encode.update({"exp": expire})
+    exp_secs = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_EXP_SECS
+    to_encode = {**data, "exp": int(time.time()) + exp_secs}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
     return encoded_jwt
 
 
+def _token_cache_key(token: str) -> bytes:
+    """トークンキャッシュのキーを生成する関数
+    Args:
+        token (str): JWTトークン
+    Returns:
+        bytes: トークンのハッシュ値
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def clear_token_cache() -> None:
+    """トークンのデコード結果のキャッシュをクリアする関数"""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
 def decode_token(token: str) -> TokenData:
     """トークンをデコードする関数
+
+    検証済みのトークンは最大60秒（トークンの有効期限を超えない範囲）キャッシュされます。
+    無効なトークンはキャッシュされません。
+
     Args:
         token (str): JWTトークン
     Returns:
@@ -52,6 +80,16 @@ def decode_token(token: str) -> TokenData:
     Raises:
         HTTPException: トークンが無効な場合
     """
+    key = _token_cache_key(token)
+    now = time.time()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        token_data, deadline = cached
+        if now < deadline:
+            return token_data
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         username = str(payload.get("sub")) if payload.get("sub") is not None else None
@@ -65,7 +103,18 @@ def decode_token(token: str) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return TokenData(username=username, user_id=user_id, is_admin=is_admin)
+        token_data = TokenData(username=username, user_id=user_id, is_admin=is_admin)
+
+        # キャッシュの有効期限はトークンの有効期限を超えないようにする
+        deadline = now + _TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if exp is not None:
+            deadline = min(deadline, float(exp))
+        if deadline > now:
+            with _token_cache_lock:
+                _token_cache[key] = (token_data, deadline)
+
+        return token_data
 
     except JWTError:
         raise HTTPException(
@@ -2,15 +2,55 @@
 パスワード管理モジュール
 
 このモジュールは、パスワードのハッシュ化と検証を行う機能を提供します。
+bcryptの計算はCPU負荷が高いため、イベントループをブロックしないようスレッドプールで実行します。
 """
 
-from passlib.context import CryptContext
+import bcrypt
+from anyio import to_thread
 
-# パスワードハッシュ化のコンテキスト
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..config import settings
 
+# bcryptは72バイトを超える部分を無視するため、事前に切り詰める
+BCRYPT_MAX_PASSWORD_BYTES = 72
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+
+def _encode_password(password: str) -> bytes:
+    """パスワードをbcrypt用のバイト列に変換する関数
+    Args:
+        password (str): 平文パスワード
+    Returns:
+        bytes: 72バイトに切り詰めたパスワード
+    """
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """パスワードを検証する関数（同期版）
+    Args:
+        plain_password (str): 平文パスワード
+        hashed_password (str): ハッシュ化されたパスワード
+    Returns:
+        bool: パスワードが一致する場合はTrue、それ以外はFalse
+    """
+    try:
+        return bcrypt.checkpw(_encode_password(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # 不正な形式のハッシュは一致しないものとして扱う
+        return False
+
+
+def _get_password_hash_sync(password: str) -> str:
+    """パスワードをハッシュ化する関数（同期版）
+    Args:
+        password (str): 平文パスワード
+    Returns:
+        str: ハッシュ化されたパスワード
+    """
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_encode_password(password), salt).decode("utf-8")
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """パスワードを検証する関数
     Args:
         plain_password (str): 平文パスワード
@@ -18,14 +58,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: パスワードが一致する場合はTrue、それ以外はFalse
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await to_thread.run_sync(_verify_password_sync, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """パスワードをハッシュ化する関数
     Args:
         password (str): 平文パスワード
     Returns:
         str: ハッシュ化されたパスワード
     """
-    return pwd_context.hash(password)
+    return await to_thread.run_sync(_get_password_hash_sync, password)
@@ -5,6 +5,7 @@
 環境変数から設定を読み込み、アプリケーション全体で使用される設定値を提供します。
 """
 
+from functools import lru_cache
 from typing import Optional
 
 from pydantic_settings import BaseSettings
@@ -21,11 +22,21 @@ class Settings(BaseSettings):
 
     # データベース設定
     DATABASE_URL: str = "sqlite:///db/sqlite.db"
+    DATABASE_READ_URL: Optional[str] = None  # 一覧取得などの読み取りに使うデータベース（リードレプリカ）のURL
+    DB_POOL_SIZE: int = 5
+    DB_READ_POOL_SIZE: int = 15  # 読み取り用の接続プールのサイズ
+    DB_MAX_OVERFLOW: int = 10
+    SQL_ECHO: bool = False
+    HEALTH_DB_CHECK_TTL_SECONDS: float = 5.0  # ヘルスチェックでのDB確認結果のキャッシュ時間（秒）
 
     # 認証設定
     SECRET_KEY: str = "goosuke_default_secret_key"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 60
+    BCRYPT_ROUNDS: int = 12
+
+    # アクション設定
+    TRIGGER_MAX_BODY_BYTES: int = 64 * 1024  # トリガー入力の最大サイズ（バイト）
 
     # Discord設定
     DISCORD_BOT_TOKEN: Optional[str] = None
@@ -38,14 +49,17 @@ class Settings(BaseSettings):
     }
 
 
-# グローバル設定インスタンス
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """設定インスタンスを取得する関数
 
+    初回呼び出し時に生成したインスタンスを以降も返します。
+
     Returns:
         Settings: 設定インスタンス
     """
-    return settings
+    return Settings()
+
+
+# グローバル設定インスタンス
+settings = get_settings()
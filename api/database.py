@@ -5,30 +5,129 @@
 非同期セッションの作成と管理を行います。
 """
 
+import asyncio
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
+import orjson
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import settings
 
-# SQLiteのURLをasync対応形式に変換
-if settings.DATABASE_URL.startswith("sqlite:///"):
-    db_url = settings.DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
-else:
-    db_url = settings.DATABASE_URL
+
+def _to_async_url(url: str) -> str:
+    """SQLiteのURLをasync対応形式に変換する関数
+
+    Args:
+        url (str): データベースURL
+
+    Returns:
+        str: async対応のデータベースURL
+    """
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///")
+    return url
+
+
+db_url = _to_async_url(settings.DATABASE_URL)
+# 読み取り専用のURL（リードレプリカ）が未設定の場合は同じデータベースを別のプールで読み取る
+read_db_url = _to_async_url(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else db_url
 
 # テスト用
 if settings.GOOSUKE_ENV == "test":
     db_file_path = os.path.abspath("/app/db/test_database.db")
-    db_url = f"sqlite+aiosqlite:///{db_file_path}"
+    db_url = read_db_url = f"sqlite+aiosqlite:///{db_file_path}"
     if os.path.exists(db_file_path):
         os.remove(db_file_path)
 
+is_sqlite = db_url.startswith("sqlite")
+
+
+def _json_serializer(value: Any) -> str:
+    """JSONカラムの値をシリアライズする関数（orjsonを使用）
+
+    Args:
+        value (Any): シリアライズする値
+
+    Returns:
+        str: JSON文字列
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _create_engine(url: str, pool_size: int) -> AsyncEngine:
+    """非同期エンジンを作成する関数
+
+    Args:
+        url (str): async対応のデータベースURL
+        pool_size (int): 接続プールのサイズ
+
+    Returns:
+        AsyncEngine: 非同期エンジン
+    """
+    engine_options: Dict[str, Any] = {
+        "echo": settings.SQL_ECHO,
+        "echo_pool": False,
+        "future": True,
+        # JSONカラムのエンコード・デコードにorjsonを使用する
+        "json_serializer": _json_serializer,
+        "json_deserializer": orjson.loads,
+    }
+    if url.startswith("sqlite"):
+        engine_options["connect_args"] = {"check_same_thread": False, "timeout": 30}
+    if not url.startswith("sqlite") or ":memory:" not in url:
+        # SQLiteのファイルDBはデフォルトでNullPoolになるため、接続を再利用するプールを明示する
+        engine_options["poolclass"] = AsyncAdaptedQueuePool
+        engine_options["pool_size"] = pool_size
+        engine_options["max_overflow"] = settings.DB_MAX_OVERFLOW
+        engine_options["pool_pre_ping"] = False
+
+    return create_async_engine(url, **engine_options)
+
+
+def _set_sqlite_pragma(dbapi_connection: Any, _connection_record: Any) -> None:
+    """SQLite接続ごとにPRAGMAを設定する
+
+    WALモードで読み取りと書き込みを並行させ、コミットごとのfsyncを減らします。
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _set_sqlite_read_pragma(dbapi_connection: Any, _connection_record: Any) -> None:
+    """読み取り用のSQLite接続ごとにPRAGMAを設定する
+
+    書き込み用と同じ設定に加え、誤って書き込むことのないよう接続を読み取り専用にします。
+    """
+    _set_sqlite_pragma(dbapi_connection, _connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
 # 非同期エンジンの作成
-engine: AsyncEngine = create_async_engine(db_url, echo=settings.GOOSUKE_ENV == "development", future=True)
+engine: AsyncEngine = _create_engine(db_url, settings.DB_POOL_SIZE)
+if is_sqlite:
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragma)
+
+# 読み取り用の非同期エンジンの作成（一覧取得やリアクションの検索が書き込みと接続を奪い合わないよう、別のプールを使う）
+# インメモリDBは接続ごとに別のデータベースになるため、書き込み用のエンジンを共有する
+if read_db_url == db_url and ":memory:" in db_url:
+    read_engine: AsyncEngine = engine
+else:
+    read_engine = _create_engine(read_db_url, settings.DB_READ_POOL_SIZE)
+    if read_db_url.startswith("sqlite"):
+        event.listen(read_engine.sync_engine, "connect", _set_sqlite_read_pragma)
+
 
 # 非同期セッションの作成
 async_session_factory = async_sessionmaker(
@@ -37,18 +136,27 @@ async_session_factory = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+read_session_factory = async_sessionmaker(
+    bind=read_engine,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
 
 # モデルのベースクラス
 Base = declarative_base()
 
 
 @asynccontextmanager
-async def _get_db_context() -> AsyncGenerator[AsyncSession, None]:
+async def _get_db_context(readonly: bool = False) -> AsyncGenerator[AsyncSession, None]:
     """非同期データベースセッションを取得するコンテキストマネージャ
+    Args:
+        readonly (bool, optional): 読み取り専用のプールからセッションを取得するかどうか。デフォルトはFalse
     Yields:
         AsyncSession: 非同期SQLAlchemyセッション
     """
-    async with async_session_factory() as session:
+    session_factory = read_session_factory if readonly else async_session_factory
+    async with session_factory() as session:
         try:
             yield session
             await session.commit()
@@ -72,3 +180,32 @@ async def init_db() -> None:
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_up_pool() -> None:
+    """接続プールを事前に確立する関数
+
+    アプリケーション起動時にプールサイズ分の接続を同時に開いてSELECT 1を実行し、プールに戻します。
+    最初のリクエストで接続確立のコストを払わずに済み、接続設定の誤りも起動時に検出できます。
+    読み取り用のエンジンが別にある場合は、そのプールも同様に確立します。
+    """
+
+    async def _touch(target: AsyncEngine) -> None:
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    engines = [engine] if read_engine is engine else [engine, read_engine]
+    await asyncio.gather(
+        *(
+            _touch(target)
+            for target in engines
+            for _ in range(target.pool.size() if isinstance(target.pool, AsyncAdaptedQueuePool) else 1)
+        )
+    )
+
+
+async def dispose_engines() -> None:
+    """書き込み用と読み取り用のエンジンの接続をすべて閉じる関数"""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
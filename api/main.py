@@ -7,13 +7,16 @@
 
 import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .config import settings
-from .database import init_db
+from .database import dispose_engines, init_db, warm_up_pool
 from .routes import (
     actions_router,
     auth_router,
@@ -25,6 +28,8 @@ from .routes import (
     settings_router,
     tasks_router,
 )
+from .services.action_service import start_last_triggered_at_flusher, stop_last_triggered_at_flusher
+from .services.extension_service import wait_for_pending_sync
 
 # ロガーの設定
 logging.basicConfig(
@@ -33,6 +38,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger("goosuke")
 
+# SQLの出力はSQL_ECHOが有効な場合のみ（クエリごとのログ整形と出力を避ける）
+if not settings.SQL_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+
+
+async def _sync_extensions() -> None:
+    """Goose と Goosuke の拡張機能設定を同期する関数
+
+    Goose の設定をデータベースへ取り込んでから、その結果を Goose の設定ファイルへ書き戻すため、
+    2つの同期は順番に実行します。
+    """
+    try:
+        from .services.extension_service import ExtensionService
+
+        extension_service = ExtensionService()
+        result = await extension_service.sync_from_goose()
+        if result["success"]:
+            logger.info("GooseからGoosukeへの拡張機能の同期が完了しました: %s件", result["synced_count"])
+        else:
+            logger.warning("GooseからGoosukeへの拡張機能の同期に失敗しました: %s", result["message"])
+
+        result = await extension_service.sync_to_goose()
+        if result["success"]:
+            logger.info("GoosukeからGooseへの拡張機能の同期が完了しました: %s件", result["synced_count"])
+        else:
+            logger.warning("GoosukeからGooseへの拡張機能の同期に失敗しました: %s", result["message"])
+    except Exception as e:
+        logger.error("拡張機能の同期中にエラーが発生しました: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """アプリケーションの起動・終了処理
+
+    Args:
+        app (FastAPI): アプリケーション
+    """
+    logger.info("Starting %s v%s in %s mode", settings.APP_NAME, settings.APP_VERSION, settings.GOOSUKE_ENV)
+
+    # データベースの初期化
+    # 開発環境でのみ自動初期化を実行（本番環境ではAlembicマイグレーションを使用）
+    if settings.GOOSUKE_ENV == "development":
+        logger.info("Initializing database in development mode...")
+        await init_db()
+        logger.info("Database initialized")
+    else:
+        logger.info("Skipping automatic database initialization in non-development mode")
+
+    # 最初のリクエストより前にデータベース接続を確立
+    await warm_up_pool()
+
+    # Goose の拡張機能設定を同期
+    await _sync_extensions()
+
+    # アクションの最終トリガー時刻をまとめて書き込む
+    start_last_triggered_at_flusher()
+
+    yield
+
+    logger.info("Shutting down %s", settings.APP_NAME)
+    await stop_last_triggered_at_flusher()
+    # 拡張機能の変更を Goose の設定ファイルに反映し終えてから終了する
+    await wait_for_pending_sync()
+    await dispose_engines()
+
+
 # FastAPIアプリケーションの作成
 app = FastAPI(
     title=settings.APP_NAME,
@@ -40,6 +112,9 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/api/docs" if settings.GOOSUKE_ENV != "production" else None,
     redoc_url="/api/redoc" if settings.GOOSUKE_ENV != "production" else None,
+    lifespan=lifespan,
+    # レスポンスのJSONエンコードにorjsonを使用する
+    default_response_class=ORJSONResponse,
 )
 
 # CORSミドルウェアの設定
@@ -51,56 +126,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ルーターの登録
-app.include_router(auth_router)
-app.include_router(tasks_router)
-app.include_router(actions_router)  # 新しいアクションルーター
-app.include_router(extensions_router)
-app.include_router(discord_router)
-app.include_router(discord_config_router)  # Discord設定ルーター
-app.include_router(settings_router)  # 設定ルーター
-app.include_router(health_router)
-app.include_router(mcp_router)  # MCPルーターを追加
-
-
-@app.on_event("startup")
-async def startup_event():
-    """アプリケーション起動時のイベントハンドラ"""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION} in {settings.GOOSUKE_ENV} mode")
-
-    # データベースの初期化
-    # 開発環境でのみ自動初期化を実行（本番環境ではAlembicマイグレーションを使用）
-    if settings.GOOSUKE_ENV == "development":
-        logger.info("Initializing database in development mode...")
-        await init_db()
-        logger.info("Database initialized")
-    else:
-        logger.info("Skipping automatic database initialization in non-development mode")
-
-    # Goose の拡張機能設定を同期
-    try:
-        from .services.extension_service import ExtensionService
 
-        extension_service = ExtensionService()
-        result = await extension_service.sync_from_goose()
-        if result["success"]:
-            logger.info(f"GooseからGoosukeへの拡張機能の同期が完了しました: {result['synced_count']}件")
-        else:
-            logger.warning(f"GooseからGoosukeへの拡張機能の同期に失敗しました: {result['message']}")
+def _install_routes(app: FastAPI) -> None:
+    """ルーターを登録する関数
 
-        result = await extension_service.sync_to_goose()
-        if result["success"]:
-            logger.info(f"GoosukeからGooseへの拡張機能の同期が完了しました: {result['synced_count']}件")
-        else:
-            logger.warning(f"GoosukeからGooseへの拡張機能の同期に失敗しました: {result['message']}")
-    except Exception as e:
-        logger.error(f"拡張機能の同期中にエラーが発生しました: {e}")
+    Args:
+        app (FastAPI): ルーターを登録するアプリケーション
+    """
+    app.include_router(auth_router)
+    app.include_router(tasks_router)
+    app.include_router(actions_router)  # 新しいアクションルーター
+    app.include_router(extensions_router)
+    app.include_router(discord_router)
+    app.include_router(discord_config_router)  # Discord設定ルーター
+    app.include_router(settings_router)  # 設定ルーター
+    app.include_router(health_router)
+    app.include_router(mcp_router)  # MCPルーターを追加
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """アプリケーション終了時のイベントハンドラ"""
-    logger.info(f"Shutting down {settings.APP_NAME}")
+# ルーターの登録
+_install_routes(app)
 
 
 @app.get("/")
@@ -6,7 +6,7 @@ SSEトランスポートを使用して、Gooseエージェントからのリク
 """
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List
 
 import mcp.types as types
 from mcp.server import Server
@@ -16,6 +16,121 @@ from starlette.responses import Response
 
 from api.services.discord_service import DiscordBotManager
 
+# 提供するツールの定義（内容は静的なため、インポート時に一度だけ構築する）
+_DISCORD_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="discord_send_message",
+        description="Discordチャンネルにメッセージを送信します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "送信先のDiscordチャンネルID"},
+                "content": {"type": "string", "description": "送信するメッセージ内容"},
+                "reference_message_id": {
+                    "type": "string",
+                    "description": "返信対象のメッセージID（オプション）",
+                    "nullable": True,
+                },
+            },
+            "required": ["channel_id", "content"],
+        },
+    ),
+    types.Tool(
+        name="discord_edit_message",
+        description="Discordの既存メッセージを編集します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
+                "message_id": {"type": "string", "description": "編集対象のメッセージID"},
+                "content": {"type": "string", "description": "新しいメッセージ内容"},
+            },
+            "required": ["channel_id", "message_id", "content"],
+        },
+    ),
+    types.Tool(
+        name="discord_delete_message",
+        description="Discordのメッセージを削除します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
+                "message_id": {"type": "string", "description": "削除対象のメッセージID"},
+            },
+            "required": ["channel_id", "message_id"],
+        },
+    ),
+    types.Tool(
+        name="discord_get_message",
+        description="特定のDiscordメッセージを取得します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
+                "message_id": {"type": "string", "description": "取得対象のメッセージID"},
+            },
+            "required": ["channel_id", "message_id"],
+        },
+    ),
+    types.Tool(
+        name="discord_get_message_history",
+        description="Discordチャンネルの履歴からメッセージを取得します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
+                "reference_message_id": {
+                    "type": "string",
+                    "description": "基準となるメッセージID（指定した場合はそのメッセージより前のメッセージを取得）",
+                    "nullable": True,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "取得するメッセージの最大数",
+                    "default": 10,
+                    "minimum": 1,
+                    "maximum": 100,
+                },
+            },
+            "required": ["channel_id"],
+        },
+    ),
+    types.Tool(
+        name="discord_search_messages",
+        description="Discordチャンネル内のメッセージを検索します",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "channel_id": {"type": "string", "description": "検索対象のDiscordチャンネルID"},
+                "query": {"type": "string", "description": "検索クエリ"},
+                "limit": {
+                    "type": "integer",
+                    "description": "取得するメッセージの最大数",
+                    "default": 25,
+                    "minimum": 1,
+                    "maximum": 100,
+                },
+            },
+            "required": ["channel_id", "query"],
+        },
+    ),
+]
+
+# メッセージ一覧の各メッセージの書式
+_MESSAGE_TEMPLATE = "ID: {id}\n作成者: {author}\n内容: {content}\nタイムスタンプ: {timestamp}\n"
+
+
+def _format_messages(messages: List[Dict[str, Any]]) -> str:
+    """メッセージ一覧をテキストに整形する
+
+    Args:
+        messages: メッセージ情報のリスト
+
+    Returns:
+        区切り線で連結したメッセージのテキスト
+    """
+    return "\n---\n".join(_MESSAGE_TEMPLATE.format_map(msg) for msg in messages)
+
 
 class DiscordMCPServer:
     """Discord MCP サーバークラス"""
@@ -35,104 +150,17 @@ class DiscordMCPServer:
         @self.app.list_tools()
         async def list_tools() -> List[types.Tool]:
             """利用可能なツールのリストを返す"""
-            return [
-                types.Tool(
-                    name="discord_send_message",
-                    description="Discordチャンネルにメッセージを送信します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "送信先のDiscordチャンネルID"},
-                            "content": {"type": "string", "description": "送信するメッセージ内容"},
-                            "reference_message_id": {
-                                "type": "string",
-                                "description": "返信対象のメッセージID（オプション）",
-                                "nullable": True,
-                            },
-                        },
-                        "required": ["channel_id", "content"],
-                    },
-                ),
-                types.Tool(
-                    name="discord_edit_message",
-                    description="Discordの既存メッセージを編集します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
-                            "message_id": {"type": "string", "description": "編集対象のメッセージID"},
-                            "content": {"type": "string", "description": "新しいメッセージ内容"},
-                        },
-                        "required": ["channel_id", "message_id", "content"],
-                    },
-                ),
-                types.Tool(
-                    name="discord_delete_message",
-                    description="Discordのメッセージを削除します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
-                            "message_id": {"type": "string", "description": "削除対象のメッセージID"},
-                        },
-                        "required": ["channel_id", "message_id"],
-                    },
-                ),
-                types.Tool(
-                    name="discord_get_message",
-                    description="特定のDiscordメッセージを取得します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
-                            "message_id": {"type": "string", "description": "取得対象のメッセージID"},
-                        },
-                        "required": ["channel_id", "message_id"],
-                    },
-                ),
-                types.Tool(
-                    name="discord_get_message_history",
-                    description="Discordチャンネルの履歴からメッセージを取得します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "メッセージのあるDiscordチャンネルID"},
-                            "reference_message_id": {
-                                "type": "string",
-                                "description": "基準となるメッセージID（指定した場合はそのメッセージより前のメッセージを取得）",
-                                "nullable": True,
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "取得するメッセージの最大数",
-                                "default": 10,
-                                "minimum": 1,
-                                "maximum": 100,
-                            },
-                        },
-                        "required": ["channel_id"],
-                    },
-                ),
-                types.Tool(
-                    name="discord_search_messages",
-                    description="Discordチャンネル内のメッセージを検索します",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "channel_id": {"type": "string", "description": "検索対象のDiscordチャンネルID"},
-                            "query": {"type": "string", "description": "検索クエリ"},
-                            "limit": {
-                                "type": "integer",
-                                "description": "取得するメッセージの最大数",
-                                "default": 25,
-                                "minimum": 1,
-                                "maximum": 100,
-                            },
-                        },
-                        "required": ["channel_id", "query"],
-                    },
-                ),
-            ]
+            return _DISCORD_TOOLS
+
+        # ツール名とハンドラの対応表
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]] = {
+            "discord_send_message": self._send_message,
+            "discord_edit_message": self._edit_message,
+            "discord_delete_message": self._delete_message,
+            "discord_get_message": self._get_message,
+            "discord_get_message_history": self._get_message_history,
+            "discord_search_messages": self._search_messages,
+        }
 
         # ツール呼び出し処理
         @self.app.call_tool()
@@ -146,166 +174,169 @@ class DiscordMCPServer:
             Returns:
                 ツールの実行結果
             """
-            self.logger.info(f"ツール呼び出し: {name}, 引数: {arguments}")
-
-            try:
-                if name == "discord_send_message":
-                    channel_id = arguments["channel_id"]
-                    content = arguments["content"]
-                    reference_message_id = arguments.get("reference_message_id")
-
-                    # Discord Botを使用してメッセージを送信
-                    result = await self.discord_service.send_message(
-                        channel_id=channel_id, content=content, reference_message_id=reference_message_id
-                    )
-
-                    if result.get("success", False):
-                        return [
-                            types.TextContent(type="text", text=f"メッセージを送信しました: {result['message_id']}")
-                        ]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ送信エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                elif name == "discord_edit_message":
-                    channel_id = arguments["channel_id"]
-                    message_id = arguments["message_id"]
-                    content = arguments["content"]
-
-                    # Discord Botを使用してメッセージを編集
-                    result = await self.discord_service.edit_message(
-                        channel_id=channel_id, message_id=message_id, content=content
-                    )
-
-                    if result.get("success", False):
-                        return [types.TextContent(type="text", text=f"メッセージを編集しました: {message_id}")]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ編集エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                elif name == "discord_delete_message":
-                    channel_id = arguments["channel_id"]
-                    message_id = arguments["message_id"]
-
-                    # Discord Botを使用してメッセージを削除
-                    result = await self.discord_service.delete_message(channel_id=channel_id, message_id=message_id)
-
-                    if result.get("success", False):
-                        return [types.TextContent(type="text", text=f"メッセージを削除しました: {message_id}")]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ削除エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                elif name == "discord_get_message":
-                    channel_id = arguments["channel_id"]
-                    message_id = arguments["message_id"]
-
-                    # Discord Botを使用してメッセージを取得
-                    result = await self.discord_service.get_message(channel_id=channel_id, message_id=message_id)
-
-                    if result.get("success", False):
-                        message = result["message"]
-                        return [
-                            types.TextContent(
-                                type="text",
-                                text=f"メッセージを取得しました:\n"
-                                f"ID: {message['id']}\n"
-                                f"作成者: {message['author']}\n"
-                                f"内容: {message['content']}\n"
-                                f"タイムスタンプ: {message['timestamp']}",
-                            )
-                        ]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ取得エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                elif name == "discord_get_message_history":
-                    channel_id = arguments["channel_id"]
-                    reference_message_id = arguments.get("reference_message_id")
-                    limit = arguments.get("limit", 10)
-
-                    # Discord Botを使用してメッセージ履歴を取得
-                    result = await self.discord_service.get_message_history(
-                        channel_id=channel_id, reference_message_id=reference_message_id, limit=limit
-                    )
-
-                    if result.get("success", False):
-                        messages = result["messages"]
-                        message_texts = []
-                        for msg in messages:
-                            message_texts.append(
-                                f"ID: {msg['id']}\n"
-                                f"作成者: {msg['author']}\n"
-                                f"内容: {msg['content']}\n"
-                                f"タイムスタンプ: {msg['timestamp']}\n"
-                            )
-
-                        return [
-                            types.TextContent(
-                                type="text",
-                                text=f"{len(messages)}件のメッセージを取得しました:\n\n"
-                                + "\n---\n".join(message_texts),
-                            )
-                        ]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ履歴取得エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                elif name == "discord_search_messages":
-                    channel_id = arguments["channel_id"]
-                    query = arguments["query"]
-                    limit = arguments.get("limit", 25)
-
-                    # Discord Botを使用してメッセージを検索
-                    result = await self.discord_service.search_messages(channel_id=channel_id, query=query, limit=limit)
-
-                    if result.get("success", False):
-                        messages = result["messages"]
-                        message_texts = []
-                        for msg in messages:
-                            message_texts.append(
-                                f"ID: {msg['id']}\n"
-                                f"作成者: {msg['author']}\n"
-                                f"内容: {msg['content']}\n"
-                                f"タイムスタンプ: {msg['timestamp']}\n"
-                            )
-
-                        return [
-                            types.TextContent(
-                                type="text",
-                                text=f"検索クエリ「{query}」に一致する{len(messages)}件のメッセージを取得しました:\n\n"
-                                + "\n---\n".join(message_texts),
-                            )
-                        ]
-                    else:
-                        return [
-                            types.TextContent(
-                                type="text", text=f"メッセージ検索エラー: {result.get('error', '不明なエラー')}"
-                            )
-                        ]
-
-                else:
-                    self.logger.error(f"未知のツール: {name}")
-                    return [types.TextContent(type="text", text=f"ツールが見つかりません: {name}")]
-
-            except Exception as e:
-                self.logger.error(f"ツール実行エラー: {str(e)}")
-                return [types.TextContent(type="text", text=f"ツール実行中にエラーが発生しました: {str(e)}")]
+            return await self.call_tool(name, arguments)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """ツール名に対応するハンドラを呼び出す
+
+        Args:
+            name: ツール名
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        self.logger.info("ツール呼び出し: %s, 引数: %s", name, arguments)
+
+        handler = self._handlers.get(name)
+        if handler is None:
+            self.logger.error("未知のツール: %s", name)
+            return [types.TextContent(type="text", text=f"ツールが見つかりません: {name}")]
+
+        try:
+            return await handler(arguments)
+        except Exception as e:
+            self.logger.error("ツール実行エラー: %s", e)
+            return [types.TextContent(type="text", text=f"ツール実行中にエラーが発生しました: {str(e)}")]
+
+    async def _send_message(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_send_message ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        # Discord Botを使用してメッセージを送信
+        result = await self.discord_service.send_message(
+            channel_id=arguments["channel_id"],
+            content=arguments["content"],
+            reference_message_id=arguments.get("reference_message_id"),
+        )
+
+        if result.get("success", False):
+            return [types.TextContent(type="text", text=f"メッセージを送信しました: {result['message_id']}")]
+        return [types.TextContent(type="text", text=f"メッセージ送信エラー: {result.get('error', '不明なエラー')}")]
+
+    async def _edit_message(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_edit_message ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        message_id = arguments["message_id"]
+
+        # Discord Botを使用してメッセージを編集
+        result = await self.discord_service.edit_message(
+            channel_id=arguments["channel_id"], message_id=message_id, content=arguments["content"]
+        )
+
+        if result.get("success", False):
+            return [types.TextContent(type="text", text=f"メッセージを編集しました: {message_id}")]
+        return [types.TextContent(type="text", text=f"メッセージ編集エラー: {result.get('error', '不明なエラー')}")]
+
+    async def _delete_message(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_delete_message ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        message_id = arguments["message_id"]
+
+        # Discord Botを使用してメッセージを削除
+        result = await self.discord_service.delete_message(channel_id=arguments["channel_id"], message_id=message_id)
+
+        if result.get("success", False):
+            return [types.TextContent(type="text", text=f"メッセージを削除しました: {message_id}")]
+        return [types.TextContent(type="text", text=f"メッセージ削除エラー: {result.get('error', '不明なエラー')}")]
+
+    async def _get_message(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_get_message ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        # Discord Botを使用してメッセージを取得
+        result = await self.discord_service.get_message(
+            channel_id=arguments["channel_id"], message_id=arguments["message_id"]
+        )
+
+        if result.get("success", False):
+            message = result["message"]
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"メッセージを取得しました:\n"
+                    f"ID: {message['id']}\n"
+                    f"作成者: {message['author']}\n"
+                    f"内容: {message['content']}\n"
+                    f"タイムスタンプ: {message['timestamp']}",
+                )
+            ]
+        return [types.TextContent(type="text", text=f"メッセージ取得エラー: {result.get('error', '不明なエラー')}")]
+
+    async def _get_message_history(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_get_message_history ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        # Discord Botを使用してメッセージ履歴を取得
+        result = await self.discord_service.get_message_history(
+            channel_id=arguments["channel_id"],
+            reference_message_id=arguments.get("reference_message_id"),
+            limit=arguments.get("limit", 10),
+        )
+
+        if result.get("success", False):
+            messages = result["messages"]
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"{len(messages)}件のメッセージを取得しました:\n\n" + _format_messages(messages),
+                )
+            ]
+        return [types.TextContent(type="text", text=f"メッセージ履歴取得エラー: {result.get('error', '不明なエラー')}")]
+
+    async def _search_messages(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """discord_search_messages ツールの処理
+
+        Args:
+            arguments: ツールの引数
+
+        Returns:
+            ツールの実行結果
+        """
+        query = arguments["query"]
+
+        # Discord Botを使用してメッセージを検索
+        result = await self.discord_service.search_messages(
+            channel_id=arguments["channel_id"], query=query, limit=arguments.get("limit", 25)
+        )
+
+        if result.get("success", False):
+            messages = result["messages"]
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"検索クエリ「{query}」に一致する{len(messages)}件のメッセージを取得しました:\n\n"
+                    + _format_messages(messages),
+                )
+            ]
+        return [types.TextContent(type="text", text=f"メッセージ検索エラー: {result.get('error', '不明なエラー')}")]
 
     async def handle_sse(self, request: Request) -> Response:
         """SSE接続ハンドラ
@@ -379,5 +410,5 @@ class DiscordMCPServer:
             await self.sse.handle_post_message(request.scope, request.receive, custom_send)
             return JSONResponse(response_data)
         except Exception as e:
-            self.logger.error(f"メッセージ処理エラー: {str(e)}")
+            self.logger.error("メッセージ処理エラー: %s", e)
             return JSONResponse({"status": "error", "message": f"Failed to process message: {str(e)}"}, status_code=500)
@@ -4,16 +4,9 @@
 このモジュールは、システムへの入力点（APIリクエスト、Botメッセージ、Webhookなど）を管理するデータモデルを定義します。
 """
 
-from sqlalchemy import (
-    Boolean,
-    Column,
-    DateTime,
-    ForeignKey,
-    Integer,
-    String,
-)
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, true
 
 from ..database import Base
 
@@ -24,17 +17,27 @@ class Action(Base):
     """
 
     __tablename__ = "actions"
+    __table_args__ = (
+        # 一覧取得の絞り込み（action_type, is_enabled）と並び順（created_at）に対応する複合インデックス
+        Index("ix_actions_type_enabled_created", "action_type", "is_enabled", "created_at"),
+        # 絞り込みなしの一覧取得とカーソルによるページング（created_at, id）に対応する複合インデックス
+        Index("ix_actions_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)  # アクション名
-    action_type = Column(String, index=True, nullable=False)  # 'api', 'discord', 'slack', 'webhook'
+    action_type = Column(String, nullable=False)  # 'api', 'discord', 'slack', 'webhook'
 
     # アクション設定とコンテキスト抽出ルールは別テーブルで管理するため削除
 
     # 関連するタスクテンプレート
     task_template_id = Column(Integer, ForeignKey("task_templates.id"), nullable=True)
 
-    is_enabled = Column(Boolean, default=True)
+    # 関連するDiscord設定（action_configから非正規化し、発火時の結合を省く）
+    # Discord設定が削除された場合は関連付けを解除する
+    discord_config_id = Column(Integer, ForeignKey("config_discord.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    is_enabled = Column(Boolean, server_default=true())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_triggered_at = Column(DateTime(timezone=True), nullable=True)
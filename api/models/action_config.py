@@ -4,7 +4,7 @@
 このモジュールは、アクションと設定の関連付けを管理するデータモデルを定義します。
 """
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,12 +17,19 @@ class ActionConfig(Base):
     """
 
     __tablename__ = "action_config"
+    __table_args__ = (
+        # 設定からのアクション検索（config_type, config_id）に対応する複合インデックス
+        # 末尾のaction_idにより、アクションとの結合でテーブル本体を参照しない
+        Index("ix_action_config_type_config_action", "config_type", "config_id", "action_id"),
+        # アクションに関連する設定の一覧取得（action_id）に対応するインデックス
+        Index("ix_action_config_action_id", "action_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     action_id = Column(Integer, ForeignKey("actions.id"), nullable=False)
 
     # 設定タイプ（"discord", "slack"など）
-    config_type: Column = Column(Enum("discord", "slack", name="config_type"), nullable=False)
+    config_type = Column(Enum("discord", "slack", name="config_type"), nullable=False)
 
     config_id = Column(Integer, nullable=False)  # 関連する設定のID
 
@@ -4,7 +4,7 @@ Discord設定モデルモジュール
 このモジュールは、Discord固有の設定を管理するデータモデルを定義します。
 """
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String
 from sqlalchemy.sql import func
 
 from ..database import Base
@@ -16,24 +16,30 @@ class ConfigDiscord(Base):
     """
 
     __tablename__ = "config_discord"
+    __table_args__ = (
+        # リアクション・キーワードによる設定の検索（catch_type, catch_value）に対応する複合インデックス
+        Index("ix_config_discord_catch", "catch_type", "catch_value"),
+        # 一覧取得の並び順とカーソルによるページング（created_at, id）に対応する複合インデックス
+        Index("ix_config_discord_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)  # 設定名
 
     # 取得タイプ（'reaction', 'text', 'textWithMention'）
-    catch_type: Column = Column(
+    catch_type = Column(
         Enum("reaction", "text", "textWithMention", name="discord_catch_type"), nullable=False, default="reaction"
     )
 
     catch_value = Column(String, nullable=False)  # 取得対象（絵文字、キーワードなど）
 
     # メッセージ収集戦略
-    message_type: Column = Column(
+    message_type = Column(
         Enum("single", "thread", "range", name="discord_message_type"), nullable=False, default="single"
     )
 
     # レスポンス形式
-    response_format: Column = Column(
+    response_format = Column(
         Enum("reply", "dm", "channel", name="discord_response_format"), nullable=False, default="reply"
     )
 
@@ -5,7 +5,7 @@
 """
 
 from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String, Text
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, true
 
 from ..database import Base
 
@@ -21,7 +21,7 @@ class Extension(Base):
     name = Column(String, unique=True, index=True, nullable=False)
     description = Column(Text, nullable=True)
     version = Column(String, nullable=True)
-    enabled = Column(Boolean, default=True)
+    enabled = Column(Boolean, server_default=true())
 
     # Goose拡張機能の設定フィールド
     type = Column(String, nullable=True)  # builtin, stdio, sse
@@ -5,7 +5,7 @@
 """
 
 from sqlalchemy import JSON, Boolean, Column, DateTime, Integer, String, Text
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 
 from ..database import Base
 
@@ -21,7 +21,7 @@ class Setting(Base):
     key = Column(String, unique=True, index=True, nullable=False)
     value = Column(JSON, nullable=True)
     description = Column(Text, nullable=True)
-    is_secret = Column(Boolean, default=False)  # 秘密情報かどうか
+    is_secret = Column(Boolean, server_default=false())  # 秘密情報かどうか
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -4,7 +4,7 @@
 このモジュールは、実行されたタスクのログを記録するデータモデルを定義します。
 """
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,6 +17,11 @@ class TaskExecution(Base):
     """
 
     __tablename__ = "task_executions"
+    __table_args__ = (
+        # 一覧取得の絞り込み（status / template_id）と並び順（created_at）に対応する複合インデックス
+        Index("ix_task_executions_status_created", "status", "created_at"),
+        Index("ix_task_executions_template_created", "template_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("task_templates.id"), nullable=False)
@@ -28,9 +33,7 @@ class TaskExecution(Base):
     # 実行結果
     result = Column(Text, nullable=True)
     extensions_output = Column(JSON, nullable=True)
-    status = Column(
-        String, index=True, nullable=False, default="pending"
-    )  # 'pending', 'processing', 'completed', 'failed'
+    status = Column(String, nullable=False, default="pending")  # 'pending', 'processing', 'completed', 'failed'
     error = Column(Text, nullable=True)
 
     # 実行時間情報
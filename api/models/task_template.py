@@ -30,7 +30,8 @@ class TaskTemplate(Base):
 
     # リレーションシップ
     user = relationship("User", backref="task_templates")
-    executions = relationship("TaskExecution", back_populates="template")
+    # 実行ログは件数が増え続けるため、一覧として読み込まずクエリで取得する
+    executions = relationship("TaskExecution", back_populates="template", lazy="write_only")
 
     def __repr__(self) -> str:
         """文字列表現
@@ -4,34 +4,82 @@
 このモジュールは、アクションに関連するAPIエンドポイントを提供します。
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-from ..auth.dependencies import get_current_user, get_optional_user
-from ..models.user import User
-from ..services.action_service import ActionService
+from ..auth.dependencies import CurrentUser, get_current_user, get_optional_user
+from ..config import settings
+from ..services.action_service import ActionService, get_action_service
+from ..utils.list_fields import FIELD_DICT_LIST_ADAPTER, parse_fields
+from ..utils.params import AfterIdQuery, IdPath, LimitQuery, OffsetQuery
+from ..utils.request_body import read_json_body
 
 router = APIRouter(prefix="/api/v1/actions", tags=["アクション"])
 
 
-@router.post("/", response_model=Dict[str, Any])
+class ActionCreate(BaseModel):
+    """アクション作成モデル"""
+
+    name: str
+    action_type: Literal["api", "discord", "slack", "webhook"]
+    task_template_id: Optional[int] = None
+
+
+class ActionResponse(BaseModel):
+    """アクションレスポンスモデル"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    action_type: str
+    task_template_id: Optional[int] = None
+    discord_config_id: Optional[int] = None
+    is_enabled: Optional[bool] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    last_triggered_at: Optional[str] = None
+    discord_config: Optional[Dict[str, Any]] = None
+
+
+class ActionListItem(BaseModel):
+    """アクション一覧の要素モデル（updated_atは含まない）"""
+
+    id: int
+    name: str
+    action_type: str
+    task_template_id: Optional[int] = None
+    discord_config_id: Optional[int] = None
+    is_enabled: Optional[bool] = None
+    created_at: Optional[str] = None
+    last_triggered_at: Optional[str] = None
+    discord_config: Optional[Dict[str, Any]] = None
+
+
+# 一覧レスポンスのシリアライザ（モジュール読み込み時に一度だけ構築）
+_ACTION_LIST_ADAPTER = TypeAdapter(List[ActionListItem])
+
+# fieldsで指定可能なアクションの列（関連データのdiscord_configは含めない）
+_ACTION_COLUMN_FIELDS = frozenset(ActionResponse.model_fields) - {"discord_config"}
+
+
+@router.post("/", response_model=ActionResponse, response_model_exclude_unset=True)
 async def create_action(
-    name: str,
-    action_type: str,
-    task_template_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user),
+    action_data: ActionCreate,
+    current_user: CurrentUser = Depends(get_current_user),
+    action_service: ActionService = Depends(get_action_service),
 ):
     """アクションを作成するエンドポイント
 
     Args:
-        name (str): アクション名
-        action_type (str): アクションタイプ（'api', 'discord', 'slack', 'webhook'）
-        task_template_id (Optional[int], optional): 関連するタスクテンプレートのID。デフォルトはNone
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        action_data (ActionCreate): アクション作成データ
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        action_service (ActionService, optional): アクションサービス。Depends(get_action_service)から取得
 
     Returns:
-        Dict[str, Any]: 作成されたアクション
+        ActionResponse: 作成されたアクション
     """
     # 管理者のみアクションを作成可能
     if not current_user.is_admin:
@@ -40,31 +88,34 @@ async def create_action(
             detail="アクションを作成する権限がありません",
         )
 
-    action_service = ActionService()
     result = await action_service.create_action(
-        name=name,
-        action_type=action_type,
-        task_template_id=task_template_id,
+        name=action_data.name,
+        action_type=action_data.action_type,
+        task_template_id=action_data.task_template_id,
     )
 
-    return result
+    return ActionResponse.model_validate(result)
 
 
-@router.get("/{action_id}", response_model=Dict[str, Any])
-async def get_action(action_id: int, current_user: User = Depends(get_current_user)):
+@router.get("/{action_id}", response_model=None, responses={200: {"model": ActionResponse}})
+async def get_action(
+    action_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    action_service: ActionService = Depends(get_action_service),
+):
     """アクションの詳細を取得するエンドポイント
 
     Args:
         action_id (int): アクションID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        action_service (ActionService, optional): アクションサービス。Depends(get_action_service)から取得
 
     Returns:
-        Dict[str, Any]: アクションの詳細
+        ActionResponse: アクションの詳細
 
     Raises:
         HTTPException: アクションが見つからない場合
     """
-    action_service = ActionService()
     action = await action_service.get_action(action_id)
 
     if not action:
@@ -77,28 +128,40 @@ async def get_action(action_id: int, current_user: User = Depends(get_current_us
             detail="このアクションにアクセスする権限がありません",
         )
 
-    return action
+    # データベースから取得した値は検証済みとみなし、model_constructで組み立てる
+    # （response_model=Noneとし、スキーマはresponsesで公開する）
+    return Response(ActionResponse.model_construct(**action).model_dump_json(), media_type="application/json")
 
 
-@router.get("/", response_model=List[Dict[str, Any]])
+@router.get("/", response_model=None, responses={200: {"model": List[ActionListItem]}})
 async def list_actions(
     action_type: Optional[str] = None,
     is_enabled: Optional[bool] = None,
-    limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    limit: LimitQuery = 10,
+    offset: OffsetQuery = 0,
+    after_id: AfterIdQuery = None,
+    fields: Optional[str] = Query(None, description="返却するフィールド（カンマ区切り）"),
+    include_discord_config: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
+    action_service: ActionService = Depends(get_action_service),
 ):
     """アクションの一覧を取得するエンドポイント
 
+    次のページは、最後の要素のIDをafter_idに指定して取得します。
+
     Args:
         action_type (Optional[str], optional): アクションタイプ。デフォルトはNone
         is_enabled (Optional[bool], optional): 有効かどうか。デフォルトはNone
         limit (int, optional): 取得件数。デフォルトは10
         offset (int, optional): オフセット。デフォルトは0
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        after_id (Optional[int], optional): 前のページの最後のアクションID。デフォルトはNone
+        fields (Optional[str], optional): 返却するフィールド（カンマ区切り）。デフォルトはNone
+        include_discord_config (bool, optional): 関連するDiscord設定を含めるかどうか。デフォルトはFalse
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        action_service (ActionService, optional): アクションサービス。Depends(get_action_service)から取得
 
     Returns:
-        List[Dict[str, Any]]: アクションのリスト
+        List[ActionListItem]: アクションのリスト（fields指定時は指定フィールドのみの辞書）
     """
     # 管理者のみアクションの一覧を取得可能
     if not current_user.is_admin:
@@ -107,43 +170,87 @@ async def list_actions(
             detail="アクションの一覧を取得する権限がありません",
         )
 
-    action_service = ActionService()
+    columns = parse_fields(fields, _ACTION_COLUMN_FIELDS)
+
     actions = await action_service.list_actions(
-        action_type=action_type, is_enabled=is_enabled, limit=limit, offset=offset
+        action_type=action_type,
+        is_enabled=is_enabled,
+        limit=limit,
+        offset=offset,
+        fields=columns,
+        include_discord_config=include_discord_config,
+        after_id=after_id,
+    )
+
+    if columns:
+        return Response(FIELD_DICT_LIST_ADAPTER.dump_json(actions), media_type="application/json")
+
+    # 関連するDiscord設定は、取得した場合のみ出力する
+    return Response(
+        _ACTION_LIST_ADAPTER.dump_json(
+            [ActionListItem.model_construct(**action) for action in actions], exclude_unset=True
+        ),
+        media_type="application/json",
     )
 
-    return actions
+
+async def get_trigger_input(request: Request) -> Dict[str, Any]:
+    """トリガーの入力データをリクエストボディから取得する依存関係
+
+    ボディはTRIGGER_MAX_BODY_BYTESを上限に読み込み、orjsonで解析します。
+
+    Args:
+        request (Request): リクエスト
+
+    Returns:
+        Dict[str, Any]: 入力データ
+
+    Raises:
+        HTTPException: ボディが大きすぎる場合、不正なJSONの場合、またはJSONオブジェクトでない場合
+    """
+    input_data = await read_json_body(request, settings.TRIGGER_MAX_BODY_BYTES)
+    if not isinstance(input_data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="入力データはJSONオブジェクトである必要があります",
+        )
+    return input_data
 
 
-@router.post("/{action_id}/trigger", response_model=Dict[str, Any])
+@router.post(
+    "/{action_id}/trigger",
+    response_model=Dict[str, Any],
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {"schema": {"type": "object"}}}}},
+)
 async def trigger_action(
-    action_id: int,
-    input_data: Dict[str, Any],
-    current_user: User = Depends(get_optional_user),
+    action_id: IdPath,
+    input_data: Dict[str, Any] = Depends(get_trigger_input),
+    current_user: Optional[CurrentUser] = Depends(get_optional_user),
+    action_service: ActionService = Depends(get_action_service),
 ):
     """アクションをトリガーするエンドポイント
 
     Args:
         action_id (int): アクションID
-        input_data (Dict[str, Any]): 入力データ
-        current_user (User, optional): 現在のユーザー。Depends(get_optional_user)から取得
+        input_data (Dict[str, Any], optional): 入力データ。Depends(get_trigger_input)から取得
+        current_user (Optional[CurrentUser], optional): 現在のユーザー。Depends(get_optional_user)から取得
+        action_service (ActionService, optional): アクションサービス。Depends(get_action_service)から取得
 
     Returns:
         Dict[str, Any]: 実行結果
     """
-    action_service = ActionService()
     result = await action_service.trigger_action(action_id=action_id, input_data=input_data)
 
     return result
 
 
 @router.put("/{action_id}/enable", response_model=Dict[str, Any])
-async def enable_action(action_id: int, current_user: User = Depends(get_current_user)):
+async def enable_action(action_id: IdPath, current_user: CurrentUser = Depends(get_current_user)):
     """アクションを有効化するエンドポイント
 
     Args:
         action_id (int): アクションID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
 
     Returns:
         Dict[str, Any]: 更新されたアクション
@@ -160,12 +267,12 @@ async def enable_action(action_id: int, current_user: User = Depends(get_current
 
 
 @router.put("/{action_id}/disable", response_model=Dict[str, Any])
-async def disable_action(action_id: int, current_user: User = Depends(get_current_user)):
+async def disable_action(action_id: IdPath, current_user: CurrentUser = Depends(get_current_user)):
     """アクションを無効化するエンドポイント
 
     Args:
         action_id (int): アクションID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
 
     Returns:
         Dict[str, Any]: 更新されたアクション
@@ -8,23 +8,36 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import text
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth import create_access_token
 from ..database import get_db
-from ..services.user_service import UserService
+from ..services.user_service import UserService, get_user_service
 
 router = APIRouter(prefix="/api/v1/auth", tags=["認証"])
 
 
+class UserCreate(BaseModel):
+    """ユーザー登録モデル"""
+
+    username: str
+    email: str
+    password: str
+
+
 @router.post("/token", response_model=Dict[str, Any])
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
+):
     """アクセストークンを取得するエンドポイント
 
     Args:
         form_data (OAuth2PasswordRequestForm, optional): OAuth2フォームデータ
         db (AsyncSession, optional): データベースセッション
+        user_service (UserService, optional): ユーザーサービス。Depends(get_user_service)から取得
 
     Returns:
         Dict[str, Any]: アクセストークン情報
@@ -32,8 +45,6 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     Raises:
         HTTPException: 認証に失敗した場合
     """
-    user_service = UserService()
-
     async with db as session:
         user = await user_service.authenticate_user(form_data.username, form_data.password, session)
 
@@ -58,14 +69,17 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 
 @router.post("/register", response_model=Dict[str, Any])
-async def register_user(username: str, email: str, password: str, db: AsyncSession = Depends(get_db)):
+async def register_user(
+    user_data: UserCreate,
+    db: AsyncSession = Depends(get_db),
+    user_service: UserService = Depends(get_user_service),
+):
     """新規ユーザー登録エンドポイント
 
     Args:
-        username (str): ユーザー名
-        email (str): メールアドレス
-        password (str): パスワード
+        user_data (UserCreate): ユーザー登録データ
         db (AsyncSession, optional): データベースセッション
+        user_service (UserService, optional): ユーザーサービス。Depends(get_user_service)から取得
 
     Returns:
         Dict[str, Any]: 登録されたユーザー情報
@@ -73,21 +87,14 @@ async def register_user(username: str, email: str, password: str, db: AsyncSessi
     Raises:
         HTTPException: ユーザー登録に失敗した場合
     """
-    user_service = UserService()
-
-    # 最初のユーザーは管理者として登録
-    is_admin = False
-
-    # ユーザー数を確認
+    # 最初のユーザーは管理者として登録（判定は作成と同じINSERT文で行う）
     async with db as session:
-        result = await session.execute(text("SELECT COUNT(*) FROM users"))
-        count = result.scalar()
-        if count == 0:
-            is_admin = True
-
-        # ユーザーを作成
         user = await user_service.create_user(
-            username=username, email=email, password=password, is_admin=is_admin, db=session
+            username=user_data.username,
+            email=user_data.email,
+            password=user_data.password,
+            is_admin=None,
+            db=session,
         )
 
     if not user:
@@ -6,112 +6,136 @@ Discord設定ルートモジュール
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field, TypeAdapter
 
-from ..auth.dependencies import get_current_user
-from ..models.user import User
-from ..services.action_config_service import ActionConfigService
-from ..services.discord_config_service import DiscordConfigService
+from ..auth.dependencies import CurrentUser, get_current_active_admin, get_current_user
+from ..services.action_config_service import ActionConfigService, get_action_config_service
+from ..services.discord_config_service import DiscordConfigService, get_discord_config_service
+from ..utils.etag import etag_json_response
+from ..utils.params import AfterIdQuery, IdPath, LimitQuery, OffsetQuery
+from ..utils.request_body import json_body, json_body_openapi
 
 router = APIRouter(prefix="/api/v1/discord-configs", tags=["Discord設定"])
 
 
-@router.post("/", response_model=Dict[str, Any])
+# リクエストモデル
+class DiscordConfigCreate(BaseModel):
+    """Discord設定作成モデル"""
+
+    name: str = Field(..., description="設定名")
+    catch_type: str = Field(..., description="取得タイプ（'reaction', 'text', 'textWithMention'）")
+    catch_value: str = Field(..., description="取得対象（絵文字、キーワードなど）")
+    message_type: str = Field("single", description="メッセージ収集戦略")
+    response_format: str = Field("reply", description="レスポンス形式")
+
+
+class DiscordConfigUpdate(BaseModel):
+    """Discord設定更新モデル（指定した項目のみ更新）"""
+
+    name: Optional[str] = Field(None, description="設定名")
+    catch_type: Optional[str] = Field(None, description="取得タイプ")
+    catch_value: Optional[str] = Field(None, description="取得対象")
+    message_type: Optional[str] = Field(None, description="メッセージ収集戦略")
+    response_format: Optional[str] = Field(None, description="レスポンス形式")
+
+
+class DiscordConfigResponse(BaseModel):
+    """Discord設定レスポンスモデル"""
+
+    id: int
+    name: str
+    catch_type: str
+    catch_value: str
+    message_type: str
+    response_format: str
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+# 一覧レスポンスのシリアライザ（モジュール読み込み時に一度だけ構築）
+_DISCORD_CONFIG_LIST_ADAPTER = TypeAdapter(List[DiscordConfigResponse])
+
+
+@router.post("/", response_model=Dict[str, Any], openapi_extra=json_body_openapi(DiscordConfigCreate))
 async def create_discord_config(
-    name: str,
-    catch_type: str,
-    catch_value: str,
-    message_type: str = "single",
-    response_format: str = "reply",
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    discord_config: DiscordConfigCreate = Depends(json_body(DiscordConfigCreate)),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
 ):
     """Discord設定を作成するエンドポイント
 
     Args:
-        name (str): 設定名
-        catch_type (str): 取得タイプ（'reaction', 'text', 'textWithMention'）
-        catch_value (str): 取得対象（絵文字、キーワードなど）
-        message_type (str, optional): メッセージ収集戦略。デフォルトは"single"
-        response_format (str, optional): レスポンス形式。デフォルトは"reply"
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        discord_config (DiscordConfigCreate, optional): 設定データ。Depends(json_body(DiscordConfigCreate))から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
 
     Returns:
         Dict[str, Any]: 作成されたDiscord設定
     """
-    # 管理者のみDiscord設定を作成可能
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Discord設定を作成する権限がありません",
-        )
-
-    discord_config_service = DiscordConfigService()
-    result = await discord_config_service.create_discord_config(
-        name=name,
-        catch_type=catch_type,
-        catch_value=catch_value,
-        message_type=message_type,
-        response_format=response_format,
-    )
+    result = await discord_config_service.create_discord_config(**discord_config.model_dump())
 
     return result
 
 
 @router.post("/{config_id}/link-action", response_model=Dict[str, Any])
 async def link_action_to_discord_config(
-    config_id: int,
+    config_id: IdPath,
     action_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
+    action_config_service: ActionConfigService = Depends(get_action_config_service),
 ):
     """Discord設定とアクションを関連付けるエンドポイント
 
+    アクションに関連付けられるDiscord設定は1つのみです。別のDiscord設定に関連付け済みのアクションは409を返します。
+
     Args:
         config_id (int): Discord設定ID
         action_id (int): アクションID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
+        action_config_service (ActionConfigService, optional): アクション設定サービス。Depends(get_action_config_service)から取得
 
     Returns:
         Dict[str, Any]: 作成されたアクション設定関連
     """
-    # 管理者のみDiscord設定とアクションを関連付け可能
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Discord設定とアクションを関連付ける権限がありません",
-        )
-
     # Discord設定の存在確認
-    discord_config_service = DiscordConfigService()
-    discord_config = await discord_config_service.get_discord_config(config_id)
-    if not discord_config:
+    if not await discord_config_service.discord_config_exists(config_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Discord設定が見つかりません",
         )
 
-    # アクション設定関連の作成
-    action_config_service = ActionConfigService()
-    result = await action_config_service.create_action_config(
-        action_id=action_id,
-        config_type="discord",
-        config_id=config_id,
-    )
+    # アクション設定関連の作成（アクションに関連付けられるDiscord設定は1つのみ）
+    try:
+        result = await action_config_service.create_action_config(
+            action_id=action_id,
+            config_type="discord",
+            config_id=config_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
     return result
 
 
 @router.get("/{config_id}", response_model=Dict[str, Any])
-async def get_discord_config(config_id: int, current_user: User = Depends(get_current_user)):
+async def get_discord_config(
+    config_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
+):
     """Discord設定の詳細を取得するエンドポイント
 
     Args:
         config_id (int): Discord設定ID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
 
     Returns:
         Dict[str, Any]: Discord設定の詳細
     """
-    discord_config_service = DiscordConfigService()
     discord_config = await discord_config_service.get_discord_config(config_id)
 
     if not discord_config:
@@ -123,73 +147,71 @@ async def get_discord_config(config_id: int, current_user: User = Depends(get_cu
     return discord_config
 
 
-@router.get("/", response_model=List[Dict[str, Any]])
+@router.get("/", response_model=None, responses={200: {"model": List[DiscordConfigResponse]}})
 async def list_discord_configs(
+    request: Request,
     catch_type: Optional[str] = None,
-    limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    limit: LimitQuery = 10,
+    offset: OffsetQuery = 0,
+    after_id: AfterIdQuery = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
 ):
     """Discord設定の一覧を取得するエンドポイント
 
+    レスポンスにはETagを付与し、If-None-Matchが一致する場合は304を返します。
+    次のページは、最後の要素のIDをafter_idに指定して取得します。
+
     Args:
+        request (Request): リクエスト
         catch_type (Optional[str], optional): 取得タイプ。デフォルトはNone
         limit (int, optional): 取得件数。デフォルトは10
         offset (int, optional): オフセット。デフォルトは0
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        after_id (Optional[int], optional): 前のページの最後の設定ID。デフォルトはNone
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
 
     Returns:
-        List[Dict[str, Any]]: Discord設定のリスト
+        List[DiscordConfigResponse]: Discord設定のリスト
     """
-    discord_config_service = DiscordConfigService()
     discord_configs = await discord_config_service.list_discord_configs(
         catch_type=catch_type,
         limit=limit,
         offset=offset,
+        after_id=after_id,
     )
 
-    return discord_configs
+    return etag_json_response(
+        request,
+        _DISCORD_CONFIG_LIST_ADAPTER.dump_json(
+            [DiscordConfigResponse.model_construct(**discord_config) for discord_config in discord_configs]
+        ),
+    )
 
 
-@router.put("/{config_id}", response_model=Dict[str, Any])
+@router.patch("/{config_id}", response_model=Dict[str, Any], openapi_extra=json_body_openapi(DiscordConfigUpdate))
+@router.put("/{config_id}", response_model=Dict[str, Any], openapi_extra=json_body_openapi(DiscordConfigUpdate))
 async def update_discord_config(
-    config_id: int,
-    name: Optional[str] = None,
-    catch_type: Optional[str] = None,
-    catch_value: Optional[str] = None,
-    message_type: Optional[str] = None,
-    response_format: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    config_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    discord_config: DiscordConfigUpdate = Depends(json_body(DiscordConfigUpdate)),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
 ):
-    """Discord設定を更新するエンドポイント
+    """Discord設定を部分更新するエンドポイント
+
+    リクエストボディに含まれる項目のみを更新します。
 
     Args:
         config_id (int): Discord設定ID
-        name (Optional[str], optional): 設定名。デフォルトはNone
-        catch_type (Optional[str], optional): 取得タイプ。デフォルトはNone
-        catch_value (Optional[str], optional): 取得対象。デフォルトはNone
-        message_type (Optional[str], optional): メッセージ収集戦略。デフォルトはNone
-        response_format (Optional[str], optional): レスポンス形式。デフォルトはNone
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        discord_config (DiscordConfigUpdate, optional): 更新データ。Depends(json_body(DiscordConfigUpdate))から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
 
     Returns:
         Dict[str, Any]: 更新されたDiscord設定
     """
-    # 管理者のみDiscord設定を更新可能
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Discord設定を更新する権限がありません",
-        )
-
-    discord_config_service = DiscordConfigService()
     updated_config = await discord_config_service.update_discord_config(
-        config_id=config_id,
-        name=name,
-        catch_type=catch_type,
-        catch_value=catch_value,
-        message_type=message_type,
-        response_format=response_format,
+        config_id=config_id, **discord_config.model_dump(exclude_unset=True)
     )
 
     if not updated_config:
@@ -203,26 +225,20 @@ async def update_discord_config(
 
 @router.delete("/{config_id}", response_model=Dict[str, Any])
 async def delete_discord_config(
-    config_id: int,
-    current_user: User = Depends(get_current_user),
+    config_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    discord_config_service: DiscordConfigService = Depends(get_discord_config_service),
 ):
     """Discord設定を削除するエンドポイント
 
     Args:
         config_id (int): Discord設定ID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        discord_config_service (DiscordConfigService, optional): Discord設定サービス。Depends(get_discord_config_service)から取得
 
     Returns:
         Dict[str, Any]: 削除結果
     """
-    # 管理者のみDiscord設定を削除可能
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Discord設定を削除する権限がありません",
-        )
-
-    discord_config_service = DiscordConfigService()
     success = await discord_config_service.delete_discord_config(config_id)
 
     if not success:
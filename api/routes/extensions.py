@@ -6,12 +6,14 @@
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-from ..auth.dependencies import get_current_active_admin, get_current_user
-from ..models.user import User
-from ..services.extension_service import ExtensionService
+from ..auth.dependencies import CurrentUser, get_current_active_admin, get_current_user
+from ..services.extension_service import ExtensionService, get_extension_service
+from ..utils.etag import etag_json_response
+from ..utils.params import IdPath
+from ..utils.request_body import json_body, json_body_openapi
 
 router = APIRouter(prefix="/api/v1/extensions", tags=["拡張機能"])
 
@@ -39,6 +41,8 @@ class ExtensionCreate(ExtensionBase):
 class ExtensionResponse(ExtensionBase):
     """拡張機能レスポンスモデル"""
 
+    model_config = ConfigDict(frozen=True)
+
     id: int
     enabled: bool
     type: str
@@ -51,6 +55,10 @@ class ExtensionResponse(ExtensionBase):
     secrets: Optional[List[str]] = None
 
 
+# 一覧レスポンスのシリアライザ（モジュール読み込み時に一度だけ構築）
+_EXTENSION_LIST_ADAPTER = TypeAdapter(List[ExtensionResponse])
+
+
 class ExtensionUpdate(BaseModel):
     """拡張機能更新モデル"""
 
@@ -66,42 +74,66 @@ class ExtensionUpdate(BaseModel):
     secrets: Optional[List[str]] = None
 
 
-@router.get("/", response_model=List[ExtensionResponse])
-async def list_extensions(current_user: User = Depends(get_current_user)):
+@router.get("/", response_model=None, responses={200: {"model": List[ExtensionResponse]}})
+async def list_extensions(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    extension_service: ExtensionService = Depends(get_extension_service),
+):
     """利用可能な拡張機能の一覧を取得するエンドポイント
 
+    レスポンスにはETagを付与し、If-None-Matchが一致する場合は304を返します。
+
     Args:
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        request (Request): リクエスト
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
         List[ExtensionResponse]: 拡張機能のリスト
     """
-    extension_service = ExtensionService()
-    return await extension_service.list_extensions()
-
-
-@router.post("/", response_model=ExtensionResponse, status_code=status.HTTP_201_CREATED)
-async def add_extension(extension: ExtensionCreate, current_user: User = Depends(get_current_active_admin)):
+    extensions = await extension_service.list_extensions()
+    return etag_json_response(
+        request, _EXTENSION_LIST_ADAPTER.dump_json([ExtensionResponse.model_construct(**ext) for ext in extensions])
+    )
+
+
+@router.post(
+    "/",
+    response_model=ExtensionResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=json_body_openapi(ExtensionCreate),
+)
+async def add_extension(
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    extension: ExtensionCreate = Depends(json_body(ExtensionCreate)),
+    extension_service: ExtensionService = Depends(get_extension_service),
+):
     """新しい拡張機能を追加するエンドポイント
 
     Args:
-        extension (ExtensionCreate): 拡張機能データ
-        current_user (User, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        extension (ExtensionCreate, optional): 拡張機能データ。Depends(json_body(ExtensionCreate))から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
         ExtensionResponse: 追加された拡張機能
     """
-    extension_service = ExtensionService()
     return await extension_service.add_extension(extension)
 
 
 @router.get("/{extension_id}", response_model=ExtensionResponse)
-async def get_extension(extension_id: int, current_user: User = Depends(get_current_user)):
+async def get_extension(
+    extension_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    extension_service: ExtensionService = Depends(get_extension_service),
+):
     """特定の拡張機能の詳細を取得するエンドポイント
 
     Args:
         extension_id (int): 拡張機能ID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
         ExtensionResponse: 拡張機能の詳細
@@ -109,7 +141,6 @@ async def get_extension(extension_id: int, current_user: User = Depends(get_curr
     Raises:
         HTTPException: 拡張機能が見つからない場合
     """
-    extension_service = ExtensionService()
     extension = await extension_service.get_extension(extension_id)
 
     if not extension:
@@ -118,18 +149,20 @@ async def get_extension(extension_id: int, current_user: User = Depends(get_curr
     return extension
 
 
-@router.patch("/{extension_id}", response_model=ExtensionResponse)
+@router.patch("/{extension_id}", response_model=ExtensionResponse, openapi_extra=json_body_openapi(ExtensionUpdate))
 async def update_extension(
-    extension_id: int,
-    extension_update: ExtensionUpdate,
-    current_user: User = Depends(get_current_active_admin),
+    extension_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    extension_update: ExtensionUpdate = Depends(json_body(ExtensionUpdate)),
+    extension_service: ExtensionService = Depends(get_extension_service),
 ):
     """拡張機能の有効/無効や設定を更新するエンドポイント
 
     Args:
         extension_id (int): 拡張機能ID
-        extension_update (ExtensionUpdate): 更新データ
-        current_user (User, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        extension_update (ExtensionUpdate, optional): 更新データ。Depends(json_body(ExtensionUpdate))から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
         ExtensionResponse: 更新された拡張機能
@@ -137,7 +170,6 @@ async def update_extension(
     Raises:
         HTTPException: 拡張機能が見つからない場合
     """
-    extension_service = ExtensionService()
     extension = await extension_service.update_extension(extension_id, extension_update)
 
     if not extension:
@@ -147,17 +179,21 @@ async def update_extension(
 
 
 @router.delete("/{extension_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_extension(extension_id: int, current_user: User = Depends(get_current_active_admin)):
+async def remove_extension(
+    extension_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    extension_service: ExtensionService = Depends(get_extension_service),
+):
     """拡張機能を削除するエンドポイント
 
     Args:
         extension_id (int): 拡張機能ID
-        current_user (User, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Raises:
         HTTPException: 拡張機能が見つからない場合
     """
-    extension_service = ExtensionService()
     success = await extension_service.remove_extension(extension_id)
 
     if not success:
@@ -171,7 +207,8 @@ async def install_extension(
     name: str = Body(...),
     url: str = Body(...),
     description: str = Body(""),
-    current_user: User = Depends(get_current_active_admin),
+    current_user: CurrentUser = Depends(get_current_active_admin),
+    extension_service: ExtensionService = Depends(get_extension_service),
 ):
     """URLから拡張機能をインストールするエンドポイント
 
@@ -179,12 +216,12 @@ async def install_extension(
         name (str): 拡張機能名
         url (str): 拡張機能のURL
         description (str, optional): 説明。デフォルトは空文字
-        current_user (User, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        current_user (CurrentUser, optional): 現在の管理者ユーザー。Depends(get_current_active_admin)から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
         Dict[str, Any]: インストール結果
     """
-    extension_service = ExtensionService()
     result = await extension_service.install_extension_from_url(name, url, description)
 
     if not result["success"]:
@@ -5,16 +5,59 @@
 """
 
 import platform
+import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from sqlalchemy import text
 
 from ..config import settings
-from ..database import get_db
+from ..database import engine
 
 router = APIRouter(prefix="/api/health", tags=["ヘルスチェック"])
 
+# 実行中に変わらないシステム情報（モジュール読み込み時に一度だけ取得）
+_SYSTEM_INFO: Dict[str, str] = {
+    "python_version": platform.python_version(),
+    "platform": platform.platform(),
+    "hostname": platform.node(),
+}
+
+# pingレスポンスのボディ（毎回生成しない）
+_PONG = b'{"ping":"pong"}'
+
+# データベース確認結果のキャッシュ（有効期限, ステータス, エラー）
+_db_check_cache: Tuple[float, str, Optional[str]] = (0.0, "ok", None)
+
+
+async def _check_database() -> Tuple[str, Optional[str]]:
+    """データベース接続を確認する
+
+    結果はHEALTH_DB_CHECK_TTL_SECONDSの間キャッシュし、連続するヘルスチェックで毎回接続を取得しないようにします。
+
+    Returns:
+        Tuple[str, Optional[str]]: ステータスとエラーメッセージ
+    """
+    global _db_check_cache
+
+    now = time.monotonic()
+    expires_at, db_status, db_error = _db_check_cache
+    if now < expires_at:
+        return db_status, db_error
+
+    try:
+        # セッションを作らず、プールの接続で直接確認する
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        db_status, db_error = "ok", None
+    except Exception as e:
+        # データベース接続エラーが発生した場合は常にエラーを返す
+        db_status, db_error = "error", str(e)
+
+    _db_check_cache = (now + settings.HEALTH_DB_CHECK_TTL_SECONDS, db_status, db_error)
+    return db_status, db_error
+
 
 @router.get("/", response_model=Dict[str, Any])
 async def health_check():
@@ -26,20 +69,7 @@ async def health_check():
         Dict[str, Any]: ヘルスチェック結果
     """
     # データベース接続を確認
-    db_status = "ok"
-    db_error = None
-
-    try:
-        async with get_db() as db:
-            # テスト環境でも実際にクエリを実行する
-            # ただし、モックされた場合はエラーを適切に処理する
-            from sqlalchemy import text
-
-            await db.execute(text("SELECT 1"))
-    except Exception as e:
-        # データベース接続エラーが発生した場合は常にエラーを返す
-        db_status = "error"
-        db_error = str(e)
+    db_status, db_error = await _check_database()
 
     return {
         "status": "ok",
@@ -47,20 +77,19 @@ async def health_check():
         "app_name": settings.APP_NAME,
         "app_version": settings.APP_VERSION,
         "environment": settings.GOOSUKE_ENV,
-        "system_info": {
-            "python_version": platform.python_version(),
-            "platform": platform.platform(),
-            "hostname": platform.node(),
-        },
+        "system_info": _SYSTEM_INFO,
         "database": {"status": db_status, "error": db_error},
     }
 
 
-@router.get("/ping", response_model=Dict[str, str])
+@router.get("/ping", response_model=None, responses={200: {"model": Dict[str, str]}})
 async def ping():
     """簡易ヘルスチェックエンドポイント
 
+    認証やデータベースに依存しないため、死活監視（liveness probe）に使用します。
+    データベースを含む状態確認（readiness probe）には / を使用してください。
+
     Returns:
-        Dict[str, str]: pingレスポンス
+        Response: pingレスポンス
     """
-    return {"ping": "pong"}
+    return Response(_PONG, media_type="application/json")
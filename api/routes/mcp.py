@@ -5,24 +5,31 @@ MCP ルーターモジュール
 """
 
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from fastapi import APIRouter, Depends, Request
 from starlette.responses import Response
 
-from api.mcp.discord_server import DiscordMCPServer
-from api.services.discord_service import DiscordBotManager
+from api.services.discord_service import DiscordBotManager, get_discord_bot_manager
+
+if TYPE_CHECKING:
+    from api.mcp.discord_server import DiscordMCPServer
 
 router = APIRouter(prefix="/mcp/discord", tags=["DiscordMCP"])
 logger = logging.getLogger("mcp_router")
 
 # シングルトンインスタンス
-_discord_mcp_server: Optional[DiscordMCPServer] = None
+_discord_mcp_server: Optional["DiscordMCPServer"] = None
 
 
-def get_discord_mcp_server(discord_service: DiscordBotManager = Depends()) -> DiscordMCPServer:
+async def get_discord_mcp_server(
+    discord_service: DiscordBotManager = Depends(get_discord_bot_manager),
+) -> "DiscordMCPServer":
     """Discord MCPサーバーのシングルトンインスタンスを取得
 
+    存在確認から生成までの間にawaitを含まないため、同時に呼び出されてもイベントループ上で
+    インスタンスが二重に生成されることはありません（ロックは不要）。
+
     Args:
         discord_service: Discord サービスインスタンス
 
@@ -31,6 +38,9 @@ def get_discord_mcp_server(discord_service: DiscordBotManager = Depends()) -> Di
     """
     global _discord_mcp_server
     if _discord_mcp_server is None:
+        # MCPライブラリの読み込みは重いため、初回利用時まで遅延する
+        from api.mcp.discord_server import DiscordMCPServer
+
         logger.info("Discord MCPサーバーを初期化しています")
         _discord_mcp_server = DiscordMCPServer(discord_service)
     return _discord_mcp_server
@@ -38,7 +48,7 @@ def get_discord_mcp_server(discord_service: DiscordBotManager = Depends()) -> Di
 
 @router.get("/sse")
 async def discord_sse_endpoint(
-    request: Request, server: DiscordMCPServer = Depends(get_discord_mcp_server)
+    request: Request, server: "DiscordMCPServer" = Depends(get_discord_mcp_server)
 ) -> Response:
     """Discord MCP SSEエンドポイント
 
@@ -55,7 +65,7 @@ async def discord_sse_endpoint(
 
 @router.post("/messages")
 async def discord_messages_endpoint(
-    request: Request, server: DiscordMCPServer = Depends(get_discord_mcp_server)
+    request: Request, server: "DiscordMCPServer" = Depends(get_discord_mcp_server)
 ) -> Response:
     """Discord MCP メッセージエンドポイント
 
@@ -6,11 +6,14 @@
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
-from ..auth.dependencies import get_current_user
-from ..services.setting_service import SettingService
+from ..auth.dependencies import CurrentUser, get_current_user
+from ..services.setting_service import SettingService, get_setting_service
+from ..utils.etag import etag_json_response
+from ..utils.params import IdPath
+from ..utils.request_body import json_body, json_body_openapi
 
 # ルーターの作成
 router = APIRouter(
@@ -46,79 +49,104 @@ class SettingUpdate(BaseModel):
 class SettingResponse(SettingBase):
     """設定レスポンスモデル"""
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int = Field(..., description="設定ID")
 
-    class Config:
-        """設定"""
 
-        from_attributes = True
+# 一覧レスポンスのシリアライザ（モジュール読み込み時に一度だけ構築）
+_SETTING_LIST_ADAPTER = TypeAdapter(List[SettingResponse])
 
 
 # エンドポイント
-@router.get("/", response_model=List[SettingResponse])
-async def list_settings(current_user: Dict[str, Any] = Depends(get_current_user)):
+@router.get("/", response_model=None, responses={200: {"model": List[SettingResponse]}})
+async def list_settings(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    setting_service: SettingService = Depends(get_setting_service),
+):
     """設定一覧を取得
 
+    レスポンスにはETagを付与し、If-None-Matchが一致する場合は304を返します。
+
     Args:
-        current_user (Dict[str, Any], optional): 現在のユーザー
+        request (Request): リクエスト
+        current_user (CurrentUser, optional): 現在のユーザー
+        setting_service (SettingService, optional): 設定サービス。Depends(get_setting_service)から取得
 
     Returns:
         List[SettingResponse]: 設定一覧
     """
-    setting_service = SettingService()
-    return await setting_service.list_settings()
+    settings = await setting_service.list_settings()
+    return etag_json_response(
+        request, _SETTING_LIST_ADAPTER.dump_json([SettingResponse.model_construct(**setting) for setting in settings])
+    )
 
 
 @router.get("/{setting_id}", response_model=SettingResponse)
-async def get_setting(setting_id: int, current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_setting(
+    setting_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    setting_service: SettingService = Depends(get_setting_service),
+):
     """設定詳細を取得
 
     Args:
         setting_id (int): 設定ID
-        current_user (Dict[str, Any], optional): 現在のユーザー
+        current_user (CurrentUser, optional): 現在のユーザー
+        setting_service (SettingService, optional): 設定サービス。Depends(get_setting_service)から取得
 
     Returns:
         SettingResponse: 設定詳細
     """
-    setting_service = SettingService()
     setting = await setting_service.get_setting(setting_id)
     if not setting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="設定が見つかりません")
     return setting
 
 
-@router.post("/", response_model=SettingResponse, status_code=status.HTTP_201_CREATED)
-async def create_setting(setting: SettingCreate, current_user: Dict[str, Any] = Depends(get_current_user)):
+@router.post(
+    "/",
+    response_model=SettingResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=json_body_openapi(SettingCreate),
+)
+async def create_setting(
+    current_user: CurrentUser = Depends(get_current_user),
+    setting: SettingCreate = Depends(json_body(SettingCreate)),
+    setting_service: SettingService = Depends(get_setting_service),
+):
     """設定を作成
 
     Args:
-        setting (SettingCreate): 設定データ
-        current_user (Dict[str, Any], optional): 現在のユーザー
+        current_user (CurrentUser, optional): 現在のユーザー
+        setting (SettingCreate, optional): 設定データ。Depends(json_body(SettingCreate))から取得
+        setting_service (SettingService, optional): 設定サービス。Depends(get_setting_service)から取得
 
     Returns:
         SettingResponse: 作成された設定
     """
-    setting_service = SettingService()
     return await setting_service.add_setting(setting)
 
 
-@router.put("/{setting_id}", response_model=SettingResponse)
+@router.put("/{setting_id}", response_model=SettingResponse, openapi_extra=json_body_openapi(SettingUpdate))
 async def update_setting(
-    setting_id: int,
-    setting: SettingUpdate,
-    current_user: Dict[str, Any] = Depends(get_current_user),
+    setting_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    setting: SettingUpdate = Depends(json_body(SettingUpdate)),
+    setting_service: SettingService = Depends(get_setting_service),
 ):
     """設定を更新
 
     Args:
         setting_id (int): 設定ID
-        setting (SettingUpdate): 更新データ
-        current_user (Dict[str, Any], optional): 現在のユーザー
+        current_user (CurrentUser, optional): 現在のユーザー
+        setting (SettingUpdate, optional): 更新データ。Depends(json_body(SettingUpdate))から取得
+        setting_service (SettingService, optional): 設定サービス。Depends(get_setting_service)から取得
 
     Returns:
         SettingResponse: 更新された設定
     """
-    setting_service = SettingService()
     updated_setting = await setting_service.update_setting(setting_id, setting)
     if not updated_setting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="設定が見つかりません")
@@ -126,14 +154,18 @@ async def update_setting(
 
 
 @router.delete("/{setting_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_setting(setting_id: int, current_user: Dict[str, Any] = Depends(get_current_user)):
+async def delete_setting(
+    setting_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    setting_service: SettingService = Depends(get_setting_service),
+):
     """設定を削除
 
     Args:
         setting_id (int): 設定ID
-        current_user (Dict[str, Any], optional): 現在のユーザー
+        current_user (CurrentUser, optional): 現在のユーザー
+        setting_service (SettingService, optional): 設定サービス。Depends(get_setting_service)から取得
     """
-    setting_service = SettingService()
     result = await setting_service.remove_setting(setting_id)
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="設定が見つかりません")
@@ -6,16 +6,65 @@
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
-from ..auth.dependencies import get_current_user, get_optional_user
-from ..models.user import User
-from ..services.extension_service import ExtensionService
-from ..services.task_service import TaskService
+from ..auth.dependencies import CurrentUser, get_current_user, get_optional_user
+from ..services.extension_service import ExtensionService, get_extension_service
+from ..services.task_service import TaskService, get_task_service
+from ..utils.etag import etag_json_response
+from ..utils.list_fields import FIELD_DICT_LIST_ADAPTER, parse_fields
+from ..utils.params import IdPath, LimitQuery, OffsetQuery
 
 router = APIRouter(prefix="/api/v1/tasks", tags=["タスク"])
 
 
+class TaskExecutionResponse(BaseModel):
+    """タスク実行ログレスポンスモデル"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    template_id: int
+    user_id: Optional[int] = None
+    context: Optional[Dict[str, Any]] = None
+    result: Optional[str] = None
+    extensions_output: Optional[Dict[str, Any]] = None
+    status: str
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+
+class TaskExecutionListItem(BaseModel):
+    """タスク実行ログ一覧の要素モデル（実行結果やコンテキストは含まない）"""
+
+    id: int
+    template_id: int
+    user_id: Optional[int] = None
+    status: str
+    created_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+
+class TaskTemplateListItem(BaseModel):
+    """タスクテンプレート一覧の要素モデル（promptは含まない）"""
+
+    id: int
+    user_id: Optional[int] = None
+    name: str
+    task_type: str
+    description: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+# 一覧レスポンスのシリアライザ（モジュール読み込み時に一度だけ構築）
+_TASK_EXECUTION_LIST_ADAPTER = TypeAdapter(List[TaskExecutionListItem])
+_TASK_TEMPLATE_LIST_ADAPTER = TypeAdapter(List[TaskTemplateListItem])
+
+
 # タスクテンプレート関連のエンドポイント
 @router.post("/templates/", response_model=Dict[str, Any])
 async def create_task_template(
@@ -23,7 +72,8 @@ async def create_task_template(
     prompt: str,
     task_type: str = "general",
     description: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """タスクテンプレートを作成するエンドポイント
 
@@ -32,13 +82,12 @@ async def create_task_template(
         prompt (str): プロンプト
         task_type (str, optional): タスクタイプ。デフォルトは"general"
         description (Optional[str], optional): テンプレートの説明。デフォルトはNone
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
 
     Returns:
         Dict[str, Any]: 作成されたタスクテンプレート
     """
-    task_service = TaskService()
-
     # タスクテンプレートの作成
     result = await task_service.create_task_template(
         task_type=task_type,
@@ -52,12 +101,17 @@ async def create_task_template(
 
 
 @router.get("/templates/{template_id}", response_model=Dict[str, Any])
-async def get_task_template(template_id: int, current_user: User = Depends(get_current_user)):
+async def get_task_template(
+    template_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
     """タスクテンプレートの詳細を取得するエンドポイント
 
     Args:
         template_id (int): タスクテンプレートID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
 
     Returns:
         Dict[str, Any]: タスクテンプレートの詳細
@@ -65,7 +119,6 @@ async def get_task_template(template_id: int, current_user: User = Depends(get_c
     Raises:
         HTTPException: タスクテンプレートが見つからない場合
     """
-    task_service = TaskService()
     template = await task_service.get_task_template(template_id)
 
     if not template:
@@ -81,93 +134,128 @@ async def get_task_template(template_id: int, current_user: User = Depends(get_c
     return template
 
 
-@router.get("/templates/", response_model=List[Dict[str, Any]])
+@router.get("/templates/", response_model=None, responses={200: {"model": List[TaskTemplateListItem]}})
 async def list_task_templates(
+    request: Request,
     user_id: Optional[int] = None,
     task_type: Optional[str] = None,
-    limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    limit: LimitQuery = 10,
+    offset: OffsetQuery = 0,
+    current_user: CurrentUser = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """タスクテンプレートの一覧を取得するエンドポイント
 
+    レスポンスにはETagを付与し、If-None-Matchが一致する場合は304を返します。
+
     Args:
+        request (Request): リクエスト
         user_id (Optional[int], optional): ユーザーID。デフォルトはNone
         task_type (Optional[str], optional): タスクタイプ。デフォルトはNone
         limit (int, optional): 取得件数。デフォルトは10
         offset (int, optional): オフセット。デフォルトは0
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
 
     Returns:
-        List[Dict[str, Any]]: タスクテンプレートのリスト
+        List[TaskTemplateListItem]: タスクテンプレートのリスト
     """
-    task_service = TaskService()
-
     # 管理者でない場合は、自分のタスクテンプレートのみ取得可能
     if not current_user.is_admin:
         user_id = current_user.id
 
     templates = await task_service.list_task_templates(user_id=user_id, task_type=task_type, limit=limit, offset=offset)
 
-    return templates
+    return etag_json_response(
+        request,
+        _TASK_TEMPLATE_LIST_ADAPTER.dump_json(
+            [TaskTemplateListItem.model_construct(**template) for template in templates]
+        ),
+    )
 
 
 # タスク実行関連のエンドポイント
-@router.post("/executions/", response_model=Dict[str, Any])
+@router.post("/executions/", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def execute_task(
     template_id: int,
+    background_tasks: BackgroundTasks,
     context: Optional[Dict[str, Any]] = None,
     extension_ids: Optional[List[int]] = None,
-    current_user: User = Depends(get_optional_user),
+    current_user: Optional[CurrentUser] = Depends(get_optional_user),
+    task_service: TaskService = Depends(get_task_service),
+    extension_service: ExtensionService = Depends(get_extension_service),
 ):
-    """タスクを実行するエンドポイント
+    """タスクの実行を受け付けるエンドポイント
+
+    タスク実行ログを"pending"で作成して実行IDを即座に返し、タスクはバックグラウンドで実行します。
+    結果は /executions/{execution_id} で取得できます。
 
     Args:
         template_id (int): タスクテンプレートID
+        background_tasks (BackgroundTasks): バックグラウンドタスク
         context (Optional[Dict[str, Any]], optional): コンテキスト。デフォルトはNone
         extension_ids (Optional[List[int]], optional): 使用する拡張機能のID。デフォルトはNone
-        current_user (User, optional): 現在のユーザー。Depends(get_optional_user)から取得
+        current_user (Optional[CurrentUser], optional): 現在のユーザー。Depends(get_optional_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
+        extension_service (ExtensionService, optional): 拡張機能サービス。Depends(get_extension_service)から取得
 
     Returns:
-        Dict[str, Any]: 実行結果
-    """
-    task_service = TaskService()
-    extension_service = ExtensionService()
+        Dict[str, Any]: 実行ID・テンプレートID・ステータス
 
+    Raises:
+        HTTPException: タスクテンプレートが見つからない場合
+    """
     # 拡張機能の取得
     extensions = []
     if extension_ids:
-        for ext_id in extension_ids:
-            ext = await extension_service.get_extension(ext_id)
-            if ext and ext["enabled"]:
-                extensions.append(ext["name"])
+        extensions = [ext["name"] for ext in await extension_service.get_extensions_by_ids(extension_ids)]
 
-    # タスクの実行
-    result = await task_service.execute_task(
+    # タスク実行ログの作成
+    execution = await task_service.start_task_execution(
         template_id=template_id,
         context=context,
         user_id=current_user.id if current_user else None,
+    )
+    if not execution:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="タスクテンプレートが見つかりません")
+
+    # タスクの実行はレスポンス送信後に行う
+    background_tasks.add_task(
+        task_service.run_task_execution,
+        execution_id=execution["execution_id"],
+        template_id=template_id,
+        prompt=execution["prompt"],
+        context=context,
         extensions=extensions,
+        mark_processing=True,
     )
 
-    return result
+    return {
+        "execution_id": execution["execution_id"],
+        "template_id": template_id,
+        "status": execution["status"],
+    }
 
 
-@router.get("/executions/{execution_id}", response_model=Dict[str, Any])
-async def get_task_execution(execution_id: int, current_user: User = Depends(get_current_user)):
+@router.get("/executions/{execution_id}", response_model=None, responses={200: {"model": TaskExecutionResponse}})
+async def get_task_execution(
+    execution_id: IdPath,
+    current_user: CurrentUser = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
     """タスク実行ログの詳細を取得するエンドポイント
 
     Args:
         execution_id (int): タスク実行ログID
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
 
     Returns:
-        Dict[str, Any]: タスク実行ログの詳細
+        TaskExecutionResponse: タスク実行ログの詳細
 
     Raises:
         HTTPException: タスク実行ログが見つからない場合
     """
-    task_service = TaskService()
     execution = await task_service.get_task_execution(execution_id)
 
     if not execution:
@@ -180,17 +268,19 @@ async def get_task_execution(execution_id: int, current_user: User = Depends(get
             detail="このタスク実行ログにアクセスする権限がありません",
         )
 
-    return execution
+    return Response(TaskExecutionResponse.model_construct(**execution).model_dump_json(), media_type="application/json")
 
 
-@router.get("/executions/", response_model=List[Dict[str, Any]])
+@router.get("/executions/", response_model=None, responses={200: {"model": List[TaskExecutionListItem]}})
 async def list_task_executions(
     template_id: Optional[int] = None,
     user_id: Optional[int] = None,
     status: Optional[str] = None,
-    limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    limit: LimitQuery = 10,
+    offset: OffsetQuery = 0,
+    fields: Optional[str] = Query(None, description="返却するフィールド（カンマ区切り）"),
+    current_user: CurrentUser = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """タスク実行ログの一覧を取得するエンドポイント
 
@@ -200,19 +290,29 @@ async def list_task_executions(
         status (Optional[str], optional): ステータス。デフォルトはNone
         limit (int, optional): 取得件数。デフォルトは10
         offset (int, optional): オフセット。デフォルトは0
-        current_user (User, optional): 現在のユーザー。Depends(get_current_user)から取得
+        fields (Optional[str], optional): 返却するフィールド（カンマ区切り）。デフォルトはNone
+        current_user (CurrentUser, optional): 現在のユーザー。Depends(get_current_user)から取得
+        task_service (TaskService, optional): タスクサービス。Depends(get_task_service)から取得
 
     Returns:
-        List[Dict[str, Any]]: タスク実行ログのリスト
+        List[TaskExecutionListItem]: タスク実行ログのリスト（fields指定時は指定フィールドのみの辞書）
     """
-    task_service = TaskService()
+    columns = parse_fields(fields, TaskExecutionResponse.model_fields)
 
     # 管理者でない場合は、自分のタスク実行ログのみ取得可能
     if not current_user.is_admin:
         user_id = current_user.id
 
     executions = await task_service.list_task_executions(
-        template_id=template_id, user_id=user_id, status=status, limit=limit, offset=offset
+        template_id=template_id, user_id=user_id, status=status, limit=limit, offset=offset, fields=columns
     )
 
-    return executions
+    if columns:
+        return Response(FIELD_DICT_LIST_ADAPTER.dump_json(executions), media_type="application/json")
+
+    return Response(
+        _TASK_EXECUTION_LIST_ADAPTER.dump_json(
+            [TaskExecutionListItem.model_construct(**execution) for execution in executions]
+        ),
+        media_type="application/json",
+    )
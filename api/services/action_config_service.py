@@ -4,13 +4,42 @@
 このモジュールは、アクションと設定の関連付けを管理するサービスを提供します。
 """
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, or_, select, update
 
 from ..database import _get_db_context
 from ..models.action import Action
 from ..models.action_config import ActionConfig
+from ..utils.list_fields import to_field_dict
+from .discord_config_service import invalidate_reaction_cache
+
+# 設定に関連するアクションとして返却する列
+ACTION_BY_CONFIG_FIELDS = ("id", "name", "action_type", "task_template_id", "is_enabled")
+
+# Discord設定に関連する有効なアクションの取得クエリ
+# Discord設定はアクションに非正規化されているため、action_configとの結合は不要
+_DISCORD_ACTION_STMT = (
+    select(*(getattr(Action, name) for name in ACTION_BY_CONFIG_FIELDS))
+    .where(Action.discord_config_id == bindparam("config_id"), Action.is_enabled)
+    .limit(1)
+)
+
+# 辞書に変換するアクション設定関連の属性（attrgetterで一度に取り出す）
+_ACTION_CONFIG_ATTRS = attrgetter("id", "action_id", "config_type", "config_id", "created_at", "updated_at")
+
+# アクションに関連する設定の一覧取得クエリ（設定タイプの絞り込みあり/なし）
+_CONFIGS_BY_ACTION_STMT = select(
+    ActionConfig.id,
+    ActionConfig.action_id,
+    ActionConfig.config_type,
+    ActionConfig.config_id,
+    ActionConfig.created_at,
+    ActionConfig.updated_at,
+).where(ActionConfig.action_id == bindparam("action_id"))
+_CONFIGS_BY_ACTION_AND_TYPE_STMT = _CONFIGS_BY_ACTION_STMT.where(ActionConfig.config_type == bindparam("config_type"))
 
 
 class ActionConfigService:
@@ -31,16 +60,37 @@ class ActionConfigService:
 
         Returns:
             Dict[str, Any]: 作成されたアクション設定関連
+
+        Raises:
+            ValueError: アクションが存在しない、または既に別のDiscord設定に関連付けられている場合
         """
         async with _get_db_context() as db:
+            # 発火時に結合せず参照できるよう、Discord設定IDをアクションにも保持する
+            # アクションが保持できるDiscord設定は1つのため、別のDiscord設定との関連付けは拒否する
+            if config_type == "discord":
+                linked = await db.execute(
+                    update(Action)
+                    .where(
+                        Action.id == action_id,
+                        or_(Action.discord_config_id.is_(None), Action.discord_config_id == config_id),
+                    )
+                    .values(discord_config_id=config_id)
+                    .returning(Action.id)
+                )
+                if linked.scalar_one_or_none() is None:
+                    raise ValueError("アクションが存在しないか、既に別のDiscord設定に関連付けられています")
+
             action_config = ActionConfig(
                 action_id=action_id,
                 config_type=config_type,
                 config_id=config_id,
             )
             db.add(action_config)
+
             await db.commit()
-            await db.refresh(action_config)
+            if config_type == "discord":
+                # リアクションから解決されるアクションが変わるため、検索結果のキャッシュを破棄する
+                invalidate_reaction_cache()
 
             return self._action_config_to_dict(action_config)
 
@@ -58,29 +108,24 @@ class ActionConfigService:
         Returns:
             Optional[Dict[str, Any]]: 関連するアクション
         """
-        async with _get_db_context() as db:
-            query = (
-                select(Action)
-                .join(ActionConfig, Action.id == ActionConfig.action_id)
-                .where(
-                    ActionConfig.config_type == config_type,
-                    ActionConfig.config_id == config_id,
-                    Action.is_enabled,
+        async with _get_db_context(readonly=True) as db:
+            if config_type == "discord":
+                row = (await db.execute(_DISCORD_ACTION_STMT, {"config_id": config_id})).first()
+            else:
+                # 返却する列のみを行として取得する（ORMインスタンスは生成しない）
+                query = (
+                    select(*(getattr(Action, name) for name in ACTION_BY_CONFIG_FIELDS))
+                    .join(ActionConfig, Action.id == ActionConfig.action_id)
+                    .where(
+                        ActionConfig.config_type == config_type,
+                        ActionConfig.config_id == config_id,
+                        Action.is_enabled,
+                    )
+                    .limit(1)
                 )
-            )
-            result = await db.execute(query)
-            action = result.scalars().first()
-
-            if not action:
-                return None
-
-            return {
-                "id": action.id,
-                "name": action.name,
-                "action_type": action.action_type,
-                "task_template_id": action.task_template_id,
-                "is_enabled": action.is_enabled,
-            }
+                row = (await db.execute(query)).first()
+
+        return to_field_dict(row, ACTION_BY_CONFIG_FIELDS) if row else None
 
     async def list_configs_by_action(
         self,
@@ -96,31 +141,54 @@ class ActionConfigService:
         Returns:
             List[Dict[str, Any]]: 関連する設定のリスト
         """
-        async with _get_db_context() as db:
-            query = select(ActionConfig).where(ActionConfig.action_id == action_id)
-
+        async with _get_db_context(readonly=True) as db:
+            # 列をタプルとして取得する（ORMインスタンスは生成しない）
             if config_type:
-                query = query.where(ActionConfig.config_type == config_type)
-
-            result = await db.execute(query)
-            action_configs = result.scalars().all()
-
-            return [self._action_config_to_dict(config) for config in action_configs]
+                result = await db.execute(
+                    _CONFIGS_BY_ACTION_AND_TYPE_STMT, {"action_id": action_id, "config_type": config_type}
+                )
+            else:
+                result = await db.execute(_CONFIGS_BY_ACTION_STMT, {"action_id": action_id})
+            rows = result.all()
+
+        # 行ごとの属性アクセスを避け、タプルを展開して辞書を組み立てる
+        return [
+            {
+                "id": id_,
+                "action_id": action_id_,
+                "config_type": config_type_,
+                "config_id": config_id,
+                "created_at": created_at.isoformat() if created_at else None,
+                "updated_at": updated_at.isoformat() if updated_at else None,
+            }
+            for id_, action_id_, config_type_, config_id, created_at, updated_at in rows
+        ]
 
-    def _action_config_to_dict(self, action_config: ActionConfig) -> Dict[str, Any]:
+    def _action_config_to_dict(self, action_config: Union[ActionConfig, Row]) -> Dict[str, Any]:
         """アクション設定関連をディクショナリに変換
 
         Args:
-            action_config (ActionConfig): アクション設定関連
+            action_config (Union[ActionConfig, Row]): アクション設定関連（モデルインスタンスまたは行）
 
         Returns:
             Dict[str, Any]: アクション設定関連の辞書表現
         """
+        id_, action_id, config_type, config_id, created_at, updated_at = _ACTION_CONFIG_ATTRS(action_config)
         return {
-            "id": action_config.id,
-            "action_id": action_config.action_id,
-            "config_type": action_config.config_type,
-            "config_id": action_config.config_id,
-            "created_at": action_config.created_at.isoformat() if action_config.created_at else None,
-            "updated_at": action_config.updated_at.isoformat() if action_config.updated_at else None,
+            "id": id_,
+            "action_id": action_id,
+            "config_type": config_type,
+            "config_id": config_id,
+            "created_at": created_at.isoformat() if created_at is not None else None,
+            "updated_at": updated_at.isoformat() if updated_at is not None else None,
         }
+
+
+@lru_cache(maxsize=1)
+def get_action_config_service() -> ActionConfigService:
+    """アクション設定サービスのインスタンスを取得する依存関係
+
+    Returns:
+        ActionConfigService: 共有のアクション設定サービスインスタンス
+    """
+    return ActionConfigService()
@@ -5,15 +5,180 @@
 アクションからコンテキストを抽出し、タスクの生成に必要な情報を提供します。
 """
 
+import asyncio
+import logging
+import threading
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Integer, Select, bindparam, case, select, update
 
 from ..database import _get_db_context
 from ..models.action import Action
+from ..models.config_discord import ConfigDiscord
 from ..models.task_template import TaskTemplate
-from .task_service import TaskService
+from ..utils.list_fields import to_field_dict
+from ..utils.pagination import after_row_condition
+from .task_service import TaskService, get_task_service
+
+logger = logging.getLogger(__name__)
+
+# 一覧取得で返却する列（fieldsで絞り込み可能）
+ACTION_LIST_FIELDS = (
+    "id",
+    "name",
+    "action_type",
+    "task_template_id",
+    "discord_config_id",
+    "is_enabled",
+    "created_at",
+    "last_triggered_at",
+)
+
+# トリガー時のアクション取得クエリ（タスクテンプレートも同時に読み込む）
+_TRIGGER_ACTION_STMT = (
+    select(Action.is_enabled, TaskTemplate.id.label("task_template_id"), TaskTemplate.prompt)
+    .outerjoin(TaskTemplate, TaskTemplate.id == Action.task_template_id)
+    .where(Action.id == bindparam("action_id"))
+)
+
+
+class TriggerTarget(NamedTuple):
+    """トリガー時に必要なアクションの情報"""
+
+    is_enabled: bool
+    task_template_id: Optional[int]
+    prompt: Optional[str]
+
+
+# トリガー時のアクション取得結果のキャッシュ（キー: (キャッシュ世代, アクションID)。該当なしのNoneもキャッシュする）
+_ACTION_CACHE_MAXSIZE = 1024
+_ACTION_CACHE_TTL = 30
+_action_cache: TTLCache[Tuple[int, int], Optional[TriggerTarget]] = TTLCache(
+    maxsize=_ACTION_CACHE_MAXSIZE, ttl=_ACTION_CACHE_TTL
+)
+_action_cache_lock = threading.Lock()
+_action_cache_epoch = 0
+_MISSING = object()
+
+
+def invalidate_action_cache() -> None:
+    """トリガー時のアクション取得結果のキャッシュを無効化する関数
+
+    アクション（有効/無効、タスクテンプレートの関連付け）を作成・更新・削除した後に呼び出します。
+    世代を進めるため、無効化の前に開始された取得の結果がキャッシュに残ることもありません。
+    """
+    global _action_cache_epoch
+    with _action_cache_lock:
+        _action_cache_epoch += 1
+        _action_cache.clear()
+
+
+@lru_cache(maxsize=64)
+def _list_actions_stmt(
+    columns: Tuple[str, ...], filter_type: bool, filter_enabled: bool, after: bool = False
+) -> Select:
+    """アクション一覧取得クエリを構築する
+
+    列とフィルタの組み合わせごとにクエリを一度だけ構築し、値はバインドパラメータで渡します。
+
+    Args:
+        columns (Tuple[str, ...]): 取得する列
+        filter_type (bool): action_typeで絞り込むかどうか
+        filter_enabled (bool): is_enabledで絞り込むかどうか
+        after (bool, optional): after_idのカーソル行より後の行に絞り込むかどうか。デフォルトはFalse
+
+    Returns:
+        Select: アクション一覧取得クエリ
+    """
+    query = select(*(getattr(Action, name) for name in columns))
+
+    if filter_type:
+        query = query.where(Action.action_type == bindparam("action_type"))
+
+    if filter_enabled:
+        query = query.where(Action.is_enabled == bindparam("is_enabled"))
+
+    if after:
+        query = query.where(after_row_condition(Action, bindparam("after_id", type_=Integer)))
+
+    return (
+        query.order_by(Action.created_at.desc(), Action.id.desc())
+        .limit(bindparam("limit", type_=Integer))
+        .offset(bindparam("offset", type_=Integer))
+    )
+
+
+# 最終トリガー時刻をまとめて書き込む間隔（秒）
+LAST_TRIGGERED_FLUSH_INTERVAL = 0.5
+
+# 書き込み待ちの最終トリガー時刻（キー: アクションID。同じアクションは最新の時刻のみ保持する）
+_pending_triggered_at: Dict[int, datetime] = {}
+_flusher_task: Optional[asyncio.Task] = None
+
+
+async def flush_last_triggered_at() -> None:
+    """書き込み待ちの最終トリガー時刻を1回のUPDATE文でデータベースに反映する
+
+    書き込みに失敗した場合は、その間に新しい時刻が記録されていないアクションの時刻を書き込み待ちに戻します。
+    """
+    if not _pending_triggered_at:
+        return
+
+    pending = dict(_pending_triggered_at)
+    _pending_triggered_at.clear()
+
+    try:
+        async with _get_db_context() as db:
+            await db.execute(
+                update(Action)
+                .where(Action.id.in_(pending))
+                .values(last_triggered_at=case(pending, value=Action.id))
+                .execution_options(synchronize_session=False)
+            )
+    except Exception:
+        for action_id, triggered_at in pending.items():
+            _pending_triggered_at.setdefault(action_id, triggered_at)
+        raise
+
+
+async def _flush_last_triggered_at_periodically() -> None:
+    """LAST_TRIGGERED_FLUSH_INTERVALごとに最終トリガー時刻を書き込む"""
+    while True:
+        await asyncio.sleep(LAST_TRIGGERED_FLUSH_INTERVAL)
+        try:
+            await flush_last_triggered_at()
+        except Exception:
+            logger.exception("最終トリガー時刻の書き込みに失敗しました")
+
+
+def start_last_triggered_at_flusher() -> None:
+    """最終トリガー時刻をまとめて書き込むバックグラウンドタスクを開始する
+
+    アプリケーションの起動時に呼び出します。開始していない場合、最終トリガー時刻はトリガーのたびに書き込まれます。
+    """
+    global _flusher_task
+    if _flusher_task is None or _flusher_task.done():
+        _flusher_task = asyncio.create_task(_flush_last_triggered_at_periodically())
+
+
+async def stop_last_triggered_at_flusher() -> None:
+    """バックグラウンドタスクを停止し、書き込み待ちの最終トリガー時刻を反映する
+
+    アプリケーションの終了時に呼び出します。
+    """
+    global _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        try:
+            await _flusher_task
+        except asyncio.CancelledError:
+            pass
+        _flusher_task = None
+
+    await flush_last_triggered_at()
 
 
 class ActionService:
@@ -27,7 +192,7 @@ class ActionService:
         Args:
             task_service (Optional[TaskService], optional): タスクサービスインスタンス。デフォルトはNone
         """
-        self.task_service = task_service or TaskService()
+        self.task_service = task_service or get_task_service()
 
     async def create_action(
         self,
@@ -52,8 +217,10 @@ class ActionService:
                 task_template_id=task_template_id,
             )
             db.add(action)
+            # サーバー側の既定値はINSERTのRETURNINGで設定されるため、再取得は不要（eager_defaults="auto"）
             await db.commit()
-            await db.refresh(action)
+            # 該当なしとしてキャッシュされたIDが再利用されても古い結果を返さないようにする
+            invalidate_action_cache()
 
             return {
                 "id": action.id,
@@ -73,7 +240,7 @@ class ActionService:
         Returns:
             Optional[Dict[str, Any]]: アクションの詳細
         """
-        async with _get_db_context() as db:
+        async with _get_db_context(readonly=True) as db:
             action = await db.get(Action, action_id)
             if not action:
                 return None
@@ -83,6 +250,7 @@ class ActionService:
                 "name": action.name,
                 "action_type": action.action_type,
                 "task_template_id": action.task_template_id,
+                "discord_config_id": action.discord_config_id,
                 "is_enabled": action.is_enabled,
                 "created_at": (action.created_at.isoformat() if action.created_at else None),
                 "updated_at": (action.updated_at.isoformat() if action.updated_at else None),
@@ -95,44 +263,69 @@ class ActionService:
         is_enabled: Optional[bool] = None,
         limit: int = 10,
         offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        include_discord_config: bool = False,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """アクションの一覧を取得
 
+        after_idを指定すると、OFFSETで行を読み飛ばさずにそのアクションより後の行から取得します。
+
         Args:
             action_type (Optional[str], optional): アクションタイプ。デフォルトはNone
             is_enabled (Optional[bool], optional): 有効かどうか。デフォルトはNone
             limit (int, optional): 取得件数。デフォルトは10
             offset (int, optional): オフセット。デフォルトは0
+            fields (Optional[Sequence[str]], optional): 返却する列。デフォルトはNone（ACTION_LIST_FIELDSすべて）
+            include_discord_config (bool, optional): 関連するDiscord設定を含めるかどうか。デフォルトはFalse
+            after_id (Optional[int], optional): 前のページの最後のアクションID。デフォルトはNone
 
         Returns:
             List[Dict[str, Any]]: アクションのリスト
         """
-        async with _get_db_context() as db:
-            query = select(Action)
-
+        columns = list(fields) if fields else list(ACTION_LIST_FIELDS)
+        if include_discord_config and "discord_config_id" not in columns:
+            columns.append("discord_config_id")
+
+        async with _get_db_context(readonly=True) as db:
+            # 返却する列のみを行として取得する（ORMインスタンスは生成しない）
+            query = _list_actions_stmt(
+                tuple(columns), action_type is not None, is_enabled is not None, after_id is not None
+            )
+            params: Dict[str, Any] = {"limit": limit, "offset": offset}
+            if after_id is not None:
+                params["after_id"] = after_id
             if action_type is not None:
-                query = query.where(Action.action_type == action_type)
-
+                params["action_type"] = action_type
             if is_enabled is not None:
-                query = query.where(Action.is_enabled == is_enabled)
-
-            query = query.order_by(Action.created_at.desc()).limit(limit).offset(offset)
-
-            result = await db.execute(query)
-            actions = result.scalars().all()
-
-            return [
-                {
-                    "id": action.id,
-                    "name": action.name,
-                    "action_type": action.action_type,
-                    "task_template_id": action.task_template_id,
-                    "is_enabled": action.is_enabled,
-                    "created_at": (action.created_at.isoformat() if action.created_at else None),
-                    "last_triggered_at": (action.last_triggered_at.isoformat() if action.last_triggered_at else None),
-                }
-                for action in actions
-            ]
+                params["is_enabled"] = is_enabled
+
+            result = await db.execute(query, params)
+            actions = [to_field_dict(row, columns) for row in result]
+
+            if include_discord_config:
+                await self._attach_discord_configs(db, actions)
+
+            return actions
+
+    async def _attach_discord_configs(self, db, actions: List[Dict[str, Any]]) -> None:
+        """アクションの一覧に関連するDiscord設定を付与する
+
+        ページ内のDiscord設定はIN句を使った1回のクエリでまとめて取得します。
+
+        Args:
+            db: データベースセッション
+            actions (List[Dict[str, Any]]): discord_config_idを含むアクションのリスト
+        """
+        config_ids = {action["discord_config_id"] for action in actions if action["discord_config_id"] is not None}
+
+        configs: Dict[int, Dict[str, Any]] = {}
+        if config_ids:
+            result = await db.execute(select(ConfigDiscord.__table__).where(ConfigDiscord.id.in_(config_ids)))
+            configs = {row.id: to_field_dict(row, row._fields) for row in result}
+
+        for action in actions:
+            action["discord_config"] = configs.get(action["discord_config_id"])
 
     async def trigger_action(self, action_id: int, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """アクションをトリガーしてタスクを実行
@@ -144,33 +337,63 @@ class ActionService:
         Returns:
             Dict[str, Any]: 実行結果
         """
-        async with _get_db_context() as db:
-            action = await db.get(Action, action_id)
-            if not action:
-                return {"success": False, "error": "アクションが見つかりません"}
+        target = await self._get_trigger_target(action_id)
+        if not target:
+            return {"success": False, "error": "アクションが見つかりません"}
 
-            if not action.is_enabled:
-                return {"success": False, "error": "アクションは無効化されています"}
+        if not target.is_enabled:
+            return {"success": False, "error": "アクションは無効化されています"}
 
-            # 関連するタスクテンプレートを取得
-            task_template = None
-            if action.task_template_id:
-                task_template = await db.get(TaskTemplate, action.task_template_id)
+        if target.task_template_id is None:
+            return {"success": False, "error": "関連するタスクテンプレートが見つかりません"}
 
-            if not task_template:
-                return {"success": False, "error": "関連するタスクテンプレートが見つかりません"}
+        # 最終トリガー時刻はバックグラウンドタスクがまとめて書き込む（未開始の場合はここで書き込む）
+        _pending_triggered_at[action_id] = datetime.now()
+        if _flusher_task is None or _flusher_task.done():
+            await flush_last_triggered_at()
 
-            # 最終トリガー時刻を更新
-            action.last_triggered_at = datetime.now()
-            await db.commit()
+        # タスクを実行（取得済みのプロンプトを渡し、テンプレートの再取得とタスク実行中の接続保持を避ける）
+        return await self.task_service.execute_task(
+            template_id=target.task_template_id,
+            context=input_data,  # 入力データをそのままコンテキストとして使用
+            extensions=None,  # 必要に応じて設定
+            prompt=target.prompt,
+        )
 
-            # タスクを実行
-            result = await self.task_service.execute_task(
-                template_id=task_template.id,
-                context=input_data,  # 入力データをそのままコンテキストとして使用
-                extensions=None,  # 必要に応じて設定
-            )
+    async def _get_trigger_target(self, action_id: int) -> Optional[TriggerTarget]:
+        """トリガー時に必要なアクションの情報を取得
+
+        取得結果は短時間キャッシュし、同じアクションの連続したトリガーではクエリを発行しません。
+
+        Args:
+            action_id (int): アクションID
+
+        Returns:
+            Optional[TriggerTarget]: アクションの情報。存在しない場合はNone
+        """
+        key = (_action_cache_epoch, action_id)
+        with _action_cache_lock:
+            cached = _action_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        async with _get_db_context() as db:
+            # アクションと関連するタスクテンプレートを1回のクエリで取得
+            row = (await db.execute(_TRIGGER_ACTION_STMT, {"action_id": action_id})).first()
 
-            return result
+        target = TriggerTarget(row.is_enabled, row.task_template_id, row.prompt) if row else None
+        with _action_cache_lock:
+            _action_cache[key] = target
+        return target
 
     # _extract_context メソッドは不要になったため削除
+
+
+@lru_cache(maxsize=1)
+def get_action_service() -> ActionService:
+    """アクションサービスのインスタンスを取得する依存関係
+
+    Returns:
+        ActionService: 共有のアクションサービスインスタンス
+    """
+    return ActionService()
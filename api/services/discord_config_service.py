@@ -4,12 +4,108 @@ Discord設定サービスモジュール
 このモジュールは、Discord固有の設定を管理するサービスを提供します。
 """
 
-from typing import Any, Dict, List, Optional
+import threading
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Row, and_, bindparam, exists, insert, select, update
 
 from ..database import _get_db_context
+from ..models.action import Action
 from ..models.config_discord import ConfigDiscord
+from ..models.task_template import TaskTemplate
+from ..utils.pagination import after_row_condition
+
+# 辞書に変換するDiscord設定の属性（attrgetterで一度に取り出す）
+_DISCORD_CONFIG_ATTRS = attrgetter(
+    "id", "name", "catch_type", "catch_value", "message_type", "response_format", "created_at", "updated_at"
+)
+
+
+class ReactionTarget(NamedTuple):
+    """リアクションに対応するDiscord設定・アクション・タスクテンプレート"""
+
+    discord_config: Dict[str, Any]
+    action: Optional[Dict[str, Any]]
+    task_template: Optional[Dict[str, Any]]
+
+
+# リアクションに対応するDiscord設定の取得クエリ
+_CONFIG_BY_REACTION_STMT = (
+    select(ConfigDiscord.__table__)
+    .where(ConfigDiscord.catch_type == "reaction", ConfigDiscord.catch_value == bindparam("emoji"))
+    .limit(1)
+)
+
+# Discord設定の存在確認クエリ
+_CONFIG_EXISTS_STMT = select(exists().where(ConfigDiscord.id == bindparam("config_id")))
+
+# リアクションから設定・有効なアクション・タスクテンプレートまでを1回で取得するクエリ
+_RESOLVE_REACTION_STMT = (
+    select(
+        ConfigDiscord.__table__,
+        Action.id.label("action_id"),
+        Action.name.label("action_name"),
+        Action.action_type,
+        Action.task_template_id,
+        Action.is_enabled,
+        TaskTemplate.name.label("task_template_name"),
+        TaskTemplate.prompt,
+    )
+    .outerjoin(Action, and_(Action.discord_config_id == ConfigDiscord.id, Action.is_enabled))
+    .outerjoin(TaskTemplate, TaskTemplate.id == Action.task_template_id)
+    .where(ConfigDiscord.catch_type == "reaction", ConfigDiscord.catch_value == bindparam("emoji"))
+    .limit(1)
+)
+
+# リアクションの検索結果のキャッシュ（キー: (キャッシュ世代, 種別, 絵文字)。該当なしのNoneもキャッシュする）
+_REACTION_CACHE_MAXSIZE = 512
+_REACTION_CACHE_TTL = 60
+_reaction_cache: TTLCache[Tuple[int, str, str], Any] = TTLCache(
+    maxsize=_REACTION_CACHE_MAXSIZE, ttl=_REACTION_CACHE_TTL
+)
+_reaction_cache_lock = threading.Lock()
+_reaction_cache_epoch = 0
+_MISSING = object()
+
+
+def invalidate_reaction_cache() -> None:
+    """リアクションの検索結果のキャッシュを無効化する関数
+
+    Discord設定やDiscord設定とアクションの関連付けを更新した後に呼び出します。
+    世代を進めるため、無効化の前に開始された検索の結果がキャッシュに残ることもありません。
+    """
+    global _reaction_cache_epoch
+    with _reaction_cache_lock:
+        _reaction_cache_epoch += 1
+        _reaction_cache.clear()
+
+
+def _cache_key(kind: str, emoji: str) -> Tuple[int, str, str]:
+    """現在のキャッシュ世代を含むキャッシュキーを作成する
+
+    Args:
+        kind (str): 検索の種別
+        emoji (str): リアクション絵文字
+
+    Returns:
+        Tuple[int, str, str]: キャッシュキー
+    """
+    return (_reaction_cache_epoch, kind, emoji)
+
+
+def _cache_get(key: Tuple[int, str, str]) -> Any:
+    """キャッシュから値を取得する（存在しない場合は_MISSING）"""
+    with _reaction_cache_lock:
+        return _reaction_cache.get(key, _MISSING)
+
+
+def _cache_set(key: Tuple[int, str, str], value: Any) -> None:
+    """キャッシュに値を保存する"""
+    with _reaction_cache_lock:
+        _reaction_cache[key] = value
 
 
 class DiscordConfigService:
@@ -36,18 +132,22 @@ class DiscordConfigService:
             Dict[str, Any]: 作成されたDiscord設定
         """
         async with _get_db_context() as db:
-            discord_config = ConfigDiscord(
-                name=name,
-                catch_type=catch_type,
-                catch_value=catch_value,
-                message_type=message_type,
-                response_format=response_format,
+            # 作成した行をRETURNINGで受け取り、再取得のSELECTを省略する
+            result = await db.execute(
+                insert(ConfigDiscord)
+                .values(
+                    name=name,
+                    catch_type=catch_type,
+                    catch_value=catch_value,
+                    message_type=message_type,
+                    response_format=response_format,
+                )
+                .returning(*ConfigDiscord.__table__.c)
             )
-            db.add(discord_config)
-            await db.commit()
-            await db.refresh(discord_config)
+            created = self._discord_config_to_dict(result.one())
 
-            return self._discord_config_to_dict(discord_config)
+        invalidate_reaction_cache()
+        return created
 
     async def get_discord_config(self, config_id: int) -> Optional[Dict[str, Any]]:
         """Discord設定の詳細を取得
@@ -58,13 +158,25 @@ class DiscordConfigService:
         Returns:
             Optional[Dict[str, Any]]: Discord設定の詳細
         """
-        async with _get_db_context() as db:
+        async with _get_db_context(readonly=True) as db:
             discord_config = await db.get(ConfigDiscord, config_id)
             if not discord_config:
                 return None
 
             return self._discord_config_to_dict(discord_config)
 
+    async def discord_config_exists(self, config_id: int) -> bool:
+        """Discord設定が存在するかどうかを確認
+
+        Args:
+            config_id (int): 設定ID
+
+        Returns:
+            bool: 存在する場合はTrue
+        """
+        async with _get_db_context(readonly=True) as db:
+            return bool(await db.scalar(_CONFIG_EXISTS_STMT, {"config_id": config_id}))
+
     async def get_discord_config_by_reaction(self, reaction_value: str) -> Optional[Dict[str, Any]]:
         """リアクション値に基づいてDiscord設定を取得
 
@@ -72,25 +184,71 @@ class DiscordConfigService:
             reaction_value (str): リアクション値（絵文字）
 
         Returns:
-            Optional[Dict[str, Any]]: マッチするDiscord設定
+            Optional[Dict[str, Any]]: マッチするDiscord設定。
+                結果は_REACTION_CACHE_TTL秒間キャッシュされるため、呼び出し側で変更しないこと
         """
-        async with _get_db_context() as db:
-            query = select(ConfigDiscord).where(
-                ConfigDiscord.catch_type == "reaction", ConfigDiscord.catch_value == reaction_value
-            )
-            result = await db.execute(query)
-            discord_config = result.scalars().first()
+        key = _cache_key("config", reaction_value)
+        cached = _cache_get(key)
+        if cached is not _MISSING:
+            return cached
 
-            if not discord_config:
-                return None
+        async with _get_db_context(readonly=True) as db:
+            # 列を行として取得する（ORMインスタンスは生成しない）
+            row = (await db.execute(_CONFIG_BY_REACTION_STMT, {"emoji": reaction_value})).first()
 
-            return self._discord_config_to_dict(discord_config)
+        config_dict = self._discord_config_to_dict(row) if row else None
+        _cache_set(key, config_dict)
+        return config_dict
+
+    async def resolve_reaction(self, emoji: str) -> Optional[ReactionTarget]:
+        """リアクションに対応するDiscord設定・アクション・タスクテンプレートをまとめて取得
+
+        設定からアクション（アクションに保持したdiscord_config_idで結合）、タスクテンプレートまでを
+        外部結合した1回のクエリで取得します。
+
+        Args:
+            emoji (str): リアクション絵文字
+
+        Returns:
+            Optional[ReactionTarget]: 対応する設定・アクション・タスクテンプレート（設定が存在しない場合はNone）。
+                有効なアクションやタスクテンプレートがない場合、該当する要素はNone。
+                結果は_REACTION_CACHE_TTL秒間キャッシュされるため、呼び出し側で変更しないこと
+        """
+        key = _cache_key("target", emoji)
+        cached = _cache_get(key)
+        if cached is not _MISSING:
+            return cached
+
+        async with _get_db_context(readonly=True) as db:
+            row = (await db.execute(_RESOLVE_REACTION_STMT, {"emoji": emoji})).first()
+
+        if row is None:
+            _cache_set(key, None)
+            return None
+
+        action = None
+        task_template = None
+        if row.action_id is not None:
+            action = {
+                "id": row.action_id,
+                "name": row.action_name,
+                "action_type": row.action_type,
+                "task_template_id": row.task_template_id,
+                "is_enabled": row.is_enabled,
+            }
+            if row.prompt is not None:
+                task_template = {"id": row.task_template_id, "name": row.task_template_name, "prompt": row.prompt}
+
+        target = ReactionTarget(self._discord_config_to_dict(row), action, task_template)
+        _cache_set(key, target)
+        return target
 
     async def list_discord_configs(
         self,
         catch_type: Optional[str] = None,
         limit: int = 10,
         offset: int = 0,
+        after_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Discord設定の一覧を取得
 
@@ -98,22 +256,26 @@ class DiscordConfigService:
             catch_type (Optional[str], optional): 取得タイプ。デフォルトはNone
             limit (int, optional): 取得件数。デフォルトは10
             offset (int, optional): オフセット。デフォルトは0
+            after_id (Optional[int], optional): 前のページの最後の設定ID。指定するとその設定より後の行から取得します。デフォルトはNone
 
         Returns:
             List[Dict[str, Any]]: Discord設定のリスト
         """
-        async with _get_db_context() as db:
-            query = select(ConfigDiscord)
+        async with _get_db_context(readonly=True) as db:
+            # 列を行として取得する（ORMインスタンスは生成しない）
+            query = select(ConfigDiscord.__table__)
 
             if catch_type:
                 query = query.where(ConfigDiscord.catch_type == catch_type)
 
-            query = query.order_by(ConfigDiscord.created_at.desc()).limit(limit).offset(offset)
+            if after_id is not None:
+                query = query.where(after_row_condition(ConfigDiscord, after_id))
+
+            query = query.order_by(ConfigDiscord.created_at.desc(), ConfigDiscord.id.desc()).limit(limit).offset(offset)
 
             result = await db.execute(query)
-            discord_configs = result.scalars().all()
 
-            return [self._discord_config_to_dict(config) for config in discord_configs]
+            return [self._discord_config_to_dict(row) for row in result]
 
     async def update_discord_config(
         self,
@@ -137,27 +299,36 @@ class DiscordConfigService:
         Returns:
             Optional[Dict[str, Any]]: 更新されたDiscord設定（存在しない場合はNone）
         """
+        # 指定されたフィールドのみ更新
+        values = {
+            key: value
+            for key, value in (
+                ("name", name),
+                ("catch_type", catch_type),
+                ("catch_value", catch_value),
+                ("message_type", message_type),
+                ("response_format", response_format),
+            )
+            if value is not None
+        }
+        if not values:
+            return await self.get_discord_config(config_id)
+
         async with _get_db_context() as db:
-            discord_config = await db.get(ConfigDiscord, config_id)
-            if not discord_config:
+            # 更新後の行をRETURNINGで受け取り、事前の取得と再取得のSELECTを省略する
+            result = await db.execute(
+                update(ConfigDiscord)
+                .where(ConfigDiscord.id == config_id)
+                .values(**values)
+                .returning(*ConfigDiscord.__table__.c)
+            )
+            row = result.first()
+            if row is None:
                 return None
+            updated = self._discord_config_to_dict(row)
 
-            # 指定されたフィールドのみ更新
-            if name is not None:
-                discord_config.name = name
-            if catch_type is not None:
-                discord_config.catch_type = catch_type
-            if catch_value is not None:
-                discord_config.catch_value = catch_value
-            if message_type is not None:
-                discord_config.message_type = message_type
-            if response_format is not None:
-                discord_config.response_format = response_format
-
-            await db.commit()
-            await db.refresh(discord_config)
-
-            return self._discord_config_to_dict(discord_config)
+        invalidate_reaction_cache()
+        return updated
 
     async def delete_discord_config(self, config_id: int) -> bool:
         """Discord設定を削除
@@ -175,25 +346,39 @@ class DiscordConfigService:
 
             await db.delete(discord_config)
             await db.commit()
+            invalidate_reaction_cache()
 
             return True
 
-    def _discord_config_to_dict(self, discord_config: ConfigDiscord) -> Dict[str, Any]:
+    def _discord_config_to_dict(self, discord_config: Union[ConfigDiscord, Row]) -> Dict[str, Any]:
         """Discord設定をディクショナリに変換
 
         Args:
-            discord_config (ConfigDiscord): Discord設定
+            discord_config (Union[ConfigDiscord, Row]): Discord設定（モデルインスタンスまたは行）
 
         Returns:
             Dict[str, Any]: Discord設定の辞書表現
         """
+        id_, name, catch_type, catch_value, message_type, response_format, created_at, updated_at = (
+            _DISCORD_CONFIG_ATTRS(discord_config)
+        )
         return {
-            "id": discord_config.id,
-            "name": discord_config.name,
-            "catch_type": discord_config.catch_type,
-            "catch_value": discord_config.catch_value,
-            "message_type": discord_config.message_type,
-            "response_format": discord_config.response_format,
-            "created_at": discord_config.created_at.isoformat() if discord_config.created_at else None,
-            "updated_at": discord_config.updated_at.isoformat() if discord_config.updated_at else None,
+            "id": id_,
+            "name": name,
+            "catch_type": catch_type,
+            "catch_value": catch_value,
+            "message_type": message_type,
+            "response_format": response_format,
+            "created_at": created_at.isoformat() if created_at is not None else None,
+            "updated_at": updated_at.isoformat() if updated_at is not None else None,
         }
+
+
+@lru_cache(maxsize=1)
+def get_discord_config_service() -> DiscordConfigService:
+    """Discord設定サービスのインスタンスを取得する依存関係
+
+    Returns:
+        DiscordConfigService: 共有のDiscord設定サービスインスタンス
+    """
+    return DiscordConfigService()
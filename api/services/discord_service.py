@@ -4,49 +4,41 @@ Discord連携サービスモジュール
 このモジュールは、Discord連携機能を提供するサービスを実装します。
 """
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from fastapi import BackgroundTasks
 
-from extensions.discord import DiscordBotService as DiscordBot
 from goose.executor import TaskExecutor
 
 from ..config import settings
-from .action_config_service import ActionConfigService
-from .discord_config_service import DiscordConfigService
+from .action_config_service import get_action_config_service
+from .discord_config_service import ReactionTarget, get_discord_config_service
 from .task_service import TaskService
 
 
 class DiscordBotManager:
     """Discord Bot連携サービスクラス"""
 
-    _instance = None
-    _bot = None
-    _is_running = False
-    _initialized = False
-
-    def __new__(cls):
-        """シングルトンパターンの実装"""
-        if cls._instance is None:
-            cls._instance = super(DiscordBotManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    __slots__ = ("logger", "goose_executor", "task_service", "_bot", "_is_running", "_lock")
 
     def __init__(self, goose_executor: Optional[TaskExecutor] = None):
         """初期化
 
+        共有のインスタンスはget_discord_bot_manager()から取得します。
+
         Args:
             goose_executor (Optional[TaskExecutor], optional): Goose実行ラッパーインスタンス。デフォルトはNone
         """
-        # シングルトンの初期化は一度だけ
-        if self._initialized:
-            return
-
         self.logger = logging.getLogger("discord_bot_service")
         self.goose_executor = goose_executor or TaskExecutor()
         self.task_service = TaskService(self.goose_executor)
-        self._initialized = True
+        self._bot = None
+        self._is_running = False
+        # 起動・停止の同時実行でBotの状態が競合しないようにする
+        self._lock = asyncio.Lock()
 
     async def start_bot(self, background_tasks: BackgroundTasks):
         """Botを起動
@@ -55,9 +47,9 @@ class DiscordBotManager:
             background_tasks (BackgroundTasks): バックグラウンドタスク
         """
         # 設定からDiscord Botトークンを取得
-        from ..services.setting_service import SettingService
+        from ..services.setting_service import get_setting_service
 
-        setting_service = SettingService()
+        setting_service = get_setting_service()
         discord_token_setting = await setting_service.get_setting_by_key("DISCORD_BOT_TOKEN")
 
         # 設定からトークンを取得できない場合は環境変数を使用
@@ -72,8 +64,12 @@ class DiscordBotManager:
         else:
             discord_token = discord_token_setting["value"]
 
-        if self._is_running:
-            return {"success": True, "message": "Discord Botは既に実行中です"}
+        async with self._lock:
+            if self._is_running:
+                return {"success": True, "message": "Discord Botは既に実行中です"}
+
+            # バックグラウンドタスクの開始前に続けて起動されても、Botを重複して起動しないよう実行中とする
+            self._is_running = True
 
         # バックグラウンドでBotを起動
         background_tasks.add_task(self._run_bot, discord_token)
@@ -82,18 +78,19 @@ class DiscordBotManager:
 
     async def stop_bot(self):
         """Botを停止"""
-        if not self._is_running or not self._bot:
-            return {"success": False, "message": "Discord Botは実行されていません"}
+        async with self._lock:
+            if not self._is_running or not self._bot:
+                return {"success": False, "message": "Discord Botは実行されていません"}
 
-        try:
-            await self._bot.close()
-            self._is_running = False
-            self._bot = None
+            try:
+                await self._bot.close()
+                self._is_running = False
+                self._bot = None
 
-            return {"success": True, "message": "Discord Botを停止しました"}
-        except Exception as e:
-            self.logger.error(f"Discord Bot停止エラー: {str(e)}")
-            return {"success": False, "message": f"Discord Bot停止エラー: {str(e)}"}
+                return {"success": True, "message": "Discord Botを停止しました"}
+            except Exception as e:
+                self.logger.error("Discord Bot停止エラー: %s", e)
+                return {"success": False, "message": f"Discord Bot停止エラー: {str(e)}"}
 
     async def get_status(self):
         """Botのステータスを取得"""
@@ -111,8 +108,7 @@ class DiscordBotManager:
         Returns:
             Optional[Dict[str, Any]]: 対応するDiscord設定（存在しない場合はNone）
         """
-        discord_config_service = DiscordConfigService()
-        return await discord_config_service.get_discord_config_by_reaction(emoji)
+        return await get_discord_config_service().get_discord_config_by_reaction(emoji)
 
     async def get_action_for_discord_config(self, config_id: int) -> Optional[Dict[str, Any]]:
         """Discord設定に対応するアクションを取得
@@ -123,8 +119,18 @@ class DiscordBotManager:
         Returns:
             Optional[Dict[str, Any]]: 対応するアクション（存在しない場合はNone）
         """
-        action_config_service = ActionConfigService()
-        return await action_config_service.get_action_by_config("discord", config_id)
+        return await get_action_config_service().get_action_by_config("discord", config_id)
+
+    async def resolve_reaction(self, emoji: str) -> Optional[ReactionTarget]:
+        """絵文字に対応するDiscord設定・アクション・タスクテンプレートを1回のクエリで取得
+
+        Args:
+            emoji (str): リアクション絵文字
+
+        Returns:
+            Optional[ReactionTarget]: 対応する設定・アクション・タスクテンプレート（設定が存在しない場合はNone）
+        """
+        return await get_discord_config_service().resolve_reaction(emoji)
 
     async def _run_bot(self, token: str):
         """Botを実行（バックグラウンドタスク）
@@ -132,17 +138,34 @@ class DiscordBotManager:
         Args:
             token (str): Discord Botトークン
         """
+        # discord.pyの読み込みは重いため、Bot起動時まで遅延する
+        from extensions.discord import DiscordBotService as DiscordBot
+
+        bot = None
         try:
-            self._bot = DiscordBot(token, self.goose_executor)
-            self._is_running = True
+            async with self._lock:
+                bot = DiscordBot(token, self.goose_executor)
+                self._bot = bot
+                self._is_running = True
 
             self.logger.info("Discord Botを起動しています...")
-            await self._bot.start()
+            await bot.start()
         except Exception as e:
-            self.logger.error(f"Discord Bot実行エラー: {str(e)}")
-            self._is_running = False
-            self._bot = None
+            self.logger.error("Discord Bot実行エラー: %s", e)
         finally:
-            self._is_running = False
-            self._bot = None
+            async with self._lock:
+                # 停止後に次のBotが起動している場合は、その状態を上書きしない
+                if self._bot is bot:
+                    self._is_running = False
+                    self._bot = None
             self.logger.info("Discord Botが停止しました")
+
+
+@lru_cache(maxsize=1)
+def get_discord_bot_manager() -> DiscordBotManager:
+    """Discord Bot管理サービスのインスタンスを取得する依存関係
+
+    Returns:
+        DiscordBotManager: 共有のDiscord Bot管理サービスインスタンス
+    """
+    return DiscordBotManager()
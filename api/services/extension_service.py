@@ -4,22 +4,141 @@
 このモジュールは、Goose拡張機能を管理するサービスを提供します。
 """
 
+import asyncio
 import logging
-import os
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
-import yaml
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from goose.executor import TaskExecutor
 
 from ..database import _get_db_context
 from ..models.extension import Extension
-from ..utils.goose_config import get_goose_config_path, read_goose_config, read_goose_extensions
+from ..utils.goose_config import get_goose_config_path, read_goose_config, read_goose_extensions, write_goose_config
+from .setting_service import get_setting_service
 
 logger = logging.getLogger(__name__)
 
+# 一覧取得で返却する列
+EXTENSION_LIST_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "version",
+    "enabled",
+    "type",
+    "cmd",
+    "args",
+    "timeout",
+    "envs",
+    "secrets",
+)
+
+# 一覧取得の文（返却する列のみを取得し、ORMインスタンスは生成しない）
+_LIST_EXTENSIONS_STMT = select(*(getattr(Extension, name) for name in EXTENSION_LIST_FIELDS))
+
+# 拡張機能の削除文（削除した行の名前をRETURNINGで受け取る）
+_DELETE_EXTENSION_STMT = delete(Extension).where(Extension.id == bindparam("extension_id")).returning(Extension.name)
+
+# Gooseの設定ファイルへの同期で参照する列
+_SYNC_TO_GOOSE_STMT = select(
+    Extension.name,
+    Extension.enabled,
+    Extension.type,
+    Extension.cmd,
+    Extension.args,
+    Extension.timeout,
+    Extension.envs,
+    Extension.secrets,
+)
+
+# Goose の設定ファイルからの同期で、既存の拡張機能から引き継ぐ列
+_SYNC_FROM_GOOSE_EXISTING_STMT = select(
+    Extension.name, Extension.description, Extension.cmd, Extension.args, Extension.timeout, Extension.envs
+)
+
+
+def _dialect_insert(dialect_name: str) -> Callable[..., Any]:
+    """UPSERT（ON CONFLICT DO UPDATE）に対応したINSERT文の生成関数を返す関数
+
+    Args:
+        dialect_name (str): データベースの方言名
+
+    Returns:
+        Callable[..., Any]: 方言に応じたinsert関数
+    """
+    return postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+
+
+# 詳細として返却する列
+_EXTENSION_DETAIL_COLUMNS = (
+    Extension.id,
+    Extension.name,
+    Extension.description,
+    Extension.enabled,
+    Extension.type,
+    Extension.cmd,
+    Extension.args,
+    Extension.timeout,
+    Extension.envs,
+    Extension.secrets,
+)
+
+# Goose の設定ファイルで値が None でも出力するフィールド
+_REQUIRED_GOOSE_FIELDS = frozenset({"enabled", "type", "name"})
+
+# 更新時に変更できる列
+_EXTENSION_UPDATE_FIELDS = frozenset({"enabled", "type", "cmd", "args", "timeout", "envs", "secrets"})
+
+# 変更後の Goose の設定ファイルへの同期を行うバックグラウンドタスク
+_pending_sync: Set[asyncio.Task] = set()
+# 実行中の同期タスクが読み込んだ後に変更があった場合、同期をもう一度行う
+_sync_requested = False
+
+
+async def _run_requested_syncs(sync: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+    """同期の要求がなくなるまで Goose の設定ファイルへの同期を行う
+
+    Args:
+        sync (Callable[[], Awaitable[Dict[str, Any]]]): 同期処理
+    """
+    global _sync_requested
+    while _sync_requested:
+        _sync_requested = False
+        # 同期結果のログは同期処理の中で出力される
+        try:
+            await sync()
+        except Exception as e:
+            logger.error("Goose の設定ファイルへの同期中にエラーが発生しました: %s", e)
+
+
+async def wait_for_pending_sync() -> None:
+    """実行中の Goose の設定ファイルへの同期の完了を待つ
+
+    アプリケーションの終了時に呼び出します。
+    """
+    while _pending_sync:
+        await asyncio.gather(*_pending_sync)
+
+
+def _extension_update_values(update_data: Any) -> Dict[str, Any]:
+    """更新データから適用する列と値を取り出す関数
+
+    Pydanticモデルの場合は指定されたフィールドのみを対象とし、Noneの値は無視します。
+
+    Args:
+        update_data (Any): 更新データ（Pydanticモデルまたは属性を持つオブジェクト）
+
+    Returns:
+        Dict[str, Any]: 列名と値の辞書
+    """
+    data = update_data.model_dump(exclude_unset=True) if isinstance(update_data, BaseModel) else vars(update_data)
+    return {name: value for name, value in data.items() if name in _EXTENSION_UPDATE_FIELDS and value is not None}
+
 
 class ExtensionService:
     """拡張機能サービスクラス"""
@@ -38,29 +157,10 @@ class ExtensionService:
         Returns:
             List[Dict[str, Any]]: 拡張機能のリスト
         """
-        async with _get_db_context() as db:
-            print(f"db_url: {db.bind.url}")
-            db_extensions = await self._get_db_extensions(db)
-
-            # 情報を整形
-            result = []
-            for ext in db_extensions:
-                ext_dict = {
-                    "id": ext.id,
-                    "name": ext.name,
-                    "description": ext.description,
-                    "enabled": ext.enabled,
-                    "type": ext.type,
-                    "cmd": ext.cmd,
-                    "args": ext.args,
-                    "timeout": ext.timeout,
-                    "envs": ext.envs,
-                    "secrets": ext.secrets,
-                }
-
-                result.append(ext_dict)
-
-            return result
+        async with _get_db_context(readonly=True) as db:
+            # 行を辞書に変換しながら1回の走査で結果を組み立てる
+            result = await db.execute(_LIST_EXTENSIONS_STMT)
+            return [dict(row) for row in result.mappings()]
 
     async def add_extension(self, extension_data) -> Dict[str, Any]:
         """新しい拡張機能を追加
@@ -72,44 +172,31 @@ class ExtensionService:
             Dict[str, Any]: 追加された拡張機能
         """
         async with _get_db_context() as db:
-            # DBに拡張機能情報を追加
-            new_extension = Extension(
-                name=extension_data.name,
-                description=extension_data.description,
-                enabled=extension_data.enabled,
-                type=extension_data.type,
-                cmd=extension_data.cmd,
-                args=extension_data.args,
-                timeout=extension_data.timeout,
-                envs=extension_data.envs,
-                secrets=extension_data.secrets,
+            # DBに拡張機能情報を追加（作成した行をRETURNINGで受け取り、再取得のSELECTを省略する）
+            inserted = await db.execute(
+                insert(Extension)
+                .values(
+                    name=extension_data.name,
+                    description=extension_data.description,
+                    enabled=extension_data.enabled,
+                    type=extension_data.type,
+                    cmd=extension_data.cmd,
+                    args=extension_data.args,
+                    timeout=extension_data.timeout,
+                    envs=extension_data.envs,
+                    secrets=extension_data.secrets,
+                )
+                .returning(*(getattr(Extension, name) for name in EXTENSION_LIST_FIELDS))
             )
-            db.add(new_extension)
+            result = dict(inserted.mappings().one())
+            # 同期処理は別セッションで拡張機能を読み込むため、先にコミットする
             await db.commit()
-            await db.refresh(new_extension)
 
             # 拡張機能の実際のインストールはここで行うか、別の関数で実装
             # この例では手動でのインストールが必要であることを通知
 
-            result = {
-                "id": new_extension.id,
-                "name": new_extension.name,
-                "description": new_extension.description,
-                "enabled": new_extension.enabled,
-                "type": new_extension.type,
-                "cmd": new_extension.cmd,
-                "args": new_extension.args,
-                "timeout": new_extension.timeout,
-                "envs": new_extension.envs,
-                "secrets": new_extension.secrets,
-            }
-
-            # Goose の設定ファイルに同期
-            try:
-                await self.sync_to_goose()
-                logger.info(f"拡張機能の追加後に Goose の設定ファイルに同期しました: {new_extension.name}")
-            except Exception as e:
-                logger.error(f"拡張機能の追加後の同期中にエラーが発生しました: {e}")
+            # Goose の設定ファイルへの同期はバックグラウンドで行い、応答を待たせない
+            self._schedule_sync()
 
         return result
 
@@ -140,67 +227,63 @@ class ExtensionService:
                 "secrets": extension.secrets,
             }
 
-    async def update_extension(self, extension_id: int, update_data) -> Optional[Dict[str, Any]]:
-        """拡張機能の設定を更新
+    async def get_extensions_by_ids(self, extension_ids: List[int]) -> List[Dict[str, Any]]:
+        """IDを指定して有効な拡張機能をまとめて取得
+
+        IN句を使った1回のクエリで取得し、指定されたIDの順序で返します。
+        存在しないIDや無効化された拡張機能は含まれません。
 
         Args:
-            extension_id (int): 拡張機能ID
-            update_data: 更新データ
+            extension_ids (List[int]): 拡張機能IDのリスト
 
         Returns:
-            Optional[Dict[str, Any]]: 更新された拡張機能
+            List[Dict[str, Any]]: 拡張機能のリスト
         """
-        async with _get_db_context() as db:
-            extension = await db.get(Extension, extension_id)
-            if not extension:
-                return None
-
-            # 更新データを適用
-            if hasattr(update_data, "enabled") and update_data.enabled is not None:
-                extension.enabled = update_data.enabled
-
-            if hasattr(update_data, "type") and update_data.type is not None:
-                extension.type = update_data.type
-
-            if hasattr(update_data, "cmd") and update_data.cmd is not None:
-                extension.cmd = update_data.cmd
-
-            if hasattr(update_data, "args") and update_data.args is not None:
-                extension.args = update_data.args
-
-            if hasattr(update_data, "timeout") and update_data.timeout is not None:
-                extension.timeout = update_data.timeout
+        if not extension_ids:
+            return []
 
-            if hasattr(update_data, "envs") and update_data.envs is not None:
-                extension.envs = update_data.envs
+        async with _get_db_context() as db:
+            result = await db.execute(
+                select(Extension.__table__).where(Extension.id.in_(set(extension_ids)), Extension.enabled.is_(True))
+            )
+            extensions = {row.id: row._asdict() for row in result}
 
-            if hasattr(update_data, "secrets") and update_data.secrets is not None:
-                extension.secrets = update_data.secrets
+        return [extensions[ext_id] for ext_id in dict.fromkeys(extension_ids) if ext_id in extensions]
 
-            await db.commit()
-            await db.refresh(extension)
+    async def update_extension(self, extension_id: int, update_data) -> Optional[Dict[str, Any]]:
+        """拡張機能の設定を更新
 
-            result = {
-                "id": extension.id,
-                "name": extension.name,
-                "description": extension.description,
-                "enabled": extension.enabled,
-                "type": extension.type,
-                "cmd": extension.cmd,
-                "args": extension.args,
-                "timeout": extension.timeout,
-                "envs": extension.envs,
-                "secrets": extension.secrets,
-            }
+        Args:
+            extension_id (int): 拡張機能ID
+            update_data: 更新データ
 
-            # Goose の設定ファイルに同期
-            try:
-                await self.sync_to_goose()
-                logger.info(f"拡張機能の更新後に Goose の設定ファイルに同期しました: {extension.name}")
-            except Exception as e:
-                logger.error(f"拡張機能の更新後の同期中にエラーが発生しました: {e}")
+        Returns:
+            Optional[Dict[str, Any]]: 更新された拡張機能
+        """
+        # 指定された更新可能なフィールドのみを適用
+        values = _extension_update_values(update_data)
+        if values:
+            async with _get_db_context() as db:
+                # 更新後の行をRETURNINGで受け取り、事前の取得と再取得のSELECTを省略する
+                row = (
+                    await db.execute(
+                        update(Extension)
+                        .where(Extension.id == extension_id)
+                        .values(**values)
+                        .returning(*_EXTENSION_DETAIL_COLUMNS)
+                    )
+                ).first()
+            result = dict(row._mapping) if row else None
+        else:
+            result = await self.get_extension(extension_id)
+
+        if result is None:
+            return None
+
+        # Goose の設定ファイルへの同期はバックグラウンドで行い、応答を待たせない
+        self._schedule_sync()
 
-            return result
+        return result
 
     async def remove_extension(self, extension_id: int) -> bool:
         """拡張機能を削除
@@ -212,22 +295,18 @@ class ExtensionService:
             bool: 削除に成功した場合はTrue、それ以外はFalse
         """
         async with _get_db_context() as db:
-            extension = await db.get(Extension, extension_id)
-            if not extension:
-                return False
+            # 削除した行の名前をRETURNINGで受け取り、事前の取得を省略する
+            extension_name = (
+                await db.execute(_DELETE_EXTENSION_STMT, {"extension_id": extension_id})
+            ).scalar_one_or_none()
 
-            extension_name = extension.name
-            await db.delete(extension)
-            await db.commit()
+        if extension_name is None:
+            return False
 
-            # Goose の設定ファイルに同期
-            try:
-                await self.sync_to_goose()
-                logger.info(f"拡張機能の削除後に Goose の設定ファイルに同期しました: {extension_name}")
-            except Exception as e:
-                logger.error(f"拡張機能の削除後の同期中にエラーが発生しました: {e}")
+        # Goose の設定ファイルへの同期はバックグラウンドで行い、応答を待たせない
+        self._schedule_sync()
 
-            return True
+        return True
 
     async def install_extension_from_url(self, name: str, url: str, description: str = "") -> Dict[str, Any]:
         """URLから拡張機能をインストール
@@ -248,64 +327,46 @@ class ExtensionService:
         message = "新しいGoose CLIコマンド体系では拡張機能のインストールコマンドが提供されていません。手動でのインストールが必要です。"
 
         async with _get_db_context() as db:
-            # 既存の拡張機能を確認
-            result = await db.execute(select(Extension).where(Extension.name == name))
-            existing = result.scalars().first()
-
-            if existing:
-                # 既存の拡張機能を更新（説明は更新しない）
-                # existing.description = description
-                await db.commit()
-                await db.refresh(existing)
-                extension_id = existing.id
-            else:
-                # 新しい拡張機能を追加
-                # URLから拡張機能をインストールする場合は、stdio タイプとして扱う
-                new_extension = Extension(
-                    name=name,
-                    description=description,
-                    enabled=True,
-                    type="stdio",
-                    cmd="npx",
-                    args=["-y", url],
-                    timeout=300,
-                    envs={},
-                    secrets=[],
+            # 追加と既存の拡張機能の確認を1回のUPSERT文で行い、IDをRETURNINGで受け取る
+            # URLから拡張機能をインストールする場合は、stdio タイプとして扱う
+            # 既存の拡張機能は更新しない（名前を同じ値で更新し、IDのみを返す）
+            upsert = _dialect_insert(db.bind.dialect.name)(Extension).values(
+                name=name,
+                description=description,
+                enabled=True,
+                type="stdio",
+                cmd="npx",
+                args=["-y", url],
+                timeout=300,
+                envs={},
+                secrets=[],
+            )
+            extension_id = (
+                await db.execute(
+                    upsert.on_conflict_do_update(
+                        index_elements=[Extension.name], set_={"name": upsert.excluded.name}
+                    ).returning(Extension.id)
                 )
-                db.add(new_extension)
-                await db.commit()
-                await db.refresh(new_extension)
-                extension_id = new_extension.id
-
-            # Goose の設定ファイルに同期
-            try:
-                await self.sync_to_goose()
-                logger.info(f"拡張機能のインストール後に Goose の設定ファイルに同期しました: {name}")
-            except Exception as e:
-                logger.error(f"拡張機能のインストール後の同期中にエラーが発生しました: {e}")
+            ).scalar_one()
 
-            return {"success": True, "message": message, "extension_id": extension_id}
+        # Goose の設定ファイルへの同期はバックグラウンドで行い、応答を待たせない
+        self._schedule_sync()
 
-    async def _get_db_extensions(self, db: AsyncSession) -> List[Extension]:
-        """データベースから全ての拡張機能を取得
+        return {"success": True, "message": message, "extension_id": extension_id}
 
-        Args:
-            db (AsyncSession): データベースセッション
+    def _schedule_sync(self) -> None:
+        """Goose の設定ファイルへの同期をバックグラウンドタスクとして予約する
 
-        Returns:
-            List[Extension]: 拡張機能のリスト
+        同期タスクが実行中の場合は新しいタスクを作らず、そのタスクにもう一度同期させます。
         """
-        # テーブル作成処理はconftest.pyで行われるため、ここでは行わない
-        # 拡張機能を取得
-        try:
-            result = await db.execute(select(Extension))
-            extensions = list(result.scalars().all())
-            logger.info(f"拡張機能を{len(extensions)}件取得しました")
-            return extensions
-        except Exception as e:
-            logger.error(f"拡張機能取得中にエラーが発生しました: {e}")
-            # エラーが発生した場合は空のリストを返す
-            return []
+        global _sync_requested
+        _sync_requested = True
+        if any(not task.done() for task in _pending_sync):
+            return
+
+        task = asyncio.create_task(_run_requested_syncs(self.sync_to_goose))
+        _pending_sync.add(task)
+        task.add_done_callback(_pending_sync.discard)
 
     async def sync_to_goose(self) -> Dict[str, Any]:
         """Goosuke のデータベースの拡張機能を Goose の設定ファイルに同期する
@@ -321,78 +382,67 @@ class ExtensionService:
         try:
             # Goose の設定ファイルを読み取る
             config_path = get_goose_config_path()
-            config = read_goose_config()
+            config = await asyncio.to_thread(read_goose_config)
 
             # extensions キーがなければ初期化
             if "extensions" not in config:
                 config["extensions"] = {}
 
-            async with _get_db_context() as db:
-                # データベースから全ての拡張機能を取得
-                db_extensions = await self._get_db_extensions(db)
-
-                # データベースの拡張機能を設定ファイルに反映
-                for ext in db_extensions:
-                    key = ext.name.lower().replace(" ", "")
-
-                    # 拡張機能エントリを作成
-                    # 各フィールドを直接 extensions.{key} の下に配置
-                    extension_config = {
-                        "enabled": ext.enabled,
-                        "type": ext.type,
-                    }
-
-                    # 必須でないフィールドは None でない場合のみ追加
-                    if ext.cmd is not None:
-                        extension_config["cmd"] = ext.cmd
-
-                    if ext.args is not None:
-                        extension_config["args"] = ext.args
-
-                    if ext.timeout is not None:
-                        extension_config["timeout"] = ext.timeout
-
-                    if ext.envs is not None:
-                        extension_config["envs"] = ext.envs.copy() if isinstance(ext.envs, dict) else {}
-                    else:
-                        extension_config["envs"] = {}
-
-                    # 秘密情報の設定
-                    try:
-                        if ext.secrets is not None and isinstance(ext.secrets, list):
-                            # 秘密情報のキーリストから値を取得
-                            # 循環インポートを避けるため、必要な時だけインポート
-                            from ..services.setting_service import SettingService
+            # 同期に必要な列のみを行として取得し、秘密情報の取得前にセッションを返却する（ORMインスタンスは生成しない）
+            async with _get_db_context(readonly=True) as db:
+                db_extensions = (await db.execute(_SYNC_TO_GOOSE_STMT)).all()
+            logger.info("拡張機能を%s件取得しました", len(db_extensions))
 
-                            setting_service = SettingService()
+            # 全拡張機能の秘密情報の値を1回のクエリでまとめて取得する
+            secret_values = await get_setting_service().get_setting_values(
+                secret_key for ext in db_extensions if isinstance(ext.secrets, list) for secret_key in ext.secrets
+            )
 
-                            for secret_key in ext.secrets:
-                                # 設定値を取得
-                                setting = await setting_service.get_setting_by_key(secret_key)
-                                if setting and setting["value"] is not None:
-                                    # 値を拡張機能の環境変数に追加
-                                    extension_config["envs"][secret_key] = setting["value"]
-                                    logger.info(f"拡張機能 {ext.name} に秘密情報 {secret_key} を設定しました")
-                    except Exception as e:
-                        logger.error(f"拡張機能 {ext.name} の秘密情報処理中にエラーが発生しました: {e}")
+            # データベースの拡張機能を設定ファイルに反映
+            for ext in db_extensions:
+                key = ext.name.lower().replace(" ", "")
+
+                # 拡張機能エントリを作成
+                # 各フィールドを直接 extensions.{key} の下に配置し、必須でないフィールドは None でない場合のみ含める
+                extension_config = {
+                    field: value
+                    for field, value in (
+                        ("enabled", ext.enabled),
+                        ("type", ext.type),
+                        ("cmd", ext.cmd),
+                        ("args", ext.args),
+                        ("timeout", ext.timeout),
+                        ("envs", dict(ext.envs) if isinstance(ext.envs, dict) else {}),
+                        ("name", ext.name),
+                    )
+                    if value is not None or field in _REQUIRED_GOOSE_FIELDS
+                }
 
-                    # 名前も追加
-                    extension_config["name"] = ext.name
+                # 秘密情報のキーリストから取得した値を拡張機能の環境変数に追加
+                if isinstance(ext.secrets, list):
+                    secret_envs = {
+                        secret_key: secret_values[secret_key]
+                        for secret_key in ext.secrets
+                        if secret_values.get(secret_key) is not None
+                    }
+                    if secret_envs:
+                        extension_config["envs"] |= secret_envs
+                        logger.info("拡張機能 %s に秘密情報 %s を設定しました", ext.name, ", ".join(secret_envs))
 
-                    config["extensions"][key] = extension_config
+                config["extensions"][key] = extension_config
 
             # 設定ファイルを保存
             try:
-                os.makedirs(config_path.parent, exist_ok=True)
-                with open(config_path, "w") as f:
-                    yaml.dump(config, f)
-                logger.info(f"設定ファイルを保存しました: {config_path}")
+                # YAMLの出力とファイルの書き込みはイベントループを止めないよう別スレッドで行う
+                await asyncio.to_thread(write_goose_config, config_path, config)
+                logger.info("設定ファイルを保存しました: %s", config_path)
             except Exception as e:
-                logger.error(f"設定ファイルの保存中にエラーが発生しました: {e}")
+                logger.error("設定ファイルの保存中にエラーが発生しました: %s", e)
                 # エラーが発生しても処理を続行
 
             logger.info(
-                f"Goosuke の拡張機能を Goose の設定ファイルに同期しました。{len(db_extensions)}件の拡張機能を同期しました。"
+                "Goosuke の拡張機能を Goose の設定ファイルに同期しました。%s件の拡張機能を同期しました。",
+                len(db_extensions),
             )
             return {
                 "success": True,
@@ -400,7 +450,7 @@ class ExtensionService:
                 "synced_count": len(db_extensions),
             }
         except Exception as e:
-            logger.error(f"Goose の設定ファイルへの同期中にエラーが発生しました: {e}")
+            logger.error("Goose の設定ファイルへの同期中にエラーが発生しました: %s", e)
             return {
                 "success": False,
                 "message": f"Goose の設定ファイルへの同期中にエラーが発生しました: {str(e)}",
@@ -420,7 +470,7 @@ class ExtensionService:
 
         try:
             # Goose の拡張機能設定を読み取る
-            goose_extensions = read_goose_extensions()
+            goose_extensions = await asyncio.to_thread(read_goose_extensions)
             if not goose_extensions:
                 logger.info("Goose の拡張機能設定が見つかりませんでした。空の設定として処理します。")
                 return {
@@ -432,9 +482,12 @@ class ExtensionService:
             synced_count = 0
 
             async with _get_db_context() as db:
-                # データベースから既存の拡張機能を取得
-                db_extensions = await self._get_db_extensions(db)
-                db_extensions_dict = {ext.name: ext for ext in db_extensions}
+                # 既存の拡張機能は、設定ファイルにない項目を引き継ぐための列のみを取得する
+                result = await db.execute(_SYNC_FROM_GOOSE_EXISTING_STMT)
+                existing = {row.name: row for row in result}
+
+                # 拡張機能名ごとに書き込む行を組み立てる（同名の項目は後のものを優先する）
+                rows: Dict[str, Dict[str, Any]] = {}
 
                 # Goose の拡張機能を Goosuke のデータベースに反映
                 for key, entry in goose_extensions.items():
@@ -450,67 +503,81 @@ class ExtensionService:
                     name = entry.get("name", "")
 
                     if not name:
-                        logger.warning(f"拡張機能名が見つかりません: {key}")
+                        logger.warning("拡張機能名が見つかりません: %s", key)
                         continue
 
                     # sseの拡張機能は同期しない
                     if extension_type == "sse":
-                        logger.info(f"SSE拡張機能はスキップします: {name}")
+                        logger.info("SSE拡張機能はスキップします: %s", name)
                         continue
 
-                    if name in db_extensions_dict:
-                        # 既存の拡張機能を更新
-                        ext = db_extensions_dict[name]
-                        ext.enabled = enabled
-                        ext.type = extension_type
-
-                        # 他のフィールドも更新
-                        if "cmd" in entry:
-                            ext.cmd = entry.get("cmd")
-                        if "args" in entry:
-                            ext.args = entry.get("args")
-                        if "timeout" in entry:
-                            ext.timeout = entry.get("timeout")
-                        if "envs" in entry:
-                            ext.envs = entry.get("envs")
-
-                        logger.info(f"拡張機能を更新しました: {name}")
+                    current = existing.get(name)
+                    if current is not None:
+                        # 既存の拡張機能を更新（設定ファイルにない項目は現在の値を引き継ぐ）
+                        row = {
+                            "name": name,
+                            "description": current.description,
+                            "enabled": enabled,
+                            "type": extension_type,
+                            "cmd": entry["cmd"] if "cmd" in entry else current.cmd,
+                            "args": entry["args"] if "args" in entry else current.args,
+                            "timeout": entry["timeout"] if "timeout" in entry else current.timeout,
+                            "envs": entry["envs"] if "envs" in entry else current.envs,
+                        }
+                        logger.info("拡張機能を更新しました: %s", name)
                     else:
                         # 新しい拡張機能を追加
-                        description = ""
                         if extension_type == "builtin":
                             description = f"Goose built-in extension: {name}"
                         elif extension_type == "stdio":
                             description = f"Goose stdio extension: {name}"
-                        elif extension_type == "sse":
-                            description = f"Goose SSE extension: {name}"
                         else:
                             description = f"Goose extension: {name}"
 
-                        new_extension = Extension(
-                            name=name,
-                            description=description,
-                            enabled=enabled,
-                            type=extension_type,
-                            cmd=entry.get("cmd"),
-                            args=entry.get("args"),
-                            timeout=entry.get("timeout"),
-                            envs=entry.get("envs"),
-                        )
-                        db.add(new_extension)
-                        logger.info(f"新しい拡張機能を追加しました: {name}")
-
+                        row = {
+                            "name": name,
+                            "description": description,
+                            "enabled": enabled,
+                            "type": extension_type,
+                            "cmd": entry.get("cmd"),
+                            "args": entry.get("args"),
+                            "timeout": entry.get("timeout"),
+                            "envs": entry.get("envs"),
+                        }
+                        logger.info("新しい拡張機能を追加しました: %s", name)
+
+                    rows[name] = row
                     synced_count += 1
 
-                # データベースの変更を保存
-                await db.commit()
+                # 追加と更新を1回のUPSERT文で反映する（説明は追加時のみ設定する）
+                if rows:
+                    upsert = _dialect_insert(db.bind.dialect.name)(Extension).values(list(rows.values()))
+                    await db.execute(
+                        upsert.on_conflict_do_update(
+                            index_elements=[Extension.name],
+                            set_={
+                                name: getattr(upsert.excluded, name)
+                                for name in ("enabled", "type", "cmd", "args", "timeout", "envs")
+                            },
+                        )
+                    )
 
-            logger.info(f"Goose の拡張機能設定の同期が完了しました。{synced_count}件の拡張機能を同期しました。")
+            logger.info("Goose の拡張機能設定の同期が完了しました。%s件の拡張機能を同期しました。", synced_count)
             return {
                 "success": True,
                 "message": f"Goose の拡張機能設定を同期しました。{synced_count}件の拡張機能を同期しました。",
                 "synced_count": synced_count,
             }
         except Exception as e:
-            logger.error(f"拡張機能の同期中にエラーが発生しました: {e}")
+            logger.error("拡張機能の同期中にエラーが発生しました: %s", e)
             return {"success": False, "message": f"拡張機能の同期中にエラーが発生しました: {str(e)}", "synced_count": 0}
+
+
+@lru_cache(maxsize=1)
+def get_extension_service() -> ExtensionService:
+    """拡張機能サービスのインスタンスを取得する依存関係
+
+    Returns:
+        ExtensionService: 共有の拡張機能サービスインスタンス
+    """
+    return ExtensionService()
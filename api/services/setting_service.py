@@ -5,9 +5,12 @@
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import bindparam, insert, select
 
 from ..database import _get_db_context
 from ..models.setting import Setting
@@ -15,6 +18,33 @@ from ..utils.crypto_utils import maybe_decrypt_value, maybe_encrypt_value
 
 logger = logging.getLogger(__name__)
 
+# キーによる設定の取得クエリ
+_SETTING_BY_KEY_STMT = select(Setting.id, Setting.key, Setting.value, Setting.description, Setting.is_secret).where(
+    Setting.key == bindparam("key")
+)
+
+# キーによる設定の取得結果のキャッシュ（キー: (キャッシュ世代, 設定キー)。該当なしのNoneもキャッシュする）
+_SETTING_CACHE_MAXSIZE = 256
+_SETTING_CACHE_TTL = 300
+_setting_cache: TTLCache[Tuple[int, str], Optional[Dict[str, Any]]] = TTLCache(
+    maxsize=_SETTING_CACHE_MAXSIZE, ttl=_SETTING_CACHE_TTL
+)
+_setting_cache_lock = threading.Lock()
+_setting_cache_epoch = 0
+_MISSING = object()
+
+
+def invalidate_setting_cache() -> None:
+    """キーによる設定の取得結果のキャッシュを無効化する関数
+
+    設定を追加・更新・削除した後に呼び出します。
+    世代を進めるため、無効化の前に開始された取得の結果がキャッシュに残ることもありません。
+    """
+    global _setting_cache_epoch
+    with _setting_cache_lock:
+        _setting_cache_epoch += 1
+        _setting_cache.clear()
+
 
 class SettingService:
     """設定サービスクラス"""
@@ -26,8 +56,11 @@ class SettingService:
             List[Dict[str, Any]]: 設定のリスト
         """
         async with _get_db_context() as db:
-            result = await db.execute(select(Setting))
-            settings = result.scalars().all()
+            # 必要な列のみを行として取得する（ORMインスタンスは生成しない）
+            result = await db.execute(
+                select(Setting.id, Setting.key, Setting.value, Setting.description, Setting.is_secret)
+            )
+            settings = result.all()
 
             # 情報を整形
             result = []
@@ -79,24 +112,31 @@ class SettingService:
     async def get_setting_by_key(self, key: str) -> Optional[Dict[str, Any]]:
         """キーで設定を取得
 
+        Botトークンのように起動のたびに参照される設定のため、取得結果は短時間キャッシュします。
+
         Args:
             key (str): 設定キー
 
         Returns:
             Optional[Dict[str, Any]]: 設定の詳細
         """
+        cache_key = (_setting_cache_epoch, key)
+        with _setting_cache_lock:
+            cached = _setting_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return dict(cached) if cached else None
+
         async with _get_db_context() as db:
-            result = await db.execute(select(Setting).where(Setting.key == key))
-            setting = result.scalars().first()
-            if not setting:
-                return None
+            setting = (await db.execute(_SETTING_BY_KEY_STMT, {"key": key})).first()
 
+        result = None
+        if setting:
             # 秘密情報の場合は復号化
             value = setting.value
             if setting.is_secret and value is not None:
                 value = maybe_decrypt_value(value, True)
 
-            return {
+            result = {
                 "id": setting.id,
                 "key": setting.key,
                 "value": value,
@@ -104,6 +144,34 @@ class SettingService:
                 "is_secret": setting.is_secret,
             }
 
+        with _setting_cache_lock:
+            _setting_cache[cache_key] = result
+        return dict(result) if result else None
+
+    async def get_setting_values(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """複数のキーの設定値を1回のクエリでまとめて取得
+
+        Args:
+            keys (Iterable[str]): 設定キー
+
+        Returns:
+            Dict[str, Any]: 設定キーと値（秘密情報は復号化済み）の辞書。存在しないキーは含まない
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+
+        async with _get_db_context(readonly=True) as db:
+            result = await db.execute(
+                select(Setting.key, Setting.value, Setting.is_secret).where(Setting.key.in_(keys))
+            )
+            rows = result.all()
+
+        return {
+            key: maybe_decrypt_value(value, True) if is_secret and value is not None else value
+            for key, value, is_secret in rows
+        }
+
     async def add_setting(self, setting_data) -> Dict[str, Any]:
         """新しい設定を追加
 
@@ -121,16 +189,16 @@ class SettingService:
             if is_secret and value is not None:
                 value = maybe_encrypt_value(value, True)
 
-            # DBに設定情報を追加
-            new_setting = Setting(
-                key=setting_data.key,
-                value=value,
-                description=setting_data.description,
-                is_secret=is_secret,
-            )
-            db.add(new_setting)
-            await db.commit()
-            await db.refresh(new_setting)
+            # DBに設定情報を追加（作成した行をRETURNINGで受け取り、再取得のSELECTを省略する）
+            new_setting = (
+                await db.execute(
+                    insert(Setting)
+                    .values(
+                        key=setting_data.key, value=value, description=setting_data.description, is_secret=is_secret
+                    )
+                    .returning(Setting.id, Setting.key, Setting.value, Setting.description, Setting.is_secret)
+                )
+            ).one()
 
             # 秘密情報の場合は値を隠す
             result_value = new_setting.value
@@ -145,6 +213,7 @@ class SettingService:
                 "is_secret": new_setting.is_secret,
             }
 
+        invalidate_setting_cache()
         return result
 
     async def update_setting(self, setting_id: int, update_data) -> Optional[Dict[str, Any]]:
@@ -189,6 +258,7 @@ class SettingService:
                 setting.is_secret = update_data.is_secret
 
             await db.commit()
+            invalidate_setting_cache()
             await db.refresh(setting)
 
             # 秘密情報の場合は値を隠す
@@ -222,5 +292,16 @@ class SettingService:
 
             await db.delete(setting)
             await db.commit()
+            invalidate_setting_cache()
 
             return True
+
+
+@lru_cache(maxsize=1)
+def get_setting_service() -> SettingService:
+    """設定サービスのインスタンスを取得する依存関係
+
+    Returns:
+        SettingService: 共有の設定サービスインスタンス
+    """
+    return SettingService()
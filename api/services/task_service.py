@@ -6,15 +6,24 @@
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select, update
 
 from goose.executor import TaskExecutor
 
 from ..database import _get_db_context
 from ..models.task_execution import TaskExecution
 from ..models.task_template import TaskTemplate
+from ..utils.list_fields import to_field_dict
+
+# 一覧取得で返却する列（context・result・extensions_output・errorなどの大きな列は含めない）
+TASK_TEMPLATE_LIST_FIELDS = ("id", "user_id", "name", "task_type", "description", "created_at", "updated_at")
+TASK_EXECUTION_LIST_FIELDS = ("id", "template_id", "user_id", "status", "created_at", "completed_at")
+
+# タスク実行時のプロンプト取得クエリ
+_TEMPLATE_PROMPT_STMT = select(TaskTemplate.prompt).where(TaskTemplate.id == bindparam("template_id"))
 
 
 class TaskService:
@@ -52,16 +61,13 @@ class TaskService:
         """
         # データベースにタスクテンプレートを記録
         async with _get_db_context() as db:
-            task_template = TaskTemplate(
-                user_id=user_id,
-                name=name,
-                task_type=task_type,
-                prompt=prompt,
-                description=description,
+            # 作成した行をRETURNINGで受け取り、再取得のSELECTを省略する
+            result = await db.execute(
+                insert(TaskTemplate)
+                .values(user_id=user_id, name=name, task_type=task_type, prompt=prompt, description=description)
+                .returning(*TaskTemplate.__table__.c)
             )
-            db.add(task_template)
-            await db.commit()
-            await db.refresh(task_template)
+            task_template = result.one()
 
             return {
                 "template_id": task_template.id,
@@ -89,25 +95,63 @@ class TaskService:
         Returns:
             Dict[str, Any]: 作成されたタスク実行
         """
+        executions = await self.create_task_executions(
+            [{"task_template_id": task_template_id, "context": context, "user_id": user_id}]
+        )
+        return executions[0]
+
+    async def create_task_executions(self, executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """タスク実行をまとめて作成する
+
+        全行を1つのINSERT文（insertmanyvalues）で登録し、RETURNINGで作成結果を取得します。
+
+        Args:
+            executions (List[Dict[str, Any]]): 作成するタスク実行のリスト。
+                各要素は task_template_id と、任意で context・user_id を持つ
+
+        Returns:
+            List[Dict[str, Any]]: 作成されたタスク実行のリスト（引数と同じ順序）
+        """
+        if not executions:
+            return []
+
+        rows = [
+            {
+                "template_id": execution["task_template_id"],
+                "user_id": execution.get("user_id"),
+                "context": execution.get("context"),
+                "status": "pending",
+            }
+            for execution in executions
+        ]
+
         async with _get_db_context() as db:
-            task_execution = TaskExecution(
-                template_id=task_template_id,
-                user_id=user_id,
-                context=context,
-                status="pending",
+            result = await db.execute(
+                insert(TaskExecution).returning(
+                    TaskExecution.id,
+                    TaskExecution.template_id,
+                    TaskExecution.user_id,
+                    TaskExecution.context,
+                    TaskExecution.status,
+                    TaskExecution.created_at,
+                    sort_by_parameter_order=True,
+                ),
+                rows,
             )
-            db.add(task_execution)
+            created = result.all()
             await db.commit()
-            await db.refresh(task_execution)
 
-            return {
-                "id": task_execution.id,
-                "template_id": task_execution.template_id,
-                "user_id": task_execution.user_id,
-                "context": task_execution.context,
-                "status": task_execution.status,
-                "created_at": task_execution.created_at.isoformat() if task_execution.created_at else None,
+        return [
+            {
+                "id": row.id,
+                "template_id": row.template_id,
+                "user_id": row.user_id,
+                "context": row.context,
+                "status": row.status,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
             }
+            for row in created
+        ]
 
     async def update_task_execution(
         self,
@@ -164,6 +208,7 @@ class TaskService:
         context: Optional[Dict[str, Any]] = None,
         user_id: Optional[int] = None,
         extensions: Optional[List[str]] = None,
+        prompt: Optional[str] = None,
     ) -> Dict[str, Any]:
         """タスクを実行
 
@@ -172,69 +217,128 @@ class TaskService:
             context (Optional[Dict[str, Any]], optional): アクションから得られたコンテキスト。デフォルトはNone
             user_id (Optional[int], optional): ユーザーID。デフォルトはNone
             extensions (Optional[List[str]], optional): 使用する拡張機能のリスト。デフォルトはNone
+            prompt (Optional[str], optional): 取得済みのタスクテンプレートのプロンプト。デフォルトはNone（テンプレートから取得）
 
         Returns:
             Dict[str, Any]: 実行結果
         """
-        # タスクテンプレートを取得
+        execution = await self.start_task_execution(
+            template_id, context=context, user_id=user_id, status="processing", prompt=prompt
+        )
+        if not execution:
+            return {
+                "success": False,
+                "output": f"テンプレートID {template_id} が見つかりません",
+            }
+
+        return await self.run_task_execution(
+            execution_id=execution["execution_id"],
+            template_id=template_id,
+            prompt=execution["prompt"],
+            context=context,
+            extensions=extensions,
+        )
+
+    async def start_task_execution(
+        self,
+        template_id: int,
+        context: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None,
+        status: str = "pending",
+        prompt: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """タスク実行ログを作成して実行を受け付ける
+
+        Args:
+            template_id (int): タスクテンプレートID
+            context (Optional[Dict[str, Any]], optional): アクションから得られたコンテキスト。デフォルトはNone
+            user_id (Optional[int], optional): ユーザーID。デフォルトはNone
+            status (str, optional): 作成時のステータス。デフォルトは"pending"
+            prompt (Optional[str], optional): 取得済みのプロンプト。指定した場合はテンプレートを再取得しません。デフォルトはNone
+
+        Returns:
+            Optional[Dict[str, Any]]: 実行ID・テンプレートID・プロンプト・ステータス（テンプレートが存在しない場合はNone）
+        """
         async with _get_db_context() as db:
-            task_template = await db.get(TaskTemplate, template_id)
-            if not task_template:
-                return {
-                    "success": False,
-                    "output": f"テンプレートID {template_id} が見つかりません",
-                }
-
-            # タスク実行ログを作成
-            task_execution = TaskExecution(
-                template_id=template_id,
-                user_id=user_id,
-                context=context,
-                status="processing",
+            if prompt is None:
+                prompt = await db.scalar(_TEMPLATE_PROMPT_STMT, {"template_id": template_id})
+                if prompt is None:
+                    return None
+
+            execution_id = await db.scalar(
+                insert(TaskExecution)
+                .values(template_id=template_id, user_id=user_id, context=context, status=status)
+                .returning(TaskExecution.id)
             )
-            db.add(task_execution)
-            await db.commit()
-            await db.refresh(task_execution)
 
-            try:
-                # 実行レイヤーでタスクを実行
-                result = await self.task_executor.execute_task(
-                    prompt=task_template.prompt, context=context, extensions=extensions
-                )
+        return {"execution_id": execution_id, "template_id": template_id, "prompt": prompt, "status": status}
 
-                # タスク実行ログを更新
-                task_execution.result = result["output"]
-                task_execution.extensions_output = result.get("extensions_output", {})
-                task_execution.status = "completed" if result["success"] else "failed"
-                task_execution.error = None if result["success"] else result["output"]
-                task_execution.completed_at = datetime.now()
+    async def run_task_execution(
+        self,
+        execution_id: int,
+        template_id: int,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        extensions: Optional[List[str]] = None,
+        mark_processing: bool = False,
+    ) -> Dict[str, Any]:
+        """受け付け済みのタスクを実行し、結果をタスク実行ログに記録する
 
-                await db.commit()
-                await db.refresh(task_execution)
-
-                return {
-                    "execution_id": task_execution.id,
-                    "template_id": task_template.id,
-                    "success": result["success"],
-                    "output": result["output"],
-                    "extensions_output": result.get("extensions_output", {}),
-                }
-
-            except Exception as e:
-                # エラー発生時
-                task_execution.status = "failed"
-                task_execution.error = str(e)
-                task_execution.completed_at = datetime.now()
+        実行レイヤーの処理中はデータベース接続を保持しません。
+
+        Args:
+            execution_id (int): タスク実行ID
+            template_id (int): タスクテンプレートID
+            prompt (str): タスクテンプレートのプロンプト
+            context (Optional[Dict[str, Any]], optional): アクションから得られたコンテキスト。デフォルトはNone
+            extensions (Optional[List[str]], optional): 使用する拡張機能のリスト。デフォルトはNone
+            mark_processing (bool, optional): 実行前にステータスを"processing"に更新するかどうか。デフォルトはFalse
 
-                await db.commit()
+        Returns:
+            Dict[str, Any]: 実行結果
+        """
+        if mark_processing:
+            async with _get_db_context() as db:
+                await db.execute(
+                    update(TaskExecution).where(TaskExecution.id == execution_id).values(status="processing")
+                )
+
+        try:
+            # 実行レイヤーでタスクを実行
+            result = await self.task_executor.execute_task(prompt=prompt, context=context, extensions=extensions)
+            values = {
+                "result": result["output"],
+                "extensions_output": result.get("extensions_output", {}),
+                "status": "completed" if result["success"] else "failed",
+                "error": None if result["success"] else result["output"],
+            }
+            response = {
+                "execution_id": execution_id,
+                "template_id": template_id,
+                "success": result["success"],
+                "output": result["output"],
+                "extensions_output": result.get("extensions_output", {}),
+            }
+        except Exception as e:
+            # エラー発生時
+            values = {"status": "failed", "error": str(e)}
+            response = {
+                "execution_id": execution_id,
+                "template_id": template_id,
+                "success": False,
+                "output": str(e),
+                "extensions_output": {},
+            }
+
+        # タスク実行ログを更新
+        async with _get_db_context() as db:
+            await db.execute(
+                update(TaskExecution)
+                .where(TaskExecution.id == execution_id)
+                .values(**values, completed_at=datetime.now())
+            )
 
-                return {
-                    "execution_id": task_execution.id,
-                    "template_id": task_template.id,
-                    "success": False,
-                    "output": str(e),
-                    "extensions_output": {},
-                }
+        return response
 
     async def get_task_template(self, template_id: int) -> Optional[Dict[str, Any]]:
         """タスクテンプレートの詳細を取得
@@ -308,7 +412,8 @@ class TaskService:
             List[Dict[str, Any]]: タスクテンプレートのリスト
         """
         async with _get_db_context() as db:
-            query = select(TaskTemplate)
+            # 一覧ではpromptを読み込まず、ORMインスタンスも生成しない
+            query = select(*(getattr(TaskTemplate, name) for name in TASK_TEMPLATE_LIST_FIELDS))
 
             if user_id is not None:
                 query = query.where(TaskTemplate.user_id == user_id)
@@ -319,20 +424,8 @@ class TaskService:
             query = query.order_by(TaskTemplate.created_at.desc()).limit(limit).offset(offset)
 
             result = await db.execute(query)
-            templates = result.scalars().all()
-
-            return [
-                {
-                    "id": template.id,
-                    "user_id": template.user_id,
-                    "name": template.name,
-                    "task_type": template.task_type,
-                    "description": template.description,
-                    "created_at": template.created_at.isoformat() if template.created_at else None,
-                    "updated_at": template.updated_at.isoformat() if template.updated_at else None,
-                }
-                for template in templates
-            ]
+
+            return [to_field_dict(row, TASK_TEMPLATE_LIST_FIELDS) for row in result]
 
     async def list_task_executions(
         self,
@@ -341,6 +434,7 @@ class TaskService:
         status: Optional[str] = None,
         limit: int = 10,
         offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[Dict[str, Any]]:
         """タスク実行ログの一覧を取得
 
@@ -350,12 +444,16 @@ class TaskService:
             status (Optional[str], optional): ステータス。デフォルトはNone
             limit (int, optional): 取得件数。デフォルトは10
             offset (int, optional): オフセット。デフォルトは0
+            fields (Optional[Sequence[str]], optional): 返却する列。デフォルトはNone（TASK_EXECUTION_LIST_FIELDSすべて）
 
         Returns:
             List[Dict[str, Any]]: タスク実行ログのリスト
         """
+        columns = list(fields) if fields else list(TASK_EXECUTION_LIST_FIELDS)
+
         async with _get_db_context() as db:
-            query = select(TaskExecution)
+            # 返却する列のみを行として取得し、JSON/Textの大きな列は転送しない
+            query = select(*(getattr(TaskExecution, name) for name in columns))
 
             if template_id is not None:
                 query = query.where(TaskExecution.template_id == template_id)
@@ -369,16 +467,15 @@ class TaskService:
             query = query.order_by(TaskExecution.created_at.desc()).limit(limit).offset(offset)
 
             result = await db.execute(query)
-            executions = result.scalars().all()
-
-            return [
-                {
-                    "id": execution.id,
-                    "template_id": execution.template_id,
-                    "user_id": execution.user_id,
-                    "status": execution.status,
-                    "created_at": execution.created_at.isoformat() if execution.created_at else None,
-                    "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
-                }
-                for execution in executions
-            ]
+
+            return [to_field_dict(row, columns) for row in result]
+
+
+@lru_cache(maxsize=1)
+def get_task_service() -> TaskService:
+    """タスクサービスのインスタンスを取得する依存関係
+
+    Returns:
+        TaskService: 共有のタスクサービスインスタンス
+    """
+    return TaskService()
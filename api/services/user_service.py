@@ -4,10 +4,13 @@
 このモジュールは、ユーザー管理を行うサービスを提供します。
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.exc import IntegrityError
 
+from ..auth.dependencies import invalidate_user_cache
 from ..auth.password import get_password_hash, verify_password
 from ..database import _get_db_context
 from ..models.user import User
@@ -17,45 +20,49 @@ class UserService:
     """ユーザーサービスクラス"""
 
     async def create_user(
-        self, username: str, email: str, password: str, is_admin: bool = False, db=None
+        self, username: str, email: str, password: str, is_admin: Optional[bool] = False, db=None
     ) -> Optional[Dict[str, Any]]:
         """ユーザーを作成
 
+        重複確認・管理者判定・作成を1つのINSERT文で行います。
+
         Args:
             username (str): ユーザー名
             email (str): メールアドレス
             password (str): パスワード
-            is_admin (bool, optional): 管理者フラグ。デフォルトはFalse
+            is_admin (Optional[bool], optional): 管理者フラグ。Noneの場合はユーザーが存在しなければ管理者とする。デフォルトはFalse
             db (optional): データベースセッション
 
         Returns:
-            Optional[Dict[str, Any]]: 作成されたユーザー
+            Optional[Dict[str, Any]]: 作成されたユーザー。ユーザー名またはメールアドレスが既に存在する場合はNone
         """
         if db is None:
             async with _get_db_context() as session:
                 return await self.create_user(username, email, password, is_admin, session)
 
-        # ユーザー名またはメールアドレスが既に存在するか確認
-        result = await db.execute(select(User).where((User.username == username) | (User.email == email)))
-        existing_user = result.scalars().first()
-
-        if existing_user:
-            return None
-
         # パスワードをハッシュ化
-        hashed_password = get_password_hash(password)
-
-        # ユーザーを作成
-        user = User(
-            username=username,
-            email=email,
-            hashed_password=hashed_password,
-            is_admin=is_admin,
+        hashed_password = await get_password_hash(password)
+
+        # 最初のユーザーかどうかはINSERT内で判定し、同時登録でも管理者が重複しないようにする
+        admin_flag = ~exists(select(User.id)) if is_admin is None else literal(is_admin)
+
+        # ユーザーを作成（ユーザー名・メールアドレスの重複は一意制約で検出）
+        query = (
+            insert(User)
+            .from_select(
+                [User.username, User.email, User.hashed_password, User.is_admin],
+                select(literal(username), literal(email), literal(hashed_password), admin_flag),
+            )
+            .returning(User.id, User.username, User.email, User.is_admin, User.is_active)
         )
 
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        try:
+            result = await db.execute(query)
+            user = result.one()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return None
 
         return {
             "id": user.id,
@@ -86,7 +93,7 @@ class UserService:
         if not user:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return None
 
         return user  # type: ignore[no-any-return]
@@ -150,19 +157,16 @@ class UserService:
             List[Dict[str, Any]]: ユーザーのリスト
         """
         async with _get_db_context() as db:
-            result = await db.execute(select(User).order_by(User.id).limit(limit).offset(offset))
-            users = result.scalars().all()
-
-            return [
-                {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "is_admin": user.is_admin,
-                    "is_active": user.is_active,
-                }
-                for user in users
-            ]
+            # 必要な列のみを行として取得する（ORMインスタンスは生成しない）
+            query = (
+                select(User.id, User.username, User.email, User.is_admin, User.is_active)
+                .order_by(User.id)
+                .limit(limit)
+                .offset(offset)
+            )
+            result = await db.execute(query)
+
+            return [row._asdict() for row in result]
 
     async def update_user(
         self,
@@ -194,7 +198,7 @@ class UserService:
                 user.email = email
 
             if password is not None:
-                user.hashed_password = get_password_hash(password)
+                user.hashed_password = await get_password_hash(password)
 
             if is_active is not None:
                 user.is_active = is_active
@@ -205,6 +209,9 @@ class UserService:
             await db.commit()
             await db.refresh(user)
 
+            # 認証結果に影響するため、キャッシュ済みのユーザーを破棄
+            invalidate_user_cache()
+
             return {
                 "id": user.id,
                 "username": user.username,
@@ -212,3 +219,13 @@ class UserService:
                 "is_admin": user.is_admin,
                 "is_active": user.is_active,
             }
+
+
+@lru_cache(maxsize=1)
+def get_user_service() -> UserService:
+    """ユーザーサービスのインスタンスを取得する依存関係
+
+    Returns:
+        UserService: 共有のユーザーサービスインスタンス
+    """
+    return UserService()
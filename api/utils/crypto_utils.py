@@ -7,6 +7,7 @@
 import base64
 import json
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
 
 from cryptography.fernet import Fernet
@@ -38,11 +39,23 @@ def _get_encryption_key() -> bytes:
         return key
     except Exception as e:
         # エラーが発生した場合はデフォルトのキーを返す
-        logger.error(f"暗号化キーの生成に失敗しました: {e}")
+        logger.error("暗号化キーの生成に失敗しました: %s", e)
         # Fernetキーは32バイトをBase64エンコードした形式である必要がある
         return base64.urlsafe_b64encode(b"0123456789012345678901234567890123456789012345678901234567890123"[:32])
 
 
+@lru_cache(maxsize=1)
+def _get_fernet() -> Fernet:
+    """暗号化に使用するFernetインスタンスを取得する
+
+    鍵導出（PBKDF2）は初回のみ行い、以降の暗号化・復号化では同じインスタンスを再利用します。
+
+    Returns:
+        Fernet: Fernetインスタンス
+    """
+    return Fernet(_get_encryption_key())
+
+
 def encrypt_value(value: Union[str, Dict[str, Any], list, int, float, bool, None]) -> Optional[str]:
     """値を暗号化する
 
@@ -61,18 +74,18 @@ def encrypt_value(value: Union[str, Dict[str, Any], list, int, float, bool, None
 
         # 暗号化
         try:
-            f = Fernet(_get_encryption_key())
+            f = _get_fernet()
             encrypted = f.encrypt(value_str.encode())
 
             # Base64エンコード
             return base64.urlsafe_b64encode(encrypted).decode()
         except Exception as e:
-            logger.error(f"値の暗号化に失敗しました: {e}")
+            logger.error("値の暗号化に失敗しました: %s", e)
             # エラーが発生した場合は元の値をJSON文字列としてBase64エンコード
             logger.warning("暗号化に失敗したため、Base64エンコードのみを適用します")
             return base64.urlsafe_b64encode(value_str.encode()).decode()
     except Exception as e:
-        logger.error(f"値のJSON変換に失敗しました: {e}")
+        logger.error("値のJSON変換に失敗しました: %s", e)
         return None
 
 
@@ -94,23 +107,23 @@ def decrypt_value(encrypted_value: str) -> Any:
 
         try:
             # 復号化
-            f = Fernet(_get_encryption_key())
+            f = _get_fernet()
             decrypted = f.decrypt(encrypted)
 
             # JSON形式から変換
             return json.loads(decrypted.decode())
         except Exception as e:
-            logger.error(f"値の復号化に失敗しました: {e}")
+            logger.error("値の復号化に失敗しました: %s", e)
             # 復号化に失敗した場合は、Base64デコードした値をそのまま返す
             try:
                 # Base64デコードした値をJSON形式から変換
                 return json.loads(encrypted.decode())
             except Exception as e2:
-                logger.error(f"Base64デコード後のJSON変換に失敗しました: {e2}")
+                logger.error("Base64デコード後のJSON変換に失敗しました: %s", e2)
                 # それも失敗した場合は元の値をそのまま返す
                 return encrypted_value
     except Exception as e:
-        logger.error(f"Base64デコードに失敗しました: {e}")
+        logger.error("Base64デコードに失敗しました: %s", e)
         return encrypted_value
 
 
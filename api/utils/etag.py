@@ -0,0 +1,54 @@
+"""
+ETagユーティリティモジュール
+
+このモジュールは、シリアライズ済みのJSONレスポンスにETagを付与し、
+条件付きリクエストに304 Not Modifiedで応答するユーティリティ関数を提供します。
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+# 一覧レスポンスをクライアント側でキャッシュしてよい秒数
+LIST_CACHE_MAX_AGE = 5
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Matchヘッダーが指定のETagに一致するかどうかを判定する
+
+    Args:
+        if_none_match (str): If-None-Matchヘッダーの値
+        etag (str): 比較するETag
+
+    Returns:
+        bool: 一致する場合はTrue
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def etag_json_response(request: Request, body: bytes, max_age: int = LIST_CACHE_MAX_AGE) -> Response:
+    """ETag付きのJSONレスポンスを生成する
+
+    ETagはレスポンスボディのハッシュから生成するため、内容が変わらない限り同じ値になります。
+    リクエストのIf-None-Matchが一致する場合はボディを含まない304レスポンスを返します。
+
+    Args:
+        request (Request): リクエスト
+        body (bytes): シリアライズ済みのJSONボディ
+        max_age (int, optional): Cache-Controlのmax-age（秒）。デフォルトはLIST_CACHE_MAX_AGE
+
+    Returns:
+        Response: JSONレスポンス、または304レスポンス
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
@@ -4,8 +4,10 @@ Goose設定ファイル操作ユーティリティ
 このモジュールは、Gooseの設定ファイルを読み取るための機能を提供します。
 """
 
+import copy
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -13,6 +15,10 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+# libyamlが利用可能な場合はC実装のローダー・ダンパーを使う（利用できない場合は純Python実装）
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def get_goose_config_path() -> Path:
     """Goose の設定ファイルのパスを取得する
@@ -32,23 +38,46 @@ def get_goose_config_path() -> Path:
     return config_dir / "config.yaml"
 
 
+@lru_cache(maxsize=1)
+def _load_goose_config(config_path: Path, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Goose の設定ファイルを解析する
+
+    更新日時とサイズをキャッシュのキーに含めるため、ファイルが変更されると読み直します。
+
+    Args:
+        config_path (Path): 設定ファイルのパス
+        mtime_ns (int): ファイルの更新日時（ナノ秒）
+        size (int): ファイルのサイズ
+
+    Returns:
+        Dict[str, Any]: 設定内容
+    """
+    with open(config_path, "r") as f:
+        config: Dict[str, Any] = yaml.load(f, Loader=_YamlLoader) or {}
+    return config
+
+
 def read_goose_config() -> Dict[str, Any]:
     """Goose の設定ファイルを読み取る
 
+    ファイルの読み取りを伴うため、非同期処理からはasyncio.to_threadで呼び出します。
+
     Returns:
         Dict[str, Any]: 設定内容
     """
     config_path = get_goose_config_path()
     if not config_path.exists():
-        logger.warning(f"Goose設定ファイルが見つかりません: {config_path}")
+        logger.warning("Goose設定ファイルが見つかりません: %s", config_path)
         return {}
 
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f) or {}
-        return config
+        # 更新日時とサイズが変わっていなければ、前回解析した内容を使う
+        stat = config_path.stat()
+        config = _load_goose_config(config_path, stat.st_mtime_ns, stat.st_size)
+        # 呼び出し元が書き換えてもキャッシュに影響しないようにコピーを返す
+        return copy.deepcopy(config)
     except Exception as e:
-        logger.error(f"Goose設定ファイルの読み取りに失敗しました: {e}")
+        logger.error("Goose設定ファイルの読み取りに失敗しました: %s", e)
         return {}
 
 
@@ -61,3 +90,21 @@ def read_goose_extensions() -> Dict[str, Any]:
     config = read_goose_config()
     extensions: Dict[str, Any] = config.get("extensions", {})
     return extensions
+
+
+def write_goose_config(config_path: Path, config: Dict[str, Any]) -> None:
+    """Goose の設定ファイルを書き込む
+
+    ファイルの書き込みを伴うため、非同期処理からはasyncio.to_threadで呼び出します。
+
+    Args:
+        config_path (Path): 設定ファイルのパス
+        config (Dict[str, Any]): 設定内容
+    """
+    os.makedirs(config_path.parent, exist_ok=True)
+    try:
+        with open(config_path, "w") as f:
+            yaml.dump(config, f, Dumper=_YamlDumper)
+    finally:
+        # 更新日時の分解能内に書き換えた場合でも、古い内容を返さないようにする
+        _load_goose_config.cache_clear()
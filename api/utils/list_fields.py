@@ -0,0 +1,59 @@
+"""
+一覧取得フィールドユーティリティモジュール
+
+このモジュールは、一覧取得エンドポイントで返却する列を絞り込むためのユーティリティ関数を提供します。
+"""
+
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+
+# fields指定時の一覧レスポンスのシリアライザ
+FIELD_DICT_LIST_ADAPTER = TypeAdapter(List[Dict[str, Any]])
+
+
+def parse_fields(fields: Optional[str], allowed: Collection[str]) -> Optional[List[str]]:
+    """`?fields=` クエリパラメータを列名のリストに変換する
+
+    Args:
+        fields (Optional[str]): カンマ区切りの列名。指定がない場合はNone
+        allowed (Collection[str]): 指定可能な列名
+
+    Returns:
+        Optional[List[str]]: 列名のリスト（idは常に先頭に含む）。指定がない場合はNone
+
+    Raises:
+        HTTPException: 指定できない列名が含まれている場合
+    """
+    if not fields:
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    invalid = [name for name in names if name not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"指定できないフィールドです: {', '.join(invalid)}",
+        )
+
+    # idは常に返却し、重複は順序を保ったまま取り除く
+    return list(dict.fromkeys(["id", *names]))
+
+
+def to_field_dict(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """モデルインスタンスまたは行から指定された列のみの辞書を作成する
+
+    Args:
+        obj (Any): モデルインスタンスまたは行
+        fields (Sequence[str]): 列名
+
+    Returns:
+        Dict[str, Any]: 列名と値の辞書（日時はISO形式の文字列）
+    """
+    result = {}
+    for name in fields:
+        value = getattr(obj, name)
+        result[name] = value.isoformat() if isinstance(value, datetime) else value
+    return result
@@ -0,0 +1,31 @@
+"""
+ページングユーティリティモジュール
+
+このモジュールは、一覧取得でOFFSETの代わりにカーソル（前のページの最後の行）から続きを取得する
+キーセットページングの条件を組み立てるユーティリティ関数を提供します。
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, or_, select
+
+
+def after_row_condition(model: Any, after_id: Any) -> ColumnElement[bool]:
+    """(created_at DESC, id DESC) の並び順でカーソル行より後の行を表す条件を作成する
+
+    カーソル行のcreated_atは主キーで引くスカラーサブクエリで参照するため、
+    値の保存形式（マイクロ秒の有無など）に依存せずデータベース上の値同士で比較されます。
+    カーソル行が削除されている場合は条件に一致する行はありません。
+
+    Args:
+        model (Any): created_atとid列を持つモデルクラス
+        after_id (Any): カーソル行のID（値またはバインドパラメータ）
+
+    Returns:
+        ColumnElement[bool]: WHERE句に指定する条件
+    """
+    cursor_created_at = select(model.created_at).where(model.id == after_id).scalar_subquery()
+    return or_(
+        model.created_at < cursor_created_at,
+        and_(model.created_at == cursor_created_at, model.id < after_id),
+    )
@@ -0,0 +1,21 @@
+"""
+パラメータ定義ユーティリティモジュール
+
+このモジュールは、複数のエンドポイントで共通して使用するパス・クエリパラメータの型定義を提供します。
+"""
+
+from typing import Annotated, Optional
+
+from fastapi import Path, Query
+
+# リソースIDのパスパラメータ（1以上）
+IdPath = Annotated[int, Path(ge=1)]
+
+# 一覧取得の取得件数（1～100）
+LimitQuery = Annotated[int, Query(ge=1, le=100)]
+
+# 一覧取得のオフセット（0以上）
+OffsetQuery = Annotated[int, Query(ge=0)]
+
+# 一覧取得のカーソル（前のページの最後の行のID。指定した行より後の行を返す）
+AfterIdQuery = Annotated[Optional[int], Query(ge=1, description="前のページの最後の行のID")]
@@ -0,0 +1,86 @@
+"""
+リクエストボディユーティリティモジュール
+
+このモジュールは、サイズ上限付きでリクエストボディを読み込むユーティリティ関数と、
+リクエストボディを直接モデルとして検証する依存関係を提供します。
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Type, TypeVar
+
+import orjson
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+async def read_json_body(request: Request, max_bytes: int) -> Any:
+    """サイズ上限付きでリクエストボディを読み込み、JSONとして解析する
+
+    Content-Lengthが上限を超える場合は読み込み前に、ストリーム読み込み中に上限を超えた場合はその時点で拒否します。
+
+    Args:
+        request (Request): リクエスト
+        max_bytes (int): 許容する最大バイト数
+
+    Returns:
+        Any: 解析されたJSON
+
+    Raises:
+        HTTPException: ボディが上限を超える場合（413）、またはJSONとして不正な場合（400）
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="リクエストボディが大きすぎます"
+        )
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="リクエストボディが大きすぎます"
+            )
+
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="リクエストボディが不正なJSONです")
+
+
+def json_body(model: Type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """リクエストボディをモデルとして検証する依存関係を生成する
+
+    ボディのJSONは model_validate_json で解析と検証を一度に行い、中間の辞書を生成しません。
+    検証エラーはFastAPI標準と同じ形式の422レスポンスになります。
+
+    Args:
+        model (Type[ModelT]): ボディのモデル
+
+    Returns:
+        Callable[[Request], Awaitable[ModelT]]: 検証済みのモデルを返す依存関係
+    """
+
+    async def dependency(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+    return dependency
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """json_body を使うエンドポイントのOpenAPIリクエストボディ定義を生成する
+
+    Args:
+        model (Type[BaseModel]): ボディのモデル
+
+    Returns:
+        Dict[str, Any]: openapi_extra に渡す定義
+    """
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
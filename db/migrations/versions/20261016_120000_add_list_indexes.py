@@ -0,0 +1,39 @@
+"""add_list_indexes
+
+Revision ID: 3f9c1a7d2b84
+Revises: 6b2dc43060f0
+Create Date: 2026-10-16 12:00:00.000000+09:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f9c1a7d2b84"
+down_revision = "6b2dc43060f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_actions_type_enabled_created", ["action_type", "is_enabled", "created_at"], unique=False
+        )
+        batch_op.drop_index("ix_actions_action_type")
+
+    with op.batch_alter_table("task_executions", schema=None) as batch_op:
+        batch_op.create_index("ix_task_executions_status_created", ["status", "created_at"], unique=False)
+        batch_op.create_index("ix_task_executions_template_created", ["template_id", "created_at"], unique=False)
+        batch_op.drop_index("ix_task_executions_status")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("task_executions", schema=None) as batch_op:
+        batch_op.create_index("ix_task_executions_status", ["status"], unique=False)
+        batch_op.drop_index("ix_task_executions_template_created")
+        batch_op.drop_index("ix_task_executions_status_created")
+
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.create_index("ix_actions_action_type", ["action_type"], unique=False)
+        batch_op.drop_index("ix_actions_type_enabled_created")
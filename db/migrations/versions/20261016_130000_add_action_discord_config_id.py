@@ -0,0 +1,53 @@
+"""add_action_discord_config_id
+
+Revision ID: 8d41e2b6c5a3
+Revises: 3f9c1a7d2b84
+Create Date: 2026-10-16 13:00:00.000000+09:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d41e2b6c5a3"
+down_revision = "3f9c1a7d2b84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("discord_config_id", sa.Integer(), nullable=True))
+        batch_op.create_index("ix_actions_discord_config_id", ["discord_config_id"], unique=False)
+        # Discord設定が削除された場合は関連付けを解除する
+        batch_op.create_foreign_key(
+            "fk_actions_discord_config_id_config_discord",
+            "config_discord",
+            ["discord_config_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+    # 既存のaction_configからDiscord設定IDを移行（同一アクションに複数ある場合は最新のものを採用）
+    op.execute(
+        """
+        UPDATE actions
+        SET discord_config_id = (
+            SELECT action_config.config_id
+            FROM action_config
+            JOIN config_discord ON config_discord.id = action_config.config_id
+            WHERE action_config.action_id = actions.id
+              AND action_config.config_type = 'discord'
+            ORDER BY action_config.id DESC
+            LIMIT 1
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_actions_discord_config_id_config_discord", type_="foreignkey")
+        batch_op.drop_index("ix_actions_discord_config_id")
+        batch_op.drop_column("discord_config_id")
@@ -0,0 +1,85 @@
+"""native_enums_and_config_indexes
+
+Revision ID: c72f05a9e1d6
+Revises: 8d41e2b6c5a3
+Create Date: 2026-10-16 14:00:00.000000+09:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c72f05a9e1d6"
+down_revision = "8d41e2b6c5a3"
+branch_labels = None
+depends_on = None
+
+# (テーブル名, 列名, ENUM型, 変更前の型)
+ENUM_COLUMNS = [
+    ("action_config", "config_type", sa.Enum("discord", "slack", name="config_type"), sa.VARCHAR(length=7)),
+    (
+        "config_discord",
+        "catch_type",
+        sa.Enum("reaction", "text", "textWithMention", name="discord_catch_type"),
+        sa.VARCHAR(length=15),
+    ),
+    (
+        "config_discord",
+        "message_type",
+        sa.Enum("single", "thread", "range", name="discord_message_type"),
+        sa.VARCHAR(length=6),
+    ),
+    (
+        "config_discord",
+        "response_format",
+        sa.Enum("reply", "dm", "channel", name="discord_response_format"),
+        sa.VARCHAR(length=7),
+    ),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # PostgreSQLではENUM型を作成してから列の型を変更する（SQLiteでは何もしない）
+    for _, _, enum_type, _ in ENUM_COLUMNS:
+        enum_type.create(bind, checkfirst=True)
+
+    for table_name, column_name, enum_type, varchar_type in ENUM_COLUMNS:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                existing_type=varchar_type,
+                type_=enum_type,
+                existing_nullable=False,
+                postgresql_using=f"{column_name}::{enum_type.name}",
+            )
+
+    with op.batch_alter_table("action_config", schema=None) as batch_op:
+        batch_op.create_index("ix_action_config_type_config", ["config_type", "config_id"], unique=False)
+
+    with op.batch_alter_table("config_discord", schema=None) as batch_op:
+        batch_op.create_index("ix_config_discord_catch", ["catch_type", "catch_value"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("config_discord", schema=None) as batch_op:
+        batch_op.drop_index("ix_config_discord_catch")
+
+    with op.batch_alter_table("action_config", schema=None) as batch_op:
+        batch_op.drop_index("ix_action_config_type_config")
+
+    for table_name, column_name, enum_type, varchar_type in ENUM_COLUMNS:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column(
+                column_name,
+                existing_type=enum_type,
+                type_=varchar_type,
+                existing_nullable=False,
+                postgresql_using=f"{column_name}::text",
+            )
+
+    bind = op.get_bind()
+    for _, _, enum_type, _ in ENUM_COLUMNS:
+        enum_type.drop(bind, checkfirst=True)
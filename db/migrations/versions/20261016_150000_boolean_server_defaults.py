@@ -0,0 +1,37 @@
+"""boolean_server_defaults
+
+Revision ID: 5e8b3d9f4a17
+Revises: c72f05a9e1d6
+Create Date: 2026-10-16 15:00:00.000000+09:00
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e8b3d9f4a17"
+down_revision = "c72f05a9e1d6"
+branch_labels = None
+depends_on = None
+
+# (テーブル名, 列名, サーバー側デフォルト)
+BOOLEAN_COLUMNS = [
+    ("actions", "is_enabled", sa.true()),
+    ("extensions", "enabled", sa.true()),
+    ("settings", "is_secret", sa.false()),
+    ("users", "is_active", sa.true()),
+    ("users", "is_admin", sa.false()),
+]
+
+
+def upgrade() -> None:
+    for table_name, column_name, server_default in BOOLEAN_COLUMNS:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column(column_name, existing_type=sa.Boolean(), server_default=server_default)
+
+
+def downgrade() -> None:
+    for table_name, column_name, _ in BOOLEAN_COLUMNS:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column(column_name, existing_type=sa.Boolean(), server_default=None)
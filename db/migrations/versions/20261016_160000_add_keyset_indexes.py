@@ -0,0 +1,31 @@
+"""add_keyset_indexes
+
+Revision ID: 9a4c7e2f1b63
+Revises: 5e8b3d9f4a17
+Create Date: 2026-10-16 16:00:00.000000+09:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4c7e2f1b63"
+down_revision = "5e8b3d9f4a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.create_index("ix_actions_created_id", ["created_at", "id"], unique=False)
+
+    with op.batch_alter_table("config_discord", schema=None) as batch_op:
+        batch_op.create_index("ix_config_discord_created_id", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("config_discord", schema=None) as batch_op:
+        batch_op.drop_index("ix_config_discord_created_id")
+
+    with op.batch_alter_table("actions", schema=None) as batch_op:
+        batch_op.drop_index("ix_actions_created_id")
@@ -0,0 +1,31 @@
+"""covering_action_config_indexes
+
+Revision ID: 3d7f1a9c5e28
+Revises: 9a4c7e2f1b63
+Create Date: 2026-10-16 17:00:00.000000+09:00
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3d7f1a9c5e28"
+down_revision = "9a4c7e2f1b63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("action_config", schema=None) as batch_op:
+        batch_op.drop_index("ix_action_config_type_config")
+        batch_op.create_index(
+            "ix_action_config_type_config_action", ["config_type", "config_id", "action_id"], unique=False
+        )
+        batch_op.create_index("ix_action_config_action_id", ["action_id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("action_config", schema=None) as batch_op:
+        batch_op.drop_index("ix_action_config_action_id")
+        batch_op.drop_index("ix_action_config_type_config_action")
+        batch_op.create_index("ix_action_config_type_config", ["config_type", "config_id"], unique=False)
@@ -5,13 +5,13 @@ Discord Botモジュール
 Discord.pyを使用してBotを実装し、メッセージやリアクションのイベントを処理します。
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, Optional
 
 import discord
 from discord.ext import commands
 
-from api.services.action_config_service import ActionConfigService
 from api.services.discord_config_service import DiscordConfigService
 from api.services.task_service import TaskService
 
@@ -42,7 +42,7 @@ class DiscordBotService:
         @self.bot.event
         async def on_ready():
             """Botが準備完了したときのイベントハンドラ"""
-            self.logger.info(f"{self.bot.user} としてログインしました")
+            self.logger.info("%s としてログインしました", self.bot.user)
 
         @self.bot.event
         async def on_reaction_add(reaction, user):
@@ -60,22 +60,21 @@ class DiscordBotService:
             emoji = str(reaction.emoji)
             message = reaction.message
 
-            # Discord設定サービスからリアクションに対応する設定を取得
+            # リアクションに対応する設定・アクション・タスクテンプレートを1回のクエリで取得
             discord_config_service = DiscordConfigService()
-            discord_config = await discord_config_service.get_discord_config_by_reaction(emoji)
-
-            if discord_config:
-                # 関連するアクションを取得
-                action_config_service = ActionConfigService()
-                action = await action_config_service.get_action_by_config("discord", discord_config["id"])
-                if action:
-                    await self._handle_discord_action(message, user, discord_config, action)
+            target = await discord_config_service.resolve_reaction(emoji)
+
+            if target:
+                if target.action:
+                    await self._handle_discord_action(
+                        message, user, target.discord_config, target.action, target.task_template
+                    )
                 else:
-                    self.logger.info(f"リアクション {emoji} に対応するアクションが見つかりません")
+                    self.logger.info("リアクション %s に対応するアクションが見つかりません", emoji)
             else:
-                self.logger.info(f"リアクション {emoji} に対応するDiscord設定が見つかりません")
+                self.logger.info("リアクション %s に対応するDiscord設定が見つかりません", emoji)
 
-    async def _handle_discord_action(self, message, user, discord_config, action):
+    async def _handle_discord_action(self, message, user, discord_config, action, task_template):
         """Discord設定に基づいてメッセージを処理
 
         Args:
@@ -83,13 +82,14 @@ class DiscordBotService:
             user: リクエストしたユーザー
             discord_config: Discord設定
             action: 関連するアクション
+            task_template: 関連するタスクテンプレート（存在しない場合はNone）
         """
         try:
-            # 処理中のメッセージをユーザーに通知
-            processing_msg = await message.channel.send(f"{user.mention} メッセージを処理しています...")
-
-            # メッセージ収集戦略を決定
-            messages = await self._collect_messages(message, discord_config["message_type"])
+            # 処理中のメッセージの通知と、メッセージ収集戦略に基づくメッセージの収集は互いに独立しているため並行して行う
+            processing_msg, messages = await asyncio.gather(
+                message.channel.send(f"{user.mention} メッセージを処理しています..."),
+                self._collect_messages(message, discord_config["message_type"]),
+            )
 
             # Gooseへのコンテキスト準備
             context = {
@@ -106,24 +106,24 @@ class DiscordBotService:
                 "user_mention": user.mention,  # ユーザーメンションを追加
             }
 
-            # 関連するタスクテンプレートを取得
-            task_service = TaskService()
-            task = await task_service.get_task_template(action["task_template_id"])
-            if not task:
+            # 関連するタスクテンプレートはリアクションの解決時に取得済み
+            if not task_template:
                 await processing_msg.edit(content=f"{user.mention} 関連するタスクテンプレートが見つかりません。")
                 return
 
+            task_service = TaskService()
+
             # タスク実行を作成
             task_execution = await task_service.create_task_execution(
                 task_template_id=action["task_template_id"], context=context
             )
 
             # Gooseにリクエスト
-            result = await self.goose_executor.execute(task["prompt"], context=context)
+            result = await self.goose_executor.execute(task_template["prompt"], context=context)
 
             if not result["success"]:
                 await processing_msg.edit(content=f"{user.mention} 処理中にエラーが発生しました。")
-                self.logger.error(f"処理エラー: {result['output']}")
+                self.logger.error("処理エラー: %s", result["output"])
                 return
 
             # 結果をTaskExecutionに保存するのみ（Discord送信はMCPを通じて行う）
@@ -135,7 +135,7 @@ class DiscordBotService:
             # MCPを通じてGooseエージェントが送信する
 
         except Exception as e:
-            self.logger.error(f"Discord処理エラー: {str(e)}")
+            self.logger.error("Discord処理エラー: %s", e)
             await message.channel.send(f"{user.mention} 処理中にエラーが発生しました。")
 
     async def _collect_messages(self, message, message_type):
@@ -199,7 +199,7 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # 返信対象のメッセージがある場合
@@ -209,14 +209,14 @@ class DiscordBotService:
                     reference_message = await channel.fetch_message(int(reference_message_id))
                     reference = reference_message.to_reference()
                 except Exception as e:
-                    self.logger.warning(f"参照メッセージの取得に失敗: {str(e)}")
+                    self.logger.warning("参照メッセージの取得に失敗: %s", e)
 
             # メッセージ送信
             message = await channel.send(content=content, reference=reference)
 
             return {"success": True, "message_id": str(message.id), "channel_id": str(channel.id)}
         except Exception as e:
-            self.logger.error(f"メッセージ送信エラー: {str(e)}")
+            self.logger.error("メッセージ送信エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def edit_message(self, channel_id: str, message_id: str, content: str) -> Dict[str, Any]:
@@ -234,14 +234,14 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # メッセージを取得
             try:
                 message = await channel.fetch_message(int(message_id))
             except Exception as e:
-                self.logger.error(f"メッセージが見つかりません: {message_id}, エラー: {str(e)}")
+                self.logger.error("メッセージが見つかりません: %s, エラー: %s", message_id, e)
                 return {"success": False, "error": f"メッセージが見つかりません: {message_id}"}
 
             # メッセージを編集
@@ -249,7 +249,7 @@ class DiscordBotService:
 
             return {"success": True, "message_id": message_id, "channel_id": channel_id}
         except Exception as e:
-            self.logger.error(f"メッセージ編集エラー: {str(e)}")
+            self.logger.error("メッセージ編集エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def delete_message(self, channel_id: str, message_id: str) -> Dict[str, Any]:
@@ -266,14 +266,14 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # メッセージを取得
             try:
                 message = await channel.fetch_message(int(message_id))
             except Exception as e:
-                self.logger.error(f"メッセージが見つかりません: {message_id}, エラー: {str(e)}")
+                self.logger.error("メッセージが見つかりません: %s, エラー: %s", message_id, e)
                 return {"success": False, "error": f"メッセージが見つかりません: {message_id}"}
 
             # メッセージを削除
@@ -281,7 +281,7 @@ class DiscordBotService:
 
             return {"success": True, "message_id": message_id, "channel_id": channel_id}
         except Exception as e:
-            self.logger.error(f"メッセージ削除エラー: {str(e)}")
+            self.logger.error("メッセージ削除エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def start(self):
@@ -302,7 +302,7 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # メッセージを取得
@@ -310,10 +310,10 @@ class DiscordBotService:
                 message = await channel.fetch_message(int(message_id))
                 return {"success": True, "message": self._message_to_dict(message), "channel_id": str(channel.id)}
             except Exception as e:
-                self.logger.error(f"メッセージが見つかりません: {message_id}, エラー: {str(e)}")
+                self.logger.error("メッセージが見つかりません: %s, エラー: %s", message_id, e)
                 return {"success": False, "error": f"メッセージが見つかりません: {message_id}"}
         except Exception as e:
-            self.logger.error(f"メッセージ取得エラー: {str(e)}")
+            self.logger.error("メッセージ取得エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def get_message_history(
@@ -333,7 +333,7 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # 基準となるメッセージを取得（指定されている場合）
@@ -342,7 +342,7 @@ class DiscordBotService:
                 try:
                     before = await channel.fetch_message(int(reference_message_id))
                 except Exception as e:
-                    self.logger.warning(f"参照メッセージの取得に失敗: {str(e)}")
+                    self.logger.warning("参照メッセージの取得に失敗: %s", e)
                     return {"success": False, "error": f"参照メッセージの取得に失敗: {str(e)}"}
 
             # メッセージ履歴を取得
@@ -352,7 +352,7 @@ class DiscordBotService:
 
             return {"success": True, "messages": messages, "channel_id": str(channel.id), "count": len(messages)}
         except Exception as e:
-            self.logger.error(f"メッセージ履歴取得エラー: {str(e)}")
+            self.logger.error("メッセージ履歴取得エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def search_messages(self, channel_id: str, query: str, limit: int = 25) -> Dict[str, Any]:
@@ -370,7 +370,7 @@ class DiscordBotService:
             # チャンネルを取得
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
-                self.logger.error(f"チャンネルが見つかりません: {channel_id}")
+                self.logger.error("チャンネルが見つかりません: %s", channel_id)
                 return {"success": False, "error": f"チャンネルが見つかりません: {channel_id}"}
 
             # メッセージを検索（discord.pyではネイティブの検索機能がないため、履歴を取得して検索）
@@ -389,7 +389,7 @@ class DiscordBotService:
                 "query": query,
             }
         except Exception as e:
-            self.logger.error(f"メッセージ検索エラー: {str(e)}")
+            self.logger.error("メッセージ検索エラー: %s", e)
             return {"success": False, "error": str(e)}
 
     async def close(self):
@@ -6,8 +6,10 @@
 
 import asyncio
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, ContextManager, Iterator
+from unittest.mock import MagicMock
 
 import pytest
 import pytest_asyncio
@@ -17,14 +19,19 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth.dependencies import invalidate_user_cache
 from api.auth.password import get_password_hash
-from api.database import Base, _get_db_context
+from api.database import Base, _get_db_context, dispose_engines
 from api.database import engine as test_engine
 from api.database import get_db
 from api.main import app
 
 # すべてのモデルを明示的にインポート
 from api.models import User
+from api.services.action_service import invalidate_action_cache
+from api.services.discord_config_service import invalidate_reaction_cache
+from api.services.extension_service import wait_for_pending_sync
+from api.services.setting_service import invalidate_setting_cache
 
 # プロジェクトルートディレクトリを取得
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
@@ -117,7 +124,7 @@ async def mocking_test_db():
 
     # テスト終了後にデータベースを削除
     print("🧹 Cleaning up test database...")
-    await test_engine.dispose()
+    await dispose_engines()
     # ファイルベースのDBファイルを削除
     if os.path.exists(db_file_path):
         os.remove(db_file_path)
@@ -197,6 +204,10 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             await clear_tables(session)
             await session.commit()
+            # 削除した行の検索結果がキャッシュに残らないようにする
+            invalidate_reaction_cache()
+            invalidate_action_cache()
+            invalidate_setting_cache()
         except Exception as e:
             print(f"テーブルクリア中にエラーが発生しました: {e}")
             await session.rollback()
@@ -206,6 +217,8 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
+            # 次のテストにバックグラウンドの同期が持ち越されないようにする
+            await wait_for_pending_sync()
             await session.close()
 
 
@@ -215,6 +228,7 @@ async def integration_db_session() -> AsyncGenerator[AsyncSession, None]:
     print("🔄 Setting up database for integration test...")
 
     # セッションの作成
+    invalidate_action_cache()
     async with _get_db_context() as session:
         # テーブルが作成されたことを確認
         async with test_engine.begin() as conn:
@@ -240,6 +254,8 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
     # 既存のオーバーライドをクリア
     app.dependency_overrides.clear()
+    # 前のテストで認証されたユーザーのキャッシュを破棄
+    invalidate_user_cache()
     # 新しいオーバーライドを設定
     app.dependency_overrides[get_db] = override_get_db
     print("  ✓ Dependency override set for get_db")
@@ -255,6 +271,26 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     print("✅ Dependency overrides cleared")
 
 
+@pytest.fixture
+def override_dependency() -> Callable[[Callable[..., Any]], ContextManager[MagicMock]]:
+    """依存関係をモックに差し替えるフィクスチャ
+
+    返されるコンテキストマネージャはモックのファクトリを返します。
+    ファクトリの return_value が依存関係の値としてエンドポイントに渡されます。
+    """
+
+    @contextmanager
+    def _override(dependency: Callable[..., Any]) -> Iterator[MagicMock]:
+        factory = MagicMock()
+        app.dependency_overrides[dependency] = lambda: factory.return_value
+        try:
+            yield factory
+        finally:
+            app.dependency_overrides.pop(dependency, None)
+
+    return _override
+
+
 @pytest_asyncio.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """テスト用ユーザーのフィクスチャ"""
@@ -264,7 +300,7 @@ async def test_user(db_session: AsyncSession) -> User:
     user = User(
         username="testuser",
         email="test@example.com",
-        hashed_password=get_password_hash("password"),
+        hashed_password=await get_password_hash("password"),
         is_active=True,
         is_admin=False,
     )
@@ -286,7 +322,7 @@ async def test_admin(db_session: AsyncSession) -> User:
     admin = User(
         username="admin",
         email="admin@example.com",
-        hashed_password=get_password_hash("adminpassword"),
+        hashed_password=await get_password_hash("adminpassword"),
         is_active=True,
         is_admin=True,
     )
@@ -8,6 +8,7 @@ import pytest
 
 from api.models.action import Action
 from api.models.action_config import ActionConfig
+from api.models.config_discord import ConfigDiscord
 from api.models.task_template import TaskTemplate
 from api.services.action_config_service import ActionConfigService
 
@@ -35,6 +36,12 @@ async def test_create_action_config(db_session):
     await db_session.commit()
     await db_session.refresh(action)
 
+    # テスト用のDiscord設定を作成
+    discord_config = ConfigDiscord(name="作成テスト用Discord設定", catch_value="👍")
+    db_session.add(discord_config)
+    await db_session.commit()
+    await db_session.refresh(discord_config)
+
     # アクション設定関連サービスのインスタンスを作成
     action_config_service = ActionConfigService()
 
@@ -42,16 +49,20 @@ async def test_create_action_config(db_session):
     result = await action_config_service.create_action_config(
         action_id=action.id,
         config_type="discord",
-        config_id=1,
+        config_id=discord_config.id,
     )
 
     # 結果を検証
     assert result["id"] is not None
     assert result["action_id"] == action.id
     assert result["config_type"] == "discord"
-    assert result["config_id"] == 1
+    assert result["config_id"] == discord_config.id
     assert "created_at" in result
 
+    # Discord設定IDがアクションにも保持されていることを検証
+    await db_session.refresh(action)
+    assert action.discord_config_id == discord_config.id
+
 
 @pytest.mark.asyncio
 async def test_get_action_by_config(db_session):
@@ -77,23 +88,26 @@ async def test_get_action_by_config(db_session):
     await db_session.commit()
     await db_session.refresh(action)
 
-    # テスト用のアクション設定関連を作成
-    action_config = ActionConfig(
-        action_id=action.id,
-        config_type="discord",
-        config_id=123,
-    )
-    db_session.add(action_config)
+    # テスト用のDiscord設定を作成
+    discord_config = ConfigDiscord(name="取得テスト用Discord設定", catch_value="🔍")
+    db_session.add(discord_config)
     await db_session.commit()
-    await db_session.refresh(action_config)
+    await db_session.refresh(discord_config)
 
     # アクション設定関連サービスのインスタンスを作成
     action_config_service = ActionConfigService()
 
+    # テスト用のアクション設定関連を作成
+    await action_config_service.create_action_config(
+        action_id=action.id,
+        config_type="discord",
+        config_id=discord_config.id,
+    )
+
     # 設定によるアクション取得
     result = await action_config_service.get_action_by_config(
         config_type="discord",
-        config_id=123,
+        config_id=discord_config.id,
     )
 
     # 結果を検証
@@ -138,23 +152,26 @@ async def test_get_action_by_config_disabled(db_session):
     await db_session.commit()
     await db_session.refresh(action)
 
-    # テスト用のアクション設定関連を作成
-    action_config = ActionConfig(
-        action_id=action.id,
-        config_type="discord",
-        config_id=456,
-    )
-    db_session.add(action_config)
+    # テスト用のDiscord設定を作成
+    discord_config = ConfigDiscord(name="無効化テスト用Discord設定", catch_value="🚫")
+    db_session.add(discord_config)
     await db_session.commit()
-    await db_session.refresh(action_config)
+    await db_session.refresh(discord_config)
 
     # アクション設定関連サービスのインスタンスを作成
     action_config_service = ActionConfigService()
 
+    # テスト用のアクション設定関連を作成
+    await action_config_service.create_action_config(
+        action_id=action.id,
+        config_type="discord",
+        config_id=discord_config.id,
+    )
+
     # 設定による無効化アクション取得
     result = await action_config_service.get_action_by_config(
         config_type="discord",
-        config_id=456,
+        config_id=discord_config.id,
     )
 
     # 結果を検証（無効化されたアクションは取得されない）
@@ -225,3 +242,28 @@ async def test_list_configs_by_action(db_session):
     assert len(slack_results) == 1
     assert slack_results[0]["config_type"] == "slack"
     assert slack_results[0]["config_id"] == 3
+
+
+@pytest.mark.asyncio
+async def test_create_action_config_rejects_second_discord_config(db_session):
+    """アクションを別のDiscord設定に関連付けられないことをテスト"""
+    action = Action(name="複数設定テスト用アクション", action_type="discord")
+    first = ConfigDiscord(name="複数設定テスト1", catch_value="1️⃣")
+    second = ConfigDiscord(name="複数設定テスト2", catch_value="2️⃣")
+    db_session.add_all([action, first, second])
+    await db_session.commit()
+
+    action_config_service = ActionConfigService()
+    await action_config_service.create_action_config(action.id, "discord", first.id)
+
+    with pytest.raises(ValueError):
+        await action_config_service.create_action_config(action.id, "discord", second.id)
+
+    # 最初のDiscord設定からは引き続きアクションを取得でき、関連付けは追加されていない
+    result = await action_config_service.get_action_by_config("discord", first.id)
+    assert result is not None and result["id"] == action.id
+    assert len(await action_config_service.list_configs_by_action(action.id)) == 1
+
+    # 存在しないアクションも拒否する
+    with pytest.raises(ValueError):
+        await action_config_service.create_action_config(9999, "discord", first.id)
@@ -98,3 +98,14 @@ async def test_action_disabled(db_session: AsyncSession):
 
     # 無効化されたことを検証
     assert action.is_enabled is False
+
+
+@pytest.mark.asyncio
+async def test_action_is_enabled_server_default(db_session: AsyncSession):
+    """is_enabledのデフォルト値がデータベース側で設定されることをテスト"""
+    action = Action(name="デフォルト値テスト", action_type="api")
+    db_session.add(action)
+    await db_session.commit()
+
+    # INSERT時に取得されるため、refreshせずに参照できる
+    assert action.is_enabled is True
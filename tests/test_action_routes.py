@@ -0,0 +1,133 @@
+"""
+アクションルートのテストモジュール
+
+このモジュールは、アクションに関連するAPIエンドポイントのテストを提供します。
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient
+
+from api.config import settings
+from api.services.action_service import get_action_service
+
+
+@pytest.mark.asyncio
+async def test_create_and_list_actions(client: AsyncClient, test_admin):
+    """アクション作成・一覧取得エンドポイントのテスト"""
+    # 管理者としてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "admin", "password": "adminpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # アクション作成リクエスト
+    response = await client.post(
+        "/api/v1/actions/", json={"name": "テストアクション", "action_type": "api"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    created = response.json()
+    assert created["name"] == "テストアクション"
+    assert created["action_type"] == "api"
+    assert "updated_at" not in created
+
+    # 未対応のアクションタイプは拒否される
+    response = await client.post(
+        "/api/v1/actions/", json={"name": "不正アクション", "action_type": "email"}, headers=headers
+    )
+    assert response.status_code == 422
+
+    # 一覧取得リクエスト
+    response = await client.get("/api/v1/actions/", params={"action_type": "api"}, headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [action["id"] for action in data] == [created["id"]]
+    assert data[0]["is_enabled"] is True
+    # 一覧で取得しない列や関連データはnullとして出力されない
+    assert "updated_at" not in data[0]
+    assert "discord_config" not in data[0]
+
+    response = await client.get(
+        "/api/v1/actions/", params={"action_type": "api", "include_discord_config": True}, headers=headers
+    )
+    assert response.json()[0]["discord_config"] is None
+
+    # 詳細取得リクエスト
+    response = await client.get(f"/api/v1/actions/{created['id']}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "テストアクション"
+
+    # 1未満のIDや範囲外の取得件数はデータベースに問い合わせず拒否される
+    response = await client.get("/api/v1/actions/0", headers=headers)
+    assert response.status_code == 422
+
+    response = await client.get("/api/v1/actions/", params={"limit": 0}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_actions_fields(client: AsyncClient, test_admin):
+    """一覧取得エンドポイントのfieldsパラメータのテスト"""
+    # 管理者としてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "admin", "password": "adminpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.post("/api/v1/actions/", json={"name": "フィールドテスト", "action_type": "api"}, headers=headers)
+
+    # 指定したフィールドとidのみが返却される
+    response = await client.get("/api/v1/actions/", params={"fields": "name,is_enabled"}, headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0].keys() == {"id", "name", "is_enabled"}
+    assert data[0]["name"] == "フィールドテスト"
+
+    # 存在しないフィールドを指定した場合はエラー
+    response = await client.get("/api/v1/actions/", params={"fields": "name,secret"}, headers=headers)
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_trigger_action_body(client: AsyncClient, override_dependency):
+    """トリガーエンドポイントのリクエストボディ読み込みのテスト"""
+    with override_dependency(get_action_service) as mock_service_class:
+        mock_service = AsyncMock()
+        mock_service.trigger_action.return_value = {"success": True}
+        mock_service_class.return_value = mock_service
+
+        # JSONオブジェクトはそのままサービスに渡される
+        response = await client.post("/api/v1/actions/1/trigger", json={"message": "テスト入力"})
+
+        assert response.status_code == 200
+        mock_service.trigger_action.assert_called_once_with(action_id=1, input_data={"message": "テスト入力"})
+
+        # 上限を超えるボディは拒否される
+        oversized = b'{"data": "' + b"x" * settings.TRIGGER_MAX_BODY_BYTES + b'"}'
+        response = await client.post(
+            "/api/v1/actions/1/trigger", content=oversized, headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 413
+
+        # 不正なJSON・オブジェクト以外のJSONは拒否される
+        response = await client.post(
+            "/api/v1/actions/1/trigger", content=b"{invalid", headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 400
+
+        response = await client.post("/api/v1/actions/1/trigger", json=["message"])
+        assert response.status_code == 422
+
+        assert mock_service.trigger_action.call_count == 1
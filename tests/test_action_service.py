@@ -4,13 +4,22 @@
 このモジュールは、アクションサービスの機能をテストします。
 """
 
-from unittest.mock import AsyncMock
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from sqlalchemy import event
 
+from api.database import engine, read_engine
 from api.models.action import Action
+from api.models.config_discord import ConfigDiscord
 from api.models.task_template import TaskTemplate
-from api.services.action_service import ActionService
+from api.services.action_service import (
+    ActionService,
+    _list_actions_stmt,
+    start_last_triggered_at_flusher,
+    stop_last_triggered_at_flusher,
+)
 
 
 @pytest.mark.asyncio
@@ -109,6 +118,104 @@ async def test_list_actions(db_session):
     assert len(disabled_results) >= 1
 
 
+@pytest.mark.asyncio
+async def test_list_actions_reuses_query_shape(db_session):
+    """同じフィルタの組み合わせでは一覧取得クエリが再利用されることをテスト"""
+    for i in range(3):
+        db_session.add(Action(name=f"クエリ再利用テスト{i+1}", action_type="slack"))
+    await db_session.commit()
+
+    action_service = ActionService()
+    _list_actions_stmt.cache_clear()
+
+    first_page = await action_service.list_actions(action_type="slack", is_enabled=True, limit=2, offset=0)
+    second_page = await action_service.list_actions(action_type="slack", is_enabled=True, limit=2, offset=2)
+
+    assert len(first_page) == 2
+    assert len(second_page) >= 1
+    assert {a["id"] for a in first_page}.isdisjoint(a["id"] for a in second_page)
+    assert all(a["action_type"] == "slack" for a in first_page + second_page)
+
+    cache_info = _list_actions_stmt.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_list_actions_after_id(db_session):
+    """カーソル（after_id）によるアクション一覧のページングをテスト"""
+    # 作成日時が同じ行と、マイクロ秒を含む古い作成日時の行を混在させる
+    db_session.add(
+        Action(name="カーソルテスト古い", action_type="cursor", created_at=datetime(2020, 1, 1, 0, 0, 0, 500000))
+    )
+    for i in range(4):
+        db_session.add(Action(name=f"カーソルテスト{i+1}", action_type="cursor"))
+    await db_session.commit()
+
+    action_service = ActionService()
+    expected = [a["id"] for a in await action_service.list_actions(action_type="cursor", limit=100)]
+    assert len(expected) == 5
+
+    # 最後の行のIDをカーソルにして全ページを取得する
+    paged = []
+    after_id = None
+    while True:
+        page = await action_service.list_actions(action_type="cursor", limit=2, after_id=after_id)
+        if not page:
+            break
+        paged.extend(a["id"] for a in page)
+        after_id = page[-1]["id"]
+
+    assert paged == expected
+
+
+@pytest.mark.asyncio
+async def test_list_actions_with_discord_config(db_session):
+    """Discord設定を含むアクション一覧取得機能をテスト"""
+    # テスト用のDiscord設定とアクションを作成
+    discord_config = ConfigDiscord(name="一覧用Discord設定", catch_value="📋")
+    db_session.add(discord_config)
+    await db_session.commit()
+    await db_session.refresh(discord_config)
+
+    for i in range(3):
+        db_session.add(
+            Action(
+                name=f"Discord一覧テスト{i+1}",
+                action_type="discord",
+                discord_config_id=discord_config.id if i < 2 else None,
+            )
+        )
+    await db_session.commit()
+
+    # アクションサービスのインスタンスを作成
+    action_service = ActionService()
+
+    # 実行されるSQLを記録
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        results = await action_service.list_actions(action_type="discord", include_discord_config=True)
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+    # アクションの取得とDiscord設定の取得の2回のクエリで完了する
+    assert len([statement for statement in statements if statement.lstrip().startswith("SELECT")]) == 2
+
+    linked = [result for result in results if result["discord_config_id"] == discord_config.id]
+    assert len(linked) == 2
+    for result in linked:
+        assert result["discord_config"]["id"] == discord_config.id
+        assert result["discord_config"]["catch_value"] == "📋"
+
+    unlinked = [result for result in results if result["discord_config_id"] is None]
+    assert unlinked and all(result["discord_config"] is None for result in unlinked)
+
+
 @pytest.mark.asyncio
 async def test_trigger_action(db_session):
     """アクショントリガー機能をテスト"""
@@ -158,7 +265,131 @@ async def test_trigger_action(db_session):
     call_args = mock_task_service.execute_task.call_args[1]
     assert call_args["template_id"] == task_template.id
     assert call_args["context"] == {"data": "テスト入力"}  # 入力データがそのままコンテキストとして使用される
+    assert call_args["prompt"] == task_template.prompt  # 取得済みのプロンプトが渡される
 
     # アクションの最終トリガー時刻が更新されたことを検証
     await db_session.refresh(action)
     assert action.last_triggered_at is not None
+
+
+@pytest.mark.asyncio
+async def test_trigger_action_batches_last_triggered_at(db_session):
+    """バックグラウンドタスクの実行中は最終トリガー時刻がまとめて書き込まれることをテスト"""
+    task_template = TaskTemplate(name="バッチテストテンプレート", task_type="test", prompt="テスト用プロンプト")
+    db_session.add(task_template)
+    await db_session.commit()
+
+    actions = [
+        Action(name=f"バッチテスト{i+1}", action_type="api", task_template_id=task_template.id) for i in range(2)
+    ]
+    db_session.add_all(actions)
+    await db_session.commit()
+
+    mock_task_service = AsyncMock()
+    mock_task_service.execute_task.return_value = {"success": True}
+    action_service = ActionService(task_service=mock_task_service)
+
+    start_last_triggered_at_flusher()
+    try:
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            for action in actions + actions:
+                await action_service.trigger_action(action_id=action.id, input_data={})
+
+            # トリガー時には書き込まない
+            assert statements == []
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        # 終了時に書き込み待ちの時刻が1回のUPDATE文で反映される
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await stop_last_triggered_at_flusher()
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        assert len(statements) == 1
+    finally:
+        await stop_last_triggered_at_flusher()
+
+    for action in actions:
+        await db_session.refresh(action)
+        assert action.last_triggered_at is not None
+
+
+@pytest.mark.asyncio
+async def test_trigger_action_caches_lookup(db_session):
+    """同じアクションの連続したトリガーではアクションを再取得しないことをテスト"""
+    task_template = TaskTemplate(name="キャッシュテストテンプレート", task_type="test", prompt="テスト用プロンプト")
+    db_session.add(task_template)
+    await db_session.commit()
+
+    mock_task_service = AsyncMock()
+    mock_task_service.execute_task.return_value = {"success": True}
+    action_service = ActionService(task_service=mock_task_service)
+
+    # 存在しないアクションの結果もキャッシュされる
+    result = await action_service.trigger_action(action_id=1, input_data={})
+    assert result["success"] is False
+
+    # アクションを作成するとキャッシュが無効化される
+    action = await action_service.create_action(
+        name="キャッシュテスト", action_type="api", task_template_id=task_template.id
+    )
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for _ in range(3):
+            result = await action_service.trigger_action(action_id=action["id"], input_data={})
+            assert result == {"success": True}
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert mock_task_service.execute_task.call_count == 3
+    assert mock_task_service.execute_task.call_args.kwargs["prompt"] == "テスト用プロンプト"
+
+
+@pytest.mark.asyncio
+async def test_trigger_missing_action_skips_session(db_session):
+    """存在しないアクションの再トリガーではデータベースセッションを開かないことをテスト"""
+    action_service = ActionService(task_service=AsyncMock())
+
+    result = await action_service.trigger_action(action_id=9999, input_data={})
+    assert result == {"success": False, "error": "アクションが見つかりません"}
+
+    with patch("api.services.action_service._get_db_context") as mock_get_db:
+        result = await action_service.trigger_action(action_id=9999, input_data={})
+
+    assert result == {"success": False, "error": "アクションが見つかりません"}
+    mock_get_db.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_action_single_statement(db_session):
+    """アクションの作成がINSERT文のみで既定値を返すことをテスト"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        result = await ActionService().create_action(name="既定値テスト", action_type="api")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert [statement.split()[0] for statement in statements] == ["INSERT"]
+    assert result["is_enabled"] is True
+    assert result["created_at"] is not None
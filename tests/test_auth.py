@@ -4,11 +4,29 @@
 このモジュールは、認証機能のテストを提供します。
 """
 
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
 import pytest
+from fastapi import HTTPException, Request
 from httpx import AsyncClient
+from jose import jwt
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.auth import (
+    create_access_token,
+    decode_token,
+    get_current_user,
+    get_optional_user,
+    get_password_hash,
+    invalidate_user_cache,
+    verify_password,
+)
+from api.auth.dependencies import _authenticate_token, oauth2_scheme, optional_oauth2_scheme
+from api.auth.jwt import clear_token_cache
+from api.config import settings
 from api.models import User
 
 pytestmark = pytest.mark.asyncio
@@ -51,7 +69,7 @@ async def test_register_user(client: AsyncClient, db_session: AsyncSession):
     # ユーザー登録リクエスト
     response = await client.post(
         "/api/v1/auth/register",
-        params={
+        json={
             "username": "newuser",
             "email": "new@example.com",
             "password": "newpassword",
@@ -71,12 +89,32 @@ async def test_register_user(client: AsyncClient, db_session: AsyncSession):
     assert count == 1
 
 
+async def test_register_first_user_is_admin(client: AsyncClient, db_session: AsyncSession):
+    """最初に登録したユーザーのみ管理者になることのテスト"""
+    first = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "firstuser", "email": "first@example.com", "password": "password"},
+    )
+    second = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "seconduser", "email": "second@example.com", "password": "password"},
+    )
+
+    assert first.status_code == 200
+    assert first.json()["is_admin"] is True
+    assert second.status_code == 200
+    assert second.json()["is_admin"] is False
+
+    result = await db_session.execute(text("SELECT is_active FROM users WHERE username = 'seconduser'"))
+    assert result.scalar() == 1
+
+
 async def test_register_duplicate_username(client: AsyncClient, test_user: User):
     """重複ユーザー名での登録のテスト"""
     # 既存のユーザー名で登録リクエスト
     response = await client.post(
         "/api/v1/auth/register",
-        params={
+        json={
             "username": "testuser",
             "email": "another@example.com",
             "password": "password",
@@ -87,3 +125,110 @@ async def test_register_duplicate_username(client: AsyncClient, test_user: User)
     assert response.status_code == 400
     data = response.json()
     assert "detail" in data
+
+
+async def test_decode_token_cache():
+    """トークンデコード結果のキャッシュのテスト"""
+    clear_token_cache()
+    token = create_access_token({"sub": "cacheuser", "user_id": 1, "is_admin": False})
+
+    with patch("api.auth.jwt.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = decode_token(token)
+        second = decode_token(token)
+
+    assert first.username == "cacheuser"
+    assert second is first
+    assert mock_decode.call_count == 1
+
+
+async def test_decode_token_invalid_not_cached():
+    """無効なトークンがキャッシュされないことのテスト"""
+    clear_token_cache()
+
+    with patch("api.auth.jwt.jwt.decode", wraps=jwt.decode) as mock_decode:
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                decode_token("invalid.token.value")
+
+    assert mock_decode.call_count == 2
+
+
+async def test_get_current_user_cache(db_session: AsyncSession, test_user: User):
+    """認証済みユーザーのキャッシュのテスト"""
+    invalidate_user_cache()
+    token = create_access_token({"sub": test_user.username, "user_id": test_user.id, "is_admin": False})
+
+    user = await _authenticate_token(token)
+    assert user.id == test_user.id
+
+    # 2回目はデータベースセッションを開かない
+    with patch("api.auth.dependencies._get_db_context") as mock_db_context:
+        cached_user = await _authenticate_token(token)
+    assert cached_user is user
+    mock_db_context.assert_not_called()
+
+    # キャッシュを無効化するとデータベースから再取得される
+    invalidate_user_cache()
+    reloaded_user = await _authenticate_token(token)
+    assert reloaded_user.id == test_user.id
+
+
+async def test_get_current_user_per_request(db_session: AsyncSession, test_user: User):
+    """同一リクエスト内で認証結果が再利用されることのテスト"""
+    token = create_access_token({"sub": test_user.username, "user_id": test_user.id, "is_admin": False})
+    request = Request({"type": "http", "headers": []})
+
+    user = await get_current_user(request, token)
+
+    # 同じリクエストではトークンの検証・キャッシュ参照を行わない
+    with patch("api.auth.dependencies._authenticate_token") as mock_authenticate:
+        assert await get_current_user(request, token) is user
+        assert await get_optional_user(request, token) is user
+        mock_authenticate.assert_not_called()
+
+
+async def test_password_hash_and_verify():
+    """パスワードのハッシュ化と検証のテスト"""
+    hashed = await get_password_hash("password")
+
+    assert hashed.startswith("$2b$")
+    assert await verify_password("password", hashed)
+    assert not await verify_password("wrongpassword", hashed)
+    assert not await verify_password("password", "invalid-hash")
+
+
+async def test_password_truncated_to_72_bytes():
+    """72バイトを超えるパスワードが切り詰められることのテスト"""
+    hashed = await get_password_hash("a" * 72)
+
+    assert await verify_password("a" * 72 + "extra", hashed)
+
+
+async def test_create_access_token_expiration():
+    """アクセストークンの有効期限のテスト"""
+    before = int(time.time())
+    token = create_access_token({"sub": "expuser"})
+    custom_token = create_access_token({"sub": "expuser"}, expires_delta=timedelta(minutes=5))
+
+    payload = jwt.get_unverified_claims(token)
+    custom_payload = jwt.get_unverified_claims(custom_token)
+
+    assert isinstance(payload["exp"], int)
+    assert (
+        before + settings.JWT_EXPIRATION_MINUTES * 60
+        <= payload["exp"]
+        <= int(time.time()) + settings.JWT_EXPIRATION_MINUTES * 60
+    )
+    assert before + 300 <= custom_payload["exp"] <= int(time.time()) + 300
+
+
+async def test_bearer_token_extractor():
+    """ベアラートークン抽出のテスト"""
+    request = Request({"type": "http", "headers": [(b"authorization", b"Bearer abc.def.ghi")]})
+    assert await oauth2_scheme(request) == "abc.def.ghi"
+
+    empty_request = Request({"type": "http", "headers": []})
+    assert await optional_oauth2_scheme(empty_request) is None
+    with pytest.raises(HTTPException) as exc_info:
+        await oauth2_scheme(empty_request)
+    assert exc_info.value.status_code == 401
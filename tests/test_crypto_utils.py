@@ -4,12 +4,10 @@
 このモジュールは、秘密情報の暗号化・復号化を行うユーティリティ関数をテストします。
 """
 
-from api.utils.crypto_utils import (
-    decrypt_value,
-    encrypt_value,
-    maybe_decrypt_value,
-    maybe_encrypt_value,
-)
+from unittest.mock import patch
+
+from api.utils import crypto_utils
+from api.utils.crypto_utils import decrypt_value, encrypt_value, maybe_decrypt_value, maybe_encrypt_value
 
 
 def test_encrypt_decrypt_string():
@@ -142,3 +140,17 @@ def test_encrypt_decrypt_complex_structure():
 
     # 復号化された値が元の値と一致することを確認
     assert decrypted_value == original_value
+
+
+def test_encryption_key_derived_once():
+    """暗号化キーの導出が初回のみ行われることをテスト"""
+    crypto_utils._get_fernet.cache_clear()
+    try:
+        with patch.object(crypto_utils, "_get_encryption_key", wraps=crypto_utils._get_encryption_key) as mock_key:
+            encrypted_value = encrypt_value("value")
+            assert decrypt_value(encrypted_value) == "value"
+            encrypt_value("another value")
+
+        assert mock_key.call_count == 1
+    finally:
+        crypto_utils._get_fernet.cache_clear()
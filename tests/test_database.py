@@ -0,0 +1,126 @@
+"""
+データベース接続のテストモジュール
+
+このモジュールは、データベースエンジンの設定のテストを提供します。
+"""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models import Setting
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_sqlite_pragmas(db_session: AsyncSession):
+    """SQLite接続にPRAGMAが設定されていることのテスト"""
+    journal_mode = (await db_session.execute(text("PRAGMA journal_mode"))).scalar()
+    synchronous = (await db_session.execute(text("PRAGMA synchronous"))).scalar()
+    cache_size = (await db_session.execute(text("PRAGMA cache_size"))).scalar()
+
+    assert journal_mode == "wal"
+    # NORMAL = 1
+    assert synchronous == 1
+    assert cache_size == -64000
+
+
+async def test_list_query_uses_composite_index(db_session: AsyncSession):
+    """一覧取得クエリが複合インデックスを利用することのテスト"""
+    result = await db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM actions WHERE action_type = 'api' AND is_enabled = 1 "
+            "ORDER BY created_at DESC LIMIT 10"
+        )
+    )
+    plan = " ".join(str(row[-1]) for row in result.fetchall())
+
+    assert "ix_actions_type_enabled_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_keyset_list_query_uses_index(db_session: AsyncSession):
+    """カーソルによる一覧取得クエリが(created_at, id)の複合インデックスを利用することのテスト"""
+    result = await db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM actions WHERE created_at < '2026-01-01' "
+            "OR (created_at = '2026-01-01' AND id < 10) ORDER BY created_at DESC, id DESC LIMIT 10"
+        )
+    )
+    plan = " ".join(str(row[-1]) for row in result.fetchall())
+
+    assert "ix_actions_created_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_discord_config_lookup_uses_composite_index(db_session: AsyncSession):
+    """リアクションによるDiscord設定の検索が複合インデックスを利用することのテスト"""
+    result = await db_session.execute(
+        text("EXPLAIN QUERY PLAN SELECT * FROM config_discord WHERE catch_type = 'reaction' AND catch_value = '👍'")
+    )
+    plan = " ".join(str(row[-1]) for row in result.fetchall())
+
+    assert "ix_config_discord_catch" in plan
+
+
+async def test_action_config_lookup_uses_covering_index(db_session: AsyncSession):
+    """設定からのアクション検索がテーブル本体を参照しないカバリングインデックスを利用することのテスト"""
+    result = await db_session.execute(
+        text("EXPLAIN QUERY PLAN SELECT action_id FROM action_config " "WHERE config_type = 'slack' AND config_id = 1")
+    )
+    plan = " ".join(str(row[-1]) for row in result.fetchall())
+
+    assert "COVERING INDEX ix_action_config_type_config_action" in plan
+
+
+async def test_json_column_roundtrip(db_session: AsyncSession):
+    """JSONカラムの値がorjsonで保存・復元されることのテスト"""
+    value = {"name": "テスト", "items": [1, 2.5, None, True], "nested": {"key": "値"}}
+    setting = Setting(key="json_roundtrip", value=value)
+    db_session.add(setting)
+    await db_session.commit()
+
+    raw = (await db_session.execute(text("SELECT value FROM settings WHERE key = 'json_roundtrip'"))).scalar()
+    assert "テスト" in raw
+
+    db_session.expire_all()
+    stored = (await db_session.execute(select(Setting).where(Setting.key == "json_roundtrip"))).scalars().one()
+    assert stored.value == value
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool():
+    """接続プールの事前確立が失敗せずに完了することをテスト"""
+    from api.database import engine, warm_up_pool
+
+    await warm_up_pool()
+
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+
+
+async def test_readonly_context_uses_read_engine(db_session: AsyncSession):
+    """読み取り専用のセッションが読み取り用のエンジンから取得されることのテスト"""
+    from api.database import _get_db_context, engine, read_engine
+
+    async with _get_db_context(readonly=True) as session:
+        assert session.bind is read_engine
+        assert (await session.execute(text("PRAGMA query_only"))).scalar() == 1
+
+    async with _get_db_context() as session:
+        assert session.bind is engine
+        assert (await session.execute(text("PRAGMA query_only"))).scalar() == 0
+
+
+async def test_readonly_context_rejects_writes(db_session: AsyncSession):
+    """読み取り専用のセッションでは書き込みが拒否されることのテスト"""
+    from api.database import _get_db_context
+
+    with pytest.raises(OperationalError):
+        async with _get_db_context(readonly=True) as session:
+            session.add(Setting(key="readonly_write", value="拒否"))
+            await session.flush()
+
+    result = await db_session.execute(select(Setting).where(Setting.key == "readonly_write"))
+    assert result.scalars().first() is None
@@ -5,11 +5,13 @@ Discord Bot機能のテストモジュール
 Discord.pyのクライアントとイベントハンドラをモックして、機能をテストします。
 """
 
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from api.services.discord_config_service import ReactionTarget
 from extensions.discord.bot import DiscordBotService
 from goose.executor import TaskExecutor
 
@@ -247,36 +249,27 @@ async def test_on_reaction_add_handler_pencil_reaction():
         message = MockMessage()
         reaction = MockReaction(emoji="✏️", message=message)
 
-        # DiscordConfigServiceとActionConfigServiceをモック
-        with (
-            patch("extensions.discord.bot.DiscordConfigService") as mock_discord_config_service,
-            patch("extensions.discord.bot.ActionConfigService") as mock_action_config_service,
-        ):
+        # DiscordConfigServiceをモック
+        with patch("extensions.discord.bot.DiscordConfigService") as mock_discord_config_service:
 
             # モックの戻り値を設定
+            target = ReactionTarget(
+                discord_config={"id": 1, "name": "テスト設定"},
+                action={"id": 1, "name": "テストアクション"},
+                task_template={"id": 1, "name": "テストテンプレート", "prompt": "テストプロンプト"},
+            )
             mock_discord_config_service_instance = AsyncMock()
             mock_discord_config_service.return_value = mock_discord_config_service_instance
-            mock_discord_config_service_instance.get_discord_config_by_reaction.return_value = {
-                "id": 1,
-                "name": "テスト設定",
-            }
-
-            mock_action_config_service_instance = AsyncMock()
-            mock_action_config_service.return_value = mock_action_config_service_instance
-            mock_action_config_service_instance.get_action_by_config.return_value = {
-                "id": 1,
-                "name": "テストアクション",
-            }
+            mock_discord_config_service_instance.resolve_reaction.return_value = target
 
             # イベントハンドラを実行
             await on_reaction_add_handler(reaction, user)
 
-            # 各メソッドが呼ばれることを検証
-            assert mock_discord_config_service_instance.get_discord_config_by_reaction.called
-            assert mock_discord_config_service_instance.get_discord_config_by_reaction.call_args[0][0] == "✏️"
-            assert mock_action_config_service_instance.get_action_by_config.called
-            assert mock_action_config_service_instance.get_action_by_config.call_args[0] == ("discord", 1)
-            assert service._handle_discord_action.called
+            # 設定・アクション・タスクテンプレートが1回の呼び出しで解決されることを検証
+            mock_discord_config_service_instance.resolve_reaction.assert_called_once_with("✏️")
+            service._handle_discord_action.assert_called_once_with(
+                message, user, target.discord_config, target.action, target.task_template
+            )
 
 
 @pytest.mark.asyncio
@@ -319,17 +312,62 @@ async def test_on_reaction_add_handler_non_pencil_reaction():
             # モックの戻り値を設定
             mock_discord_config_service_instance = AsyncMock()
             mock_discord_config_service.return_value = mock_discord_config_service_instance
-            mock_discord_config_service_instance.get_discord_config_by_reaction.return_value = None
+            mock_discord_config_service_instance.resolve_reaction.return_value = None
 
             # イベントハンドラを実行
             await on_reaction_add_handler(reaction, user)
 
             # 各メソッドが呼ばれることを検証
-            assert mock_discord_config_service_instance.get_discord_config_by_reaction.called
-            assert mock_discord_config_service_instance.get_discord_config_by_reaction.call_args[0][0] == "👍"
+            mock_discord_config_service_instance.resolve_reaction.assert_called_once_with("👍")
             assert not service._handle_discord_action.called
 
 
+@pytest.mark.asyncio
+async def test_handle_discord_action_overlaps_notice_and_collection():
+    """処理中の通知とメッセージの収集が並行して行われることをテスト"""
+    mock_executor = AsyncMock(spec=TaskExecutor)
+
+    with (
+        patch("discord.Intents.all"),
+        patch("discord.ext.commands.Bot"),
+    ):
+        service = DiscordBotService("test_token", mock_executor)
+
+    order = []
+    processing_msg = MagicMock()
+    processing_msg.edit = AsyncMock()
+
+    async def send(content):
+        order.append("send:start")
+        await asyncio.sleep(0)
+        order.append("send:end")
+        return processing_msg
+
+    async def collect(message, message_type):
+        order.append("collect:start")
+        await asyncio.sleep(0)
+        order.append("collect:end")
+        return [message]
+
+    message = MagicMock()
+    message.channel.send = send
+    service._collect_messages = collect
+    user = MagicMock()
+
+    discord_config = {
+        "message_type": "single",
+        "catch_type": "reaction",
+        "catch_value": "👍",
+        "response_format": "reply",
+    }
+    with patch.object(service, "_message_to_dict", return_value={}):
+        await service._handle_discord_action(message, user, discord_config, {"task_template_id": None}, None)
+
+    # どちらかの完了を待たずに両方が開始される
+    assert order.index("collect:start") < order.index("send:end")
+    processing_msg.edit.assert_called_once()
+
+
 @pytest.mark.skip("テスト実装が不完全なためスキップ")
 @pytest.mark.asyncio
 async def test_handle_discord_action_success():
@@ -4,17 +4,20 @@ Discord設定ルートのテストモジュール
 このモジュールは、Discord設定に関連するAPIエンドポイントのテストを提供します。
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import AsyncClient
 
+from api.services.action_config_service import get_action_config_service
+from api.services.discord_config_service import get_discord_config_service
+
 
 @pytest.mark.asyncio
-async def test_create_discord_config(client: AsyncClient, test_admin):
+async def test_create_discord_config(client: AsyncClient, test_admin, override_dependency):
     """Discord設定作成エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.create_discord_config.return_value = {
@@ -39,7 +42,7 @@ async def test_create_discord_config(client: AsyncClient, test_admin):
         # Discord設定作成リクエスト
         response = await client.post(
             "/api/v1/discord-configs/",
-            params={
+            json={
                 "name": "テスト設定",
                 "catch_type": "reaction",
                 "catch_value": "✅",
@@ -83,7 +86,7 @@ async def test_create_discord_config_unauthorized(client: AsyncClient, test_user
     # Discord設定作成リクエスト
     response = await client.post(
         "/api/v1/discord-configs/",
-        params={
+        json={
             "name": "テスト設定",
             "catch_type": "reaction",
             "catch_value": "✅",
@@ -96,21 +99,43 @@ async def test_create_discord_config_unauthorized(client: AsyncClient, test_user
 
 
 @pytest.mark.asyncio
-async def test_link_action_to_discord_config(client: AsyncClient, test_admin):
+async def test_discord_config_writes_unauthorized(client: AsyncClient, test_user, override_dependency):
+    """非管理者によるDiscord設定の更新系エンドポイントのテスト"""
+    with override_dependency(get_discord_config_service) as mock_service_class:
+        mock_service = AsyncMock()
+        mock_service_class.return_value = mock_service
+
+        # 通常ユーザーとしてログイン
+        login_response = await client.post(
+            "/api/v1/auth/token",
+            data={"username": "testuser", "password": "password"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        token = login_response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        responses = [
+            await client.post("/api/v1/discord-configs/1/link-action", params={"action_id": 2}, headers=headers),
+            await client.patch("/api/v1/discord-configs/1", json={"name": "更新"}, headers=headers),
+            await client.delete("/api/v1/discord-configs/1", headers=headers),
+        ]
+
+        # 検証（サービスは呼ばれない）
+        assert [response.status_code for response in responses] == [403, 403, 403]
+        assert mock_service.mock_calls == []
+
+
+@pytest.mark.asyncio
+async def test_link_action_to_discord_config(client: AsyncClient, test_admin, override_dependency):
     """Discord設定とアクションの関連付けエンドポイントのテスト"""
     # DiscordConfigServiceとActionConfigServiceのモック
     with (
-        patch("api.routes.discord_config.DiscordConfigService") as mock_discord_service_class,
-        patch("api.routes.discord_config.ActionConfigService") as mock_action_config_service_class,
+        override_dependency(get_discord_config_service) as mock_discord_service_class,
+        override_dependency(get_action_config_service) as mock_action_config_service_class,
     ):
         # モックの設定
         mock_discord_service = AsyncMock()
-        mock_discord_service.get_discord_config.return_value = {
-            "id": 1,
-            "name": "テスト設定",
-            "catch_type": "reaction",
-            "catch_value": "✅",
-        }
+        mock_discord_service.discord_config_exists.return_value = True
         mock_discord_service_class.return_value = mock_discord_service
 
         mock_action_config_service = AsyncMock()
@@ -146,8 +171,8 @@ async def test_link_action_to_discord_config(client: AsyncClient, test_admin):
         assert data["config_type"] == "discord"
         assert data["config_id"] == 1
 
-        # get_discord_configが正しく呼ばれたことを検証
-        mock_discord_service.get_discord_config.assert_called_once_with(1)
+        # discord_config_existsが正しく呼ばれたことを検証
+        mock_discord_service.discord_config_exists.assert_called_once_with(1)
 
         # create_action_configが正しく呼ばれたことを検証
         mock_action_config_service.create_action_config.assert_called_once_with(
@@ -158,10 +183,42 @@ async def test_link_action_to_discord_config(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_get_discord_config(client: AsyncClient, test_user):
+async def test_link_action_to_discord_config_conflict(client: AsyncClient, test_admin, override_dependency):
+    """別のDiscord設定に関連付け済みのアクションの関連付けが409になることをテスト"""
+    with (
+        override_dependency(get_discord_config_service) as mock_discord_service_class,
+        override_dependency(get_action_config_service) as mock_action_config_service_class,
+    ):
+        mock_discord_service = AsyncMock()
+        mock_discord_service.discord_config_exists.return_value = True
+        mock_discord_service_class.return_value = mock_discord_service
+
+        mock_action_config_service = AsyncMock()
+        mock_action_config_service.create_action_config.side_effect = ValueError("関連付け済み")
+        mock_action_config_service_class.return_value = mock_action_config_service
+
+        login_response = await client.post(
+            "/api/v1/auth/token",
+            data={"username": "admin", "password": "adminpassword"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        token = login_response.json()["access_token"]
+
+        response = await client.post(
+            "/api/v1/discord-configs/1/link-action",
+            params={"action_id": 2},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"] == "関連付け済み"
+
+
+@pytest.mark.asyncio
+async def test_get_discord_config(client: AsyncClient, test_user, override_dependency):
     """Discord設定取得エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.get_discord_config.return_value = {
@@ -202,10 +259,10 @@ async def test_get_discord_config(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_get_discord_config_not_found(client: AsyncClient, test_user):
+async def test_get_discord_config_not_found(client: AsyncClient, test_user, override_dependency):
     """存在しないDiscord設定取得エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.get_discord_config.return_value = None
@@ -233,10 +290,10 @@ async def test_get_discord_config_not_found(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_list_discord_configs(client: AsyncClient, test_user):
+async def test_list_discord_configs(client: AsyncClient, test_user, override_dependency):
     """Discord設定一覧取得エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.list_discord_configs.return_value = [
@@ -245,14 +302,20 @@ async def test_list_discord_configs(client: AsyncClient, test_user):
                 "name": "設定1",
                 "catch_type": "reaction",
                 "catch_value": "✅",
+                "message_type": "single",
+                "response_format": "reply",
                 "created_at": "2025-03-21T10:00:00+09:00",
+                "updated_at": None,
             },
             {
                 "id": 2,
                 "name": "設定2",
                 "catch_type": "text",
                 "catch_value": "!test",
+                "message_type": "thread",
+                "response_format": "channel",
                 "created_at": "2025-03-21T11:00:00+09:00",
+                "updated_at": None,
             },
         ]
         mock_service_class.return_value = mock_service
@@ -285,14 +348,15 @@ async def test_list_discord_configs(client: AsyncClient, test_user):
             catch_type=None,
             limit=10,
             offset=0,
+            after_id=None,
         )
 
 
 @pytest.mark.asyncio
-async def test_update_discord_config(client: AsyncClient, test_admin):
+async def test_update_discord_config(client: AsyncClient, test_admin, override_dependency):
     """Discord設定更新エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.update_discord_config.return_value = {
@@ -315,9 +379,9 @@ async def test_update_discord_config(client: AsyncClient, test_admin):
         token = login_response.json()["access_token"]
 
         # Discord設定更新リクエスト
-        response = await client.put(
+        response = await client.patch(
             "/api/v1/discord-configs/1",
-            params={
+            json={
                 "name": "更新後の設定",
                 "catch_type": "text",
                 "catch_value": "!updated",
@@ -349,10 +413,10 @@ async def test_update_discord_config(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_delete_discord_config(client: AsyncClient, test_admin):
+async def test_delete_discord_config(client: AsyncClient, test_admin, override_dependency):
     """Discord設定削除エンドポイントのテスト"""
     # DiscordConfigServiceのモック
-    with patch("api.routes.discord_config.DiscordConfigService") as mock_service_class:
+    with override_dependency(get_discord_config_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.delete_discord_config.return_value = True
@@ -380,3 +444,32 @@ async def test_delete_discord_config(client: AsyncClient, test_admin):
 
         # delete_discord_configが正しく呼ばれたことを検証
         mock_service.delete_discord_config.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_update_discord_config_partial(client: AsyncClient, test_admin, override_dependency):
+    """Discord設定の部分更新で指定した項目のみが渡されることをテスト"""
+    with override_dependency(get_discord_config_service) as mock_service_class:
+        mock_service = AsyncMock()
+        mock_service.update_discord_config.return_value = {"id": 1, "name": "名前のみ更新"}
+        mock_service_class.return_value = mock_service
+
+        # 管理者としてログイン
+        login_response = await client.post(
+            "/api/v1/auth/token",
+            data={"username": "admin", "password": "adminpassword"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        token = login_response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await client.patch("/api/v1/discord-configs/1", json={"name": "名前のみ更新"}, headers=headers)
+
+        # 検証
+        assert response.status_code == 200
+        mock_service.update_discord_config.assert_called_once_with(config_id=1, name="名前のみ更新")
+
+        # 必須項目が欠けた作成リクエストは422になる
+        response = await client.post("/api/v1/discord-configs/", json={"name": "不完全"}, headers=headers)
+        assert response.status_code == 422
+        mock_service.create_discord_config.assert_not_called()
@@ -5,9 +5,14 @@ Discord設定サービスのテスト
 """
 
 import pytest
+from sqlalchemy import event
 
+from api.database import engine, read_engine
+from api.models.action import Action
 from api.models.config_discord import ConfigDiscord
-from api.services.discord_config_service import DiscordConfigService
+from api.models.task_template import TaskTemplate
+from api.services.action_config_service import ActionConfigService
+from api.services.discord_config_service import DiscordConfigService, invalidate_reaction_cache
 
 
 @pytest.mark.asyncio
@@ -36,6 +41,45 @@ async def test_create_discord_config(db_session):
     assert "created_at" in result
 
 
+@pytest.mark.asyncio
+async def test_create_discord_config_single_statement(db_session):
+    """Discord設定作成が再取得のSELECTを行わないことをテスト"""
+    discord_config_service = DiscordConfigService()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        result = await discord_config_service.create_discord_config(
+            name="RETURNINGテスト", catch_type="reaction", catch_value="🆕"
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    # INSERT ... RETURNINGの1回で作成と結果の取得が完了する
+    assert len(statements) == 1
+    assert statements[0].lstrip().startswith("INSERT")
+    assert result["name"] == "RETURNINGテスト"
+    assert result["created_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_discord_config_exists(db_session):
+    """Discord設定の存在確認機能をテスト"""
+    discord_config = ConfigDiscord(name="存在確認テスト", catch_value="🔍")
+    db_session.add(discord_config)
+    await db_session.commit()
+    await db_session.refresh(discord_config)
+
+    discord_config_service = DiscordConfigService()
+
+    assert await discord_config_service.discord_config_exists(discord_config.id) is True
+    assert await discord_config_service.discord_config_exists(99999) is False
+
+
 @pytest.mark.asyncio
 async def test_get_discord_config(db_session):
     """Discord設定取得機能をテスト"""
@@ -102,6 +146,66 @@ async def test_get_discord_config_by_reaction(db_session):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_resolve_reaction(db_session):
+    """リアクションから設定・アクション・タスクテンプレートを1回のクエリで取得する機能をテスト"""
+    discord_config = ConfigDiscord(name="解決テスト", catch_type="reaction", catch_value="🧩")
+    task_template = TaskTemplate(name="解決テストテンプレート", task_type="test", prompt="解決テスト用プロンプト")
+    db_session.add_all([discord_config, task_template])
+    await db_session.commit()
+
+    # 無効なアクションは対象外
+    db_session.add(
+        Action(name="無効アクション", action_type="discord", discord_config_id=discord_config.id, is_enabled=False)
+    )
+    await db_session.commit()
+
+    discord_config_service = DiscordConfigService()
+
+    # 有効なアクションがない場合は設定のみ返す
+    target = await discord_config_service.resolve_reaction("🧩")
+    assert target.discord_config["id"] == discord_config.id
+    assert target.action is None
+    assert target.task_template is None
+
+    action = Action(
+        name="解決テストアクション",
+        action_type="discord",
+        discord_config_id=discord_config.id,
+        task_template_id=task_template.id,
+    )
+    db_session.add(action)
+    await db_session.commit()
+    # サービスを経由しない更新のため、キャッシュを明示的に破棄する
+    invalidate_reaction_cache()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        target = await discord_config_service.resolve_reaction("🧩")
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+    # 1回のクエリで設定・アクション・タスクテンプレートを取得する
+    assert len(statements) == 1
+    assert target.discord_config["catch_value"] == "🧩"
+    assert target.discord_config["message_type"] == "single"
+    assert target.action["id"] == action.id
+    assert target.action["task_template_id"] == task_template.id
+    assert target.task_template == {
+        "id": task_template.id,
+        "name": "解決テストテンプレート",
+        "prompt": "解決テスト用プロンプト",
+    }
+
+    # 存在しないリアクション値ではNone
+    assert await discord_config_service.resolve_reaction("🚫") is None
+
+
 @pytest.mark.asyncio
 async def test_list_discord_configs(db_session):
     """Discord設定一覧取得機能をテスト"""
@@ -138,6 +242,11 @@ async def test_list_discord_configs(db_session):
     limited_results = await discord_config_service.list_discord_configs(limit=2)
     assert len(limited_results) == 2
 
+    # 最後の行のIDをカーソルにして続きを取得
+    next_results = await discord_config_service.list_discord_configs(limit=2, after_id=limited_results[-1]["id"])
+    assert len(next_results) >= 1
+    assert {r["id"] for r in limited_results}.isdisjoint(r["id"] for r in next_results)
+
 
 @pytest.mark.asyncio
 async def test_update_discord_config(db_session):
@@ -186,6 +295,38 @@ async def test_update_discord_config(db_session):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_update_discord_config_single_statement(db_session):
+    """Discord設定の部分更新が1回のUPDATE文で行われることをテスト"""
+    discord_config = ConfigDiscord(name="部分更新テスト", catch_type="reaction", catch_value="🧪")
+    db_session.add(discord_config)
+    await db_session.commit()
+
+    discord_config_service = DiscordConfigService()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        result = await discord_config_service.update_discord_config(config_id=discord_config.id, name="部分更新後")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    # 事前の取得と再取得のSELECTを発行しない
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE")
+    assert result["name"] == "部分更新後"
+    assert result["catch_value"] == "🧪"
+    assert result["updated_at"] is not None
+
+    # 更新する値がない場合は現在の設定を返す
+    result = await discord_config_service.update_discord_config(config_id=discord_config.id)
+    assert result["name"] == "部分更新後"
+
+
 @pytest.mark.asyncio
 async def test_delete_discord_config(db_session):
     """Discord設定削除機能をテスト"""
@@ -217,3 +358,75 @@ async def test_delete_discord_config(db_session):
     # 存在しないIDで削除をテスト
     success = await discord_config_service.delete_discord_config(9999)
     assert success is False
+
+
+@pytest.mark.asyncio
+async def test_delete_discord_config_linked_to_action(db_session):
+    """アクションに関連付けられたDiscord設定の削除をテスト"""
+    action = Action(name="削除関連テスト用アクション", action_type="discord")
+    discord_config = ConfigDiscord(name="削除関連テスト", catch_value="🗑️")
+    db_session.add_all([action, discord_config])
+    await db_session.commit()
+
+    await ActionConfigService().create_action_config(action.id, "discord", discord_config.id)
+
+    # 関連付けられていても削除でき、アクションの関連付けは解除される
+    assert await DiscordConfigService().delete_discord_config(discord_config.id) is True
+
+    await db_session.refresh(action)
+    assert action.discord_config_id is None
+
+
+@pytest.mark.asyncio
+async def test_reaction_lookup_cache(db_session):
+    """リアクションの検索結果がキャッシュされ、設定の更新で破棄されることをテスト"""
+    discord_config_service = DiscordConfigService()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        # 該当なしの結果もキャッシュされる
+        assert await discord_config_service.get_discord_config_by_reaction("🗂") is None
+        assert await discord_config_service.get_discord_config_by_reaction("🗂") is None
+        assert len(statements) == 1
+
+        # サービス経由の作成でキャッシュが破棄される
+        created = await discord_config_service.create_discord_config(
+            name="キャッシュテスト", catch_type="reaction", catch_value="🗂"
+        )
+        result = await discord_config_service.get_discord_config_by_reaction("🗂")
+        assert result["id"] == created["id"]
+
+        # 更新・削除でもキャッシュが破棄される
+        await discord_config_service.update_discord_config(created["id"], name="キャッシュテスト更新")
+        assert (await discord_config_service.get_discord_config_by_reaction("🗂"))["name"] == "キャッシュテスト更新"
+
+        await discord_config_service.delete_discord_config(created["id"])
+        assert await discord_config_service.get_discord_config_by_reaction("🗂") is None
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_reaction_lookup_reuses_compiled_statement(db_session):
+    """リアクションによる設定取得で、値が異なってもコンパイル済みのSQLが再利用されることをテスト"""
+    discord_config_service = DiscordConfigService()
+    compiled = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        compiled.append(context.compiled)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await discord_config_service.get_discord_config_by_reaction("🅰")
+        await discord_config_service.get_discord_config_by_reaction("🅱")
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(compiled) == 2
+    assert compiled[0] is compiled[1]
@@ -318,3 +318,33 @@ class TestDiscordMCPServer:
         assert len(result["content"]) == 1
         assert result["content"][0]["type"] == "text"
         assert "エラーが発生しました" in result["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_call_tool_dispatch(self, discord_mcp_server, discord_service_mock):
+        """ツール名に対応するハンドラが呼び出されることのテスト"""
+        result = await discord_mcp_server.call_tool(
+            "discord_search_messages", {"channel_id": "123456789", "query": "テスト"}
+        )
+
+        assert len(result) == 1
+        assert "2件のメッセージを取得しました" in result[0].text
+        assert result[0].text.count("ID: 123456789") == 2
+        discord_service_mock.search_messages.assert_called_once_with(channel_id="123456789", query="テスト", limit=25)
+
+    @pytest.mark.asyncio
+    async def test_call_tool_unknown_name(self, discord_mcp_server):
+        """未知のツール名を指定した場合のテスト"""
+        result = await discord_mcp_server.call_tool("unknown_tool", {})
+
+        assert result[0].text == "ツールが見つかりません: unknown_tool"
+
+    @pytest.mark.asyncio
+    async def test_call_tool_handler_error(self, discord_mcp_server, discord_service_mock):
+        """ハンドラで例外が発生した場合のテスト"""
+        discord_service_mock.send_message.side_effect = Exception("テストエラー")
+
+        result = await discord_mcp_server.call_tool(
+            "discord_send_message", {"channel_id": "123456789", "content": "テストメッセージ"}
+        )
+
+        assert result[0].text == "ツール実行中にエラーが発生しました: テストエラー"
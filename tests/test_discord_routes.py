@@ -4,17 +4,19 @@ Discord連携ルートのテストモジュール
 このモジュールは、Discord連携に関連するAPIエンドポイントのテストを提供します。
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import AsyncClient
 
+from api.services.discord_service import get_discord_bot_manager
+
 
 @pytest.mark.asyncio
-async def test_start_discord_bot(client: AsyncClient, test_admin):
+async def test_start_discord_bot(client: AsyncClient, test_admin, override_dependency):
     """Discord Bot起動エンドポイントのテスト"""
     # DiscordBotManagerのモック
-    with patch("api.routes.discord.DiscordBotManager") as mock_service_class:
+    with override_dependency(get_discord_bot_manager) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.start_bot.return_value = {
@@ -63,10 +65,10 @@ async def test_start_discord_bot_unauthorized(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_stop_discord_bot(client: AsyncClient, test_admin):
+async def test_stop_discord_bot(client: AsyncClient, test_admin, override_dependency):
     """Discord Bot停止エンドポイントのテスト"""
     # DiscordBotManagerのモック
-    with patch("api.routes.discord.DiscordBotManager") as mock_service_class:
+    with override_dependency(get_discord_bot_manager) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.stop_bot.return_value = {
@@ -97,10 +99,10 @@ async def test_stop_discord_bot(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_get_discord_bot_status(client: AsyncClient, test_user):
+async def test_get_discord_bot_status(client: AsyncClient, test_user, override_dependency):
     """Discord Botステータス取得エンドポイントのテスト"""
     # DiscordBotManagerのモック
-    with patch("api.routes.discord.DiscordBotManager") as mock_service_class:
+    with override_dependency(get_discord_bot_manager) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.get_status.return_value = {
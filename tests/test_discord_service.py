@@ -4,21 +4,22 @@ Discord連携サービスのテストモジュール
 このモジュールは、Discord連携サービスのテストを提供します。
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import BackgroundTasks
 
-from api.services.discord_service import DiscordBotManager
+from api.services.discord_service import DiscordBotManager, get_discord_bot_manager
 from goose.executor import TaskExecutor
 
 
 @pytest.mark.asyncio
 async def test_discord_bot_service_singleton():
     """DiscordBotManagerのシングルトンパターンをテスト"""
-    # 2つのインスタンスが同じオブジェクトを参照することを確認
-    service1 = DiscordBotManager()
-    service2 = DiscordBotManager()
+    # ファクトリー関数が同じオブジェクトを返すことを確認
+    service1 = get_discord_bot_manager()
+    service2 = get_discord_bot_manager()
 
     assert service1 is service2
 
@@ -29,14 +30,11 @@ async def test_discord_bot_service_init():
     # TaskExecutorのモック
     mock_executor = AsyncMock(spec=TaskExecutor)
 
-    # 既存のインスタンスをリセット
-    DiscordBotManager._instance = None
-
     # 新しいインスタンスを作成
-    service = DiscordBotManager()
+    service = DiscordBotManager(mock_executor)
 
     # 初期化の検証
-    assert service._initialized is True
+    assert service.goose_executor is mock_executor
     assert service._is_running is False
     assert service._bot is None
 
@@ -48,9 +46,6 @@ async def test_start_bot_no_token():
     with patch("api.services.discord_service.settings") as mock_settings:
         mock_settings.DISCORD_BOT_TOKEN = None
 
-        # 既存のインスタンスをリセット
-        DiscordBotManager._instance = None
-
         # サービスのインスタンスを作成
         service = DiscordBotManager()
 
@@ -73,9 +68,6 @@ async def test_start_bot_already_running():
     with patch("api.services.discord_service.settings") as mock_settings:
         mock_settings.DISCORD_BOT_TOKEN = "test_token"
 
-        # 既存のインスタンスをリセット
-        DiscordBotManager._instance = None
-
         # サービスのインスタンスを作成
         service = DiscordBotManager()
         service._is_running = True
@@ -99,9 +91,6 @@ async def test_start_bot_success():
     with patch("api.services.discord_service.settings") as mock_settings:
         mock_settings.DISCORD_BOT_TOKEN = "test_token"
 
-        # 既存のインスタンスをリセット
-        DiscordBotManager._instance = None
-
         # サービスのインスタンスを作成
         service = DiscordBotManager()
         service._is_running = False
@@ -125,8 +114,6 @@ async def test_start_bot_success():
 @pytest.mark.asyncio
 async def test_stop_bot_not_running():
     """実行されていないBotの停止をテスト"""
-    # 既存のインスタンスをリセット
-    DiscordBotManager._instance = None
 
     # サービスのインスタンスを作成
     service = DiscordBotManager()
@@ -144,8 +131,6 @@ async def test_stop_bot_not_running():
 @pytest.mark.asyncio
 async def test_stop_bot_success():
     """Botの停止成功をテスト"""
-    # 既存のインスタンスをリセット
-    DiscordBotManager._instance = None
 
     # サービスのインスタンスを作成
     service = DiscordBotManager()
@@ -170,8 +155,6 @@ async def test_stop_bot_success():
 @pytest.mark.asyncio
 async def test_stop_bot_error():
     """Bot停止時のエラーをテスト"""
-    # 既存のインスタンスをリセット
-    DiscordBotManager._instance = None
 
     # サービスのインスタンスを作成
     service = DiscordBotManager()
@@ -190,8 +173,6 @@ async def test_stop_bot_error():
 @pytest.mark.asyncio
 async def test_get_status():
     """Botのステータス取得をテスト"""
-    # 既存のインスタンスをリセット
-    DiscordBotManager._instance = None
 
     # サービスのインスタンスを作成
     service = DiscordBotManager()
@@ -211,15 +192,12 @@ async def test_get_status():
 async def test_run_bot_success():
     """Bot実行の成功をテスト"""
     # DiscordServiceのモック
-    with patch("api.services.discord_service.DiscordBot") as mock_discord_bot_class:
+    with patch("extensions.discord.DiscordBotService") as mock_discord_bot_class:
         # モックの設定
         mock_discord_bot = MagicMock()
         mock_discord_bot.start = AsyncMock()
         mock_discord_bot_class.return_value = mock_discord_bot
 
-        # 既存のインスタンスをリセット
-        DiscordBotManager._instance = None
-
         # サービスのインスタンスを作成
         service = DiscordBotManager()
 
@@ -245,15 +223,12 @@ async def test_run_bot_success():
 async def test_run_bot_error():
     """Bot実行時のエラーをテスト"""
     # DiscordBotのモック
-    with patch("api.services.discord_service.DiscordBot") as mock_discord_bot_class:
+    with patch("extensions.discord.DiscordBotService") as mock_discord_bot_class:
         # モックの設定
         mock_discord_bot = MagicMock()
         mock_discord_bot.start = AsyncMock(side_effect=Exception("起動エラー"))
         mock_discord_bot_class.return_value = mock_discord_bot
 
-        # 既存のインスタンスをリセット
-        DiscordBotManager._instance = None
-
         # サービスのインスタンスを作成
         service = DiscordBotManager()
 
@@ -273,3 +248,21 @@ async def test_run_bot_error():
         # 終了後の状態を検証
         assert service._is_running is False
         assert service._bot is None
+
+
+@pytest.mark.asyncio
+async def test_start_bot_concurrent_calls_start_once():
+    """同時に起動を要求してもBotが1回だけ起動されることをテスト"""
+    with patch("api.services.discord_service.settings") as mock_settings:
+        mock_settings.DISCORD_BOT_TOKEN = "test_token"
+
+        service = DiscordBotManager()
+        background_tasks = MagicMock(spec=BackgroundTasks)
+
+        results = await asyncio.gather(service.start_bot(background_tasks), service.start_bot(background_tasks))
+
+    background_tasks.add_task.assert_called_once()
+    assert sorted(result["message"] for result in results) == [
+        "Discord Botは既に実行中です",
+        "Discord Botを起動しています",
+    ]
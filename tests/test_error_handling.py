@@ -22,15 +22,18 @@ from goose.executor import TaskExecutor
 async def test_database_connection_error(client: AsyncClient, db_session: AsyncSession):
     """データベース接続エラーのテスト"""
     # SQLAlchemyエラーをシミュレート
-    with patch("api.routes.health.get_db") as mock_get_db:
-        # モックセッションを設定
-        mock_session = AsyncMock()
-        mock_session.execute.side_effect = SQLAlchemyError("データベース接続エラー")
+    with (
+        patch("api.routes.health.engine") as mock_engine,
+        patch("api.routes.health._db_check_cache", (0.0, "ok", None)),
+    ):
+        # モック接続を設定
+        mock_conn = AsyncMock()
+        mock_conn.execute.side_effect = SQLAlchemyError("データベース接続エラー")
 
         # AsyncContextManagerのモック
         mock_context = AsyncMock()
-        mock_context.__aenter__.return_value = mock_session
-        mock_get_db.return_value = mock_context
+        mock_context.__aenter__.return_value = mock_conn
+        mock_engine.connect.return_value = mock_context
 
         # ヘルスチェックエンドポイントにリクエスト
         response = await client.get("/api/health/")
@@ -114,7 +117,7 @@ async def test_duplicate_username(client: AsyncClient, test_user: User):
     # 既存のユーザー名で登録リクエスト
     response = await client.post(
         "/api/v1/auth/register",
-        params={
+        json={
             "username": "testuser",  # 既に存在するユーザー名
             "email": "another@example.com",
             "password": "password",
@@ -267,7 +270,7 @@ async def test_integrity_error_handling(client: AsyncClient, db_session: AsyncSe
         # ユーザー登録リクエスト
         response = await client.post(
             "/api/v1/auth/register",
-            params={
+            json={
                 "username": "newuser",
                 "email": "new@example.com",
                 "password": "newpassword",
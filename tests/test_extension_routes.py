@@ -4,17 +4,19 @@
 このモジュールは、拡張機能に関連するAPIエンドポイントのテストを提供します。
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from httpx import AsyncClient
 
+from api.services.extension_service import get_extension_service
+
 
 @pytest.mark.asyncio
-async def test_list_extensions(client: AsyncClient, test_user):
+async def test_list_extensions(client: AsyncClient, test_user, override_dependency):
     """拡張機能一覧取得エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.list_extensions.return_value = [
@@ -73,10 +75,10 @@ async def test_list_extensions(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_add_extension(client: AsyncClient, test_admin):
+async def test_add_extension(client: AsyncClient, test_admin, override_dependency):
     """拡張機能追加エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.add_extension.return_value = {
@@ -160,10 +162,10 @@ async def test_add_extension_unauthorized(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_get_extension(client: AsyncClient, test_user):
+async def test_get_extension(client: AsyncClient, test_user, override_dependency):
     """特定の拡張機能取得エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.get_extension.return_value = {
@@ -211,10 +213,10 @@ async def test_get_extension(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_get_extension_not_found(client: AsyncClient, test_user):
+async def test_get_extension_not_found(client: AsyncClient, test_user, override_dependency):
     """存在しない拡張機能取得エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.get_extension.return_value = None
@@ -245,10 +247,10 @@ async def test_get_extension_not_found(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_update_extension(client: AsyncClient, test_admin):
+async def test_update_extension(client: AsyncClient, test_admin, override_dependency):
     """拡張機能更新エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.update_extension.return_value = {
@@ -307,10 +309,10 @@ async def test_update_extension(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_update_extension_not_found(client: AsyncClient, test_admin):
+async def test_update_extension_not_found(client: AsyncClient, test_admin, override_dependency):
     """存在しない拡張機能更新エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.update_extension.return_value = None
@@ -370,10 +372,10 @@ async def test_update_extension_unauthorized(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_remove_extension(client: AsyncClient, test_admin):
+async def test_remove_extension(client: AsyncClient, test_admin, override_dependency):
     """拡張機能削除エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.remove_extension.return_value = True
@@ -401,10 +403,10 @@ async def test_remove_extension(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_remove_extension_not_found(client: AsyncClient, test_admin):
+async def test_remove_extension_not_found(client: AsyncClient, test_admin, override_dependency):
     """存在しない拡張機能削除エンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.remove_extension.return_value = False
@@ -456,10 +458,10 @@ async def test_remove_extension_unauthorized(client: AsyncClient, test_user):
 
 
 @pytest.mark.asyncio
-async def test_install_extension(client: AsyncClient, test_admin):
+async def test_install_extension(client: AsyncClient, test_admin, override_dependency):
     """拡張機能インストールエンドポイントのテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.install_extension_from_url.return_value = {
@@ -503,10 +505,10 @@ async def test_install_extension(client: AsyncClient, test_admin):
 
 
 @pytest.mark.asyncio
-async def test_install_extension_failure(client: AsyncClient, test_admin):
+async def test_install_extension_failure(client: AsyncClient, test_admin, override_dependency):
     """拡張機能インストール失敗のテスト"""
     # ExtensionServiceのモック
-    with patch("api.routes.extensions.ExtensionService") as mock_service_class:
+    with override_dependency(get_extension_service) as mock_service_class:
         # モックの設定
         mock_service = AsyncMock()
         mock_service.install_extension_from_url.return_value = {
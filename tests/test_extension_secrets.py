@@ -10,7 +10,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.services.extension_service import ExtensionService
+from api.services.extension_service import ExtensionService, wait_for_pending_sync
 from api.services.setting_service import SettingService
 
 
@@ -242,7 +242,8 @@ async def test_sync_to_goose_with_secrets(
     # 注意: 実際のYAMLダンプの内容を正確に検証するのは難しいため、
     # テスト環境によっては内容が異なる可能性があるため、
     # 秘密情報のキーが含まれているかどうかの検証は行わない
-    yaml_content = map(lambda r: r.args[0], yaml_dump_calls)
+    # C実装のダンパーはまとめて書き込むため、書き込まれた内容を連結して検証する
+    yaml_content = "".join(call.args[0] for call in yaml_dump_calls)
     assert "SYNC_API_KEY" in yaml_content
     assert "SYNC_TOKEN" in yaml_content
     assert "api_key_for_sync" in yaml_content  # 復号化された値
@@ -274,9 +275,11 @@ async def test_extension_with_invalid_secrets(db_session: AsyncSession):
             secrets=["NON_EXISTENT_KEY"],  # 存在しない秘密情報のキー
         )
 
-        # add_extensionメソッド内でsync_to_gooseが呼び出されるため、
+        # add_extensionメソッドがsync_to_gooseを予約するため、
         # 別途sync_to_gooseを呼び出す必要はない
         extension_result = await extension_service.add_extension(extension)
+        # 同期はバックグラウンドで行われるため、モックが有効な間に完了を待つ
+        await wait_for_pending_sync()
 
         # 拡張機能が正しく作成されたことを確認
         assert extension_result["id"] is not None
@@ -4,16 +4,18 @@
 このモジュールは、拡張機能サービスの機能をテストします。
 """
 
+import asyncio
 import os
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.database import engine
 from api.models.extension import Extension
-from api.services.extension_service import ExtensionService
+from api.services.extension_service import EXTENSION_LIST_FIELDS, ExtensionService, wait_for_pending_sync
 
 
 @pytest.mark.asyncio
@@ -56,6 +58,7 @@ async def test_list_extensions(db_session: AsyncSession):
 
     # 検証
     assert len(result) == 2
+    assert set(result[0]) == set(EXTENSION_LIST_FIELDS)
     assert result[0]["name"] == "テスト拡張機能1"
     assert result[0]["description"] == "テスト用の拡張機能1"
     assert result[0]["enabled"] is True
@@ -173,6 +176,28 @@ async def test_get_extension_not_found(db_session: AsyncSession):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_get_extensions_by_ids(db_session: AsyncSession):
+    """IDを指定した拡張機能の一括取得機能をテスト"""
+    extensions = [
+        Extension(name="一括取得拡張機能1", enabled=True, type="builtin"),
+        Extension(name="一括取得拡張機能2", enabled=False, type="builtin"),
+        Extension(name="一括取得拡張機能3", enabled=True, type="builtin"),
+    ]
+    for ext in extensions:
+        db_session.add(ext)
+    await db_session.commit()
+
+    service = ExtensionService()
+
+    ids = [extensions[2].id, extensions[1].id, 9999, extensions[0].id]
+    result = await service.get_extensions_by_ids(ids)
+
+    # 無効な拡張機能と存在しないIDは除外され、指定した順序で返される
+    assert [ext["name"] for ext in result] == ["一括取得拡張機能3", "一括取得拡張機能1"]
+    assert await service.get_extensions_by_ids([]) == []
+
+
 @pytest.mark.asyncio
 async def test_update_extension(db_session: AsyncSession):
     """拡張機能更新機能をテスト"""
@@ -531,54 +556,47 @@ async def test_sync_from_goose_update_existing(db_session: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_get_db_extensions(db_session: AsyncSession):
-    """データベースから拡張機能を取得する内部メソッドをテスト"""
-    # テスト用の拡張機能を作成
-    extensions = [
-        Extension(
-            name="内部メソッドテスト拡張機能1",
-            description="内部メソッドテスト用の拡張機能1",
-            enabled=True,
-            type="stdio",
-        ),
+async def test_sync_from_goose_upsert(db_session: AsyncSession):
+    """追加と更新が1回の書き込みで反映され、設定ファイルにない項目は引き継がれることをテスト"""
+    db_session.add(
         Extension(
-            name="内部メソッドテスト拡張機能2",
-            description="内部メソッドテスト用の拡張機能2",
-            enabled=False,
-            type="builtin",
-        ),
-    ]
-
-    for ext in extensions:
-        db_session.add(ext)
+            name="Upsert Existing", description="既存の説明", enabled=True, type="stdio", cmd="python", timeout=300
+        )
+    )
     await db_session.commit()
-    # サービスのインスタンスを作成
-    service = ExtensionService()
 
-    # _get_db_extensionsメソッドの実装をパッチして、テーブル存在確認をスキップ
-    original_method = ExtensionService._get_db_extensions
+    test_extensions = {
+        "upsertexisting": {"enabled": True, "type": "stdio", "args": ["main.py"], "name": "Upsert Existing"},
+        "upsertnew": {"enabled": True, "type": "builtin", "name": "Upsert New"},
+    }
+
+    statements = []
 
-    async def patched_get_db_extensions(self, db):
-        # テーブル存在確認をスキップして直接クエリを実行
-        result = await db.execute(select(Extension))
-        return result.scalars().all()
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("SELECT"):
+            statements.append(statement)
 
-    # メソッドをパッチ
-    with patch.object(ExtensionService, "_get_db_extensions", patched_get_db_extensions):
-        # 内部メソッドを呼び出し
-        result = await service._get_db_extensions(db_session)
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        with patch("api.services.extension_service.read_goose_extensions", return_value=test_extensions):
+            result = await ExtensionService().sync_from_goose()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
 
-        # 検証
-        assert len(result) >= 2  # 他のテストで作成された拡張機能も含まれる可能性がある
+    assert result["success"] is True
+    assert result["synced_count"] == 2
+    assert len(statements) == 1
 
-        # 作成した拡張機能が含まれていることを確認
-        names = [ext.name for ext in result]
-        assert "内部メソッドテスト拡張機能1" in names
-        assert "内部メソッドテスト拡張機能2" in names
+    db_session.expire_all()
+    existing = (await db_session.execute(select(Extension).where(Extension.name == "Upsert Existing"))).scalar_one()
+    assert existing.description == "既存の説明"
+    assert existing.cmd == "python"
+    assert existing.timeout == 300
+    assert existing.args == ["main.py"]
 
-        # 型の検証
-        for ext in result:
-            assert isinstance(ext, Extension)
+    created = (await db_session.execute(select(Extension).where(Extension.name == "Upsert New"))).scalar_one()
+    assert created.description == "Goose built-in extension: Upsert New"
+    assert created.enabled is True
 
 
 @pytest.mark.asyncio
@@ -679,3 +697,133 @@ async def test_sync_from_goose_error_handling(db_session: AsyncSession):
 
         # ロガーが呼ばれたことを確認
         mock_logger.error.assert_called_once()
+
+
+def test_extension_update_values():
+    """更新データから適用する列と値のみが取り出されることをテスト"""
+    from api.routes.extensions import ExtensionUpdate
+    from api.services.extension_service import _extension_update_values
+
+    # 指定されなかったフィールド、Noneの値、更新できない列は含まれない
+    update = ExtensionUpdate(id=1, name="変更不可", enabled=False, cmd=None, timeout=30)
+    assert _extension_update_values(update) == {"enabled": False, "timeout": 30}
+
+
+@pytest.mark.asyncio
+async def test_update_and_remove_extension_single_statement(db_session: AsyncSession):
+    """拡張機能の更新と削除がそれぞれ1回の文で行われることをテスト"""
+    extension = Extension(name="単一文テスト拡張機能", enabled=True, type="stdio", cmd="python")
+    db_session.add(extension)
+    await db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with patch.object(ExtensionService, "sync_to_goose", return_value={"success": True}):
+        service = ExtensionService()
+
+        class UpdateData:
+            def __init__(self):
+                self.cmd = "node"
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            result = await service.update_extension(extension.id, UpdateData())
+            assert await service.remove_extension(extension.id) is True
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        # 存在しない拡張機能の削除はFalseを返す
+        assert await service.remove_extension(extension.id) is False
+
+    assert result["cmd"] == "node"
+    assert result["name"] == "単一文テスト拡張機能"
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "DELETE"]
+
+
+@pytest.mark.asyncio
+async def test_install_extension_from_url_single_statement(db_session: AsyncSession):
+    """URLからのインストールが1回のUPSERT文で行われることをテスト"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with patch.object(ExtensionService, "sync_to_goose", return_value={"success": True}):
+        service = ExtensionService()
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            first = await service.install_extension_from_url(name="UPSERT拡張機能", url="https://example.com/a")
+            second = await service.install_extension_from_url(name="UPSERT拡張機能", url="https://example.com/b")
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert first["extension_id"] == second["extension_id"]
+    assert [statement.split()[0] for statement in statements] == ["INSERT", "INSERT"]
+
+
+@pytest.mark.asyncio
+async def test_sync_to_goose_runs_in_background(db_session: AsyncSession):
+    """変更後の同期がバックグラウンドで行われ、続けて予約された同期がまとめられることをテスト"""
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_sync():
+        calls.append(len(calls))
+        await release.wait()
+        return {"success": True}
+
+    with patch.object(ExtensionService, "sync_to_goose", side_effect=slow_sync):
+        service = ExtensionService()
+
+        # 同期の完了を待たずに結果が返される
+        first = await service.install_extension_from_url(name="バックグラウンド拡張機能1", url="https://example.com/1")
+        await asyncio.sleep(0)
+        second = await service.install_extension_from_url(name="バックグラウンド拡張機能2", url="https://example.com/2")
+        third = await service.install_extension_from_url(name="バックグラウンド拡張機能3", url="https://example.com/3")
+        assert first["success"] and second["success"] and third["success"]
+        assert calls == [0]
+
+        # 実行中の同期の後に、まとめてもう一度だけ同期される
+        release.set()
+        await wait_for_pending_sync()
+
+    assert calls == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_sync_to_goose_extension_entries(db_session: AsyncSession):
+    """設定ファイルに書き込む拡張機能のエントリの内容をテスト"""
+    db_session.add_all(
+        [
+            Extension(name="Full Extension", enabled=True, type="stdio", cmd="python", args=["-m", "ext"], timeout=60),
+            Extension(name="Builtin Extension", enabled=False, type="builtin", envs={"KEY": "value"}),
+        ]
+    )
+    await db_session.commit()
+
+    with (
+        patch("api.services.extension_service.get_goose_config_path", return_value=Path("/mock/config.yaml")),
+        patch("api.services.extension_service.read_goose_config", return_value={"extensions": {}}),
+        patch("api.services.extension_service.write_goose_config") as mock_write,
+    ):
+        result = await ExtensionService().sync_to_goose()
+
+    assert result["success"] is True
+    written = mock_write.call_args.args[1]["extensions"]
+    assert written["fullextension"] == {
+        "enabled": True,
+        "type": "stdio",
+        "cmd": "python",
+        "args": ["-m", "ext"],
+        "timeout": 60,
+        "envs": {},
+        "name": "Full Extension",
+    }
+    # Noneの項目は含めず、環境変数は常に含める
+    assert written["builtinextension"]["envs"] == {"KEY": "value"}
+    assert "cmd" not in written["builtinextension"]
+    assert "args" not in written["builtinextension"]
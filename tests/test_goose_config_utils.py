@@ -12,7 +12,7 @@ from unittest.mock import patch
 
 import yaml
 
-from api.utils.goose_config import get_goose_config_path, read_goose_config, read_goose_extensions
+from api.utils.goose_config import get_goose_config_path, read_goose_config, read_goose_extensions, write_goose_config
 
 
 def test_get_goose_config_path():
@@ -155,3 +155,26 @@ def test_read_goose_extensions_empty():
     with patch("api.utils.goose_config.read_goose_config", return_value={"extensions": {}}):
         extensions = read_goose_extensions()
         assert extensions == {}
+
+
+def test_read_goose_config_caches_until_modified():
+    """設定ファイルが変更されるまで解析結果が再利用されることをテスト"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir) / "config.yaml"
+        write_goose_config(temp_path, {"extensions": {"ext1": {"enabled": True}}})
+
+        with (
+            patch("api.utils.goose_config.get_goose_config_path", return_value=temp_path),
+            patch("api.utils.goose_config.yaml.load", wraps=yaml.load) as mock_load,
+        ):
+            first = read_goose_config()
+            # 返された内容を書き換えてもキャッシュには影響しない
+            first["extensions"]["ext1"]["enabled"] = False
+            second = read_goose_config()
+            assert second == {"extensions": {"ext1": {"enabled": True}}}
+            assert mock_load.call_count == 1
+
+            # 書き込み後は新しい内容を読み直す
+            write_goose_config(temp_path, {"extensions": {}})
+            assert read_goose_config() == {"extensions": {}}
+            assert mock_load.call_count == 2
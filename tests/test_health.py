@@ -4,9 +4,13 @@
 このモジュールは、ヘルスチェック機能のテストを提供します。
 """
 
+from unittest.mock import patch
+
 import pytest
 from httpx import AsyncClient
 
+from api.database import engine
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -30,6 +34,21 @@ async def test_health_check(client: AsyncClient):
     assert "status" in data["database"]
 
 
+async def test_health_check_database_cached(client: AsyncClient):
+    """ヘルスチェックのDB確認結果がキャッシュされることをテスト"""
+    with (
+        patch("api.routes.health._db_check_cache", (0.0, "ok", None)),
+        patch("api.routes.health.engine", wraps=engine) as mock_engine,
+    ):
+        first = await client.get("/api/health/")
+        second = await client.get("/api/health/")
+
+    assert first.json()["database"] == {"status": "ok", "error": None}
+    assert second.json()["database"] == {"status": "ok", "error": None}
+    # 2回目はキャッシュされた結果を返し、接続を取得しない
+    assert mock_engine.connect.call_count == 1
+
+
 async def test_ping(client: AsyncClient):
     """Pingエンドポイントのテスト"""
     # Pingリクエスト
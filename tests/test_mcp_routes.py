@@ -4,13 +4,15 @@ MCPルーターのテスト
 このモジュールは、MCPルーターの機能をテストします。
 """
 
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from api.mcp.discord_server import DiscordMCPServer
+from api.routes import mcp as mcp_routes
 from api.routes.mcp import router as mcp_router
 
 
@@ -96,3 +98,18 @@ class TestMCPRoutes:
 
         # Discord MCPサーバーのメソッドが呼び出されたことを確認
         discord_mcp_server_mock.handle_messages.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_discord_mcp_server_concurrent():
+    """同時に呼び出されてもMCPサーバーが一度だけ生成されることをテスト"""
+    discord_service = MagicMock()
+
+    with (
+        patch.object(mcp_routes, "_discord_mcp_server", None),
+        patch("api.mcp.discord_server.DiscordMCPServer") as mock_server_class,
+    ):
+        servers = await asyncio.gather(*(mcp_routes.get_discord_mcp_server(discord_service) for _ in range(5)))
+
+    mock_server_class.assert_called_once_with(discord_service)
+    assert all(server is servers[0] for server in servers)
@@ -0,0 +1,116 @@
+"""
+設定ルートのテストモジュール
+
+このモジュールは、設定に関連するAPIエンドポイントのテストを提供します。
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from api.models.setting import Setting
+
+
+@pytest.mark.asyncio
+async def test_list_settings(client: AsyncClient, test_user, db_session):
+    """設定一覧取得エンドポイントのテスト"""
+    db_session.add(Setting(key="ROUTE_PUBLIC", value="公開値", description="公開設定"))
+    db_session.add(Setting(key="ROUTE_SECRET", value="秘密値", is_secret=True))
+    await db_session.commit()
+
+    # ユーザーとしてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "testuser", "password": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+
+    response = await client.get("/api/settings/", headers={"Authorization": f"Bearer {token}"})
+
+    # 検証
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = {setting["key"]: setting for setting in response.json()}
+    assert data["ROUTE_PUBLIC"]["value"] == "公開値"
+    assert data["ROUTE_PUBLIC"]["description"] == "公開設定"
+    assert data["ROUTE_PUBLIC"]["is_secret"] is False
+    assert data["ROUTE_SECRET"]["value"] == "********"
+    assert set(data["ROUTE_SECRET"]) == {"id", "key", "value", "description", "is_secret"}
+
+
+@pytest.mark.asyncio
+async def test_create_setting(client: AsyncClient, test_user):
+    """設定作成エンドポイントのテスト"""
+    # ユーザーとしてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "testuser", "password": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        "/api/settings/", json={"key": "ROUTE_CREATED", "value": {"nested": [1, 2]}}, headers=headers
+    )
+
+    # 検証
+    assert response.status_code == 201
+    data = response.json()
+    assert data["key"] == "ROUTE_CREATED"
+    assert data["value"] == {"nested": [1, 2]}
+    assert data["is_secret"] is False
+
+    # 必須項目の欠落と不正なJSONはFastAPI標準と同じ422エラーになる
+    response = await client.post("/api/settings/", json={"value": "キーなし"}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "key"]
+
+    response = await client.post(
+        "/api/settings/", content=b"{invalid", headers={**headers, "Content-Type": "application/json"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_setting_body_in_openapi(client: AsyncClient):
+    """設定作成エンドポイントのリクエストボディがOpenAPIに公開されることをテスト"""
+    response = await client.get("/openapi.json")
+
+    assert response.status_code == 200
+    schema = response.json()["paths"]["/api/settings/"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert "key" in schema["required"]
+
+
+@pytest.mark.asyncio
+async def test_list_settings_etag(client: AsyncClient, test_user, db_session):
+    """設定一覧取得エンドポイントのETagによる条件付きリクエストのテスト"""
+    db_session.add(Setting(key="ETAG_SETTING", value="初期値"))
+    await db_session.commit()
+
+    # ユーザーとしてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "testuser", "password": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get("/api/settings/", headers=headers)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("private")
+
+    # 内容が変わっていなければ304を返す
+    response = await client.get("/api/settings/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # 内容が変わればETagも変わる
+    db_session.add(Setting(key="ETAG_SETTING_2", value="追加"))
+    await db_session.commit()
+
+    response = await client.get("/api/settings/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -4,6 +4,8 @@
 このモジュールは、設定サービスの機能をテストします。
 """
 
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -275,3 +277,42 @@ async def test_encryption_in_database(db_session: AsyncSession):
     # 暗号化された値を復号化して元の値と一致することを確認
     decrypted_value = decrypt_value(encrypted_value)
     assert decrypted_value == "secret_value_for_encryption_test"
+
+
+@pytest.mark.asyncio
+async def test_get_setting_by_key_cache(db_session: AsyncSession):
+    """キーによる設定の取得結果がキャッシュされ、更新時に無効化されることをテスト"""
+    service = SettingService()
+
+    # 存在しない設定の結果もキャッシュされ、追加時に無効化される
+    assert await service.get_setting_by_key("CACHED_TOKEN") is None
+    created = await service.add_setting(SettingCreateMock(key="CACHED_TOKEN", value="token1", is_secret=True))
+    assert (await service.get_setting_by_key("CACHED_TOKEN"))["value"] == "token1"
+
+    # 2回目以降はデータベースセッションを開かない
+    with patch("api.services.setting_service._get_db_context") as mock_get_db:
+        setting = await service.get_setting_by_key("CACHED_TOKEN")
+    mock_get_db.assert_not_called()
+    assert setting["value"] == "token1"
+
+    # 更新後は新しい値を返す
+    await service.update_setting(created["id"], SettingUpdateMock(value="token2"))
+    assert (await service.get_setting_by_key("CACHED_TOKEN"))["value"] == "token2"
+
+    # 削除後は見つからない
+    await service.remove_setting(created["id"])
+    assert await service.get_setting_by_key("CACHED_TOKEN") is None
+
+
+@pytest.mark.asyncio
+async def test_get_setting_values(db_session: AsyncSession):
+    """複数のキーの設定値をまとめて取得する機能をテスト"""
+    service = SettingService()
+    await service.add_setting(SettingCreateMock(key="BULK_NORMAL", value="normal_value"))
+    await service.add_setting(SettingCreateMock(key="BULK_SECRET", value="secret_value", is_secret=True))
+
+    values = await service.get_setting_values(["BULK_NORMAL", "BULK_SECRET", "BULK_MISSING", "BULK_NORMAL"])
+
+    # 秘密情報は復号化され、存在しないキーは含まれない
+    assert values == {"BULK_NORMAL": "normal_value", "BULK_SECRET": "secret_value"}
+    assert await service.get_setting_values([]) == {}
@@ -7,7 +7,9 @@
 from datetime import datetime
 
 import pytest
+from sqlalchemy import event
 
+from api.database import engine
 from api.models.task_execution import TaskExecution
 from api.models.task_template import TaskTemplate
 from api.services.task_service import TaskService
@@ -108,6 +110,53 @@ class TestTaskExecution:
         assert task_execution["context"] == {"test": "data"}
         assert task_execution["status"] == "pending"
 
+    @pytest.mark.asyncio
+    async def test_task_service_create_task_executions(self, db_session, task_template):
+        """TaskServiceのcreate_task_executions関数のテスト"""
+        # フィクスチャからタスクテンプレートを取得
+        template = await task_template
+
+        # TaskServiceのインスタンスを作成
+        task_service = TaskService()
+
+        # タスク実行をまとめて作成
+        contexts = [{"index": i} for i in range(5)]
+        task_executions = await task_service.create_task_executions(
+            [{"task_template_id": template.id, "context": context} for context in contexts]
+        )
+
+        # 作成されたタスク実行が引数と同じ順序で返されることを検証
+        assert [execution["context"] for execution in task_executions] == contexts
+        assert len({execution["id"] for execution in task_executions}) == 5
+        assert all(execution["status"] == "pending" for execution in task_executions)
+        assert all(execution["created_at"] is not None for execution in task_executions)
+
+        # 空のリストでは何も作成しない
+        assert await task_service.create_task_executions([]) == []
+
+    @pytest.mark.asyncio
+    async def test_task_service_start_task_execution_with_prompt(self, db_session, task_template):
+        """取得済みのプロンプトを渡した場合にテンプレートを再取得しないことのテスト"""
+        # フィクスチャからタスクテンプレートを取得
+        template = await task_template
+
+        statements = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        task_service = TaskService()
+        event.listen(engine.sync_engine, "before_cursor_execute", before_execute)
+        try:
+            execution = await task_service.start_task_execution(template.id, prompt=template.prompt)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_execute)
+
+        # 実行ログのINSERTのみが発行される
+        assert execution["prompt"] == "テストプロンプト"
+        assert execution["status"] == "pending"
+        assert [s.split()[0] for s in statements] == ["INSERT"]
+
     @pytest.mark.asyncio
     async def test_task_service_update_task_execution(self, db_session, task_execution):
         """TaskServiceのupdate_task_execution関数のテスト"""
@@ -130,3 +179,24 @@ class TestTaskExecution:
         assert updated_task["status"] == "failed"
         assert updated_task["result"] == "更新されたテスト結果"
         assert updated_task["error"] == "テストエラー"
+
+    @pytest.mark.asyncio
+    async def test_task_service_list_task_executions_fields(self, db_session, task_execution):
+        """TaskServiceのlist_task_executions関数で返却列を絞り込むテスト"""
+        # フィクスチャからタスク実行を取得
+        execution = await task_execution
+
+        # TaskServiceのインスタンスを作成
+        task_service = TaskService()
+
+        # デフォルトでは大きな列（context・result）を含まない
+        executions = await task_service.list_task_executions(template_id=execution.template_id)
+        assert executions[0]["id"] == execution.id
+        assert "context" not in executions[0]
+        assert "result" not in executions[0]
+
+        # 指定した列のみを取得
+        executions = await task_service.list_task_executions(
+            template_id=execution.template_id, fields=["id", "status", "result"]
+        )
+        assert executions == [{"id": execution.id, "status": "completed", "result": "テスト結果"}]
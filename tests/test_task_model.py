@@ -5,6 +5,7 @@
 """
 
 import pytest
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -124,3 +125,10 @@ async def test_template_execution_relationship(db_session: AsyncSession):
     assert len(executions_from_db) == 3
     for execution in executions_from_db:
         assert execution.template_id == template.id
+
+    # テンプレートの実行ログはクエリとして取得する（コレクション全体は読み込まない）
+    result = await db_session.scalars(template_from_db.executions.select().where(TaskExecution.result == "実行結果2"))
+    assert [execution.id for execution in result] == [executions[1].id]
+
+    count = await db_session.scalar(template_from_db.executions.select().with_only_columns(func.count()))
+    assert count == 3
@@ -0,0 +1,127 @@
+"""
+タスクルートのテストモジュール
+
+このモジュールは、タスクに関連するAPIエンドポイントのテストを提供します。
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models.task_execution import TaskExecution
+from api.models.task_template import TaskTemplate
+
+
+@pytest.mark.asyncio
+async def test_get_and_list_task_executions(client: AsyncClient, db_session: AsyncSession, test_admin):
+    """タスク実行ログ取得・一覧取得エンドポイントのテスト"""
+    # テスト用のタスクテンプレートとタスク実行を作成
+    template = TaskTemplate(name="ルートテスト用テンプレート", task_type="test", prompt="テスト用プロンプト")
+    db_session.add(template)
+    await db_session.commit()
+    await db_session.refresh(template)
+
+    execution = TaskExecution(
+        template_id=template.id, context={"message": "テスト入力"}, status="completed", result="テスト結果"
+    )
+    db_session.add(execution)
+    await db_session.commit()
+    await db_session.refresh(execution)
+
+    # 管理者としてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "admin", "password": "adminpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 詳細取得リクエスト
+    response = await client.get(f"/api/v1/tasks/executions/{execution.id}", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["context"] == {"message": "テスト入力"}
+    assert data["result"] == "テスト結果"
+
+    # 一覧取得リクエスト
+    response = await client.get("/api/v1/tasks/executions/", params={"template_id": template.id}, headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [execution.id]
+    assert data[0]["status"] == "completed"
+    # 一覧には取得した列のみが含まれ、実行結果などはnullとして出力されない
+    assert set(data[0]) == {"id", "template_id", "user_id", "status", "created_at", "completed_at"}
+
+
+@pytest.mark.asyncio
+async def test_list_task_templates(client: AsyncClient, db_session: AsyncSession, test_admin):
+    """タスクテンプレート一覧取得エンドポイントのテスト"""
+    template = TaskTemplate(name="一覧テスト用テンプレート", task_type="list_test", prompt="一覧には含まれない")
+    db_session.add(template)
+    await db_session.commit()
+
+    # 管理者としてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "admin", "password": "adminpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+
+    response = await client.get(
+        "/api/v1/tasks/templates/", params={"task_type": "list_test"}, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    # 検証（promptは返さない）
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data] == ["一覧テスト用テンプレート"]
+    assert set(data[0]) == {"id", "user_id", "name", "task_type", "description", "created_at", "updated_at"}
+    assert data[0]["created_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_execute_task_accepted(client: AsyncClient, db_session: AsyncSession, test_admin):
+    """タスク実行エンドポイントが実行を受け付け、バックグラウンドで実行することをテスト"""
+    template = TaskTemplate(name="非同期実行テンプレート", task_type="test", prompt="非同期実行プロンプト")
+    db_session.add(template)
+    await db_session.commit()
+    await db_session.refresh(template)
+
+    # 管理者としてログイン
+    login_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "admin", "password": "adminpassword"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    mock_execute = AsyncMock(return_value={"success": True, "output": "非同期実行結果", "extensions_output": {}})
+    with patch("goose.executor.TaskExecutor.execute_task", mock_execute):
+        response = await client.post("/api/v1/tasks/executions/", params={"template_id": template.id}, headers=headers)
+
+        # 実行IDが即座に返される
+        assert response.status_code == 202
+        data = response.json()
+        assert data["template_id"] == template.id
+        assert data["status"] == "pending"
+
+    # バックグラウンドで実行され、結果が記録される
+    mock_execute.assert_awaited_once()
+    assert mock_execute.call_args.kwargs["prompt"] == "非同期実行プロンプト"
+
+    response = await client.get(f"/api/v1/tasks/executions/{data['execution_id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["result"] == "非同期実行結果"
+
+    # 存在しないテンプレートは404
+    response = await client.post("/api/v1/tasks/executions/", params={"template_id": 99999}, headers=headers)
+    assert response.status_code == 404